@@ -15,19 +15,58 @@ Usage:
     list_view = crud['list'](table_config, page_title="Items")
 """
 
+import importlib
+
+TYPE_CHECKING = False  # avoids importing typing; understood by mypy and pyright
+
 __version__ = "0.1.0"
 __author__ = "DjCrudX Team"
 
-from .crud import create_crud, create_crud_views, CRUDFactory, CRUDView
-from .widgets import (
-    MultiSelectDropdownWidget,
-    SingleSelectDropdownWidget,
-    ColoredSelectDropdownWidget,
-    DateTimePickerWidget,
-    DateRangePickerWidget,
-    ActiveStatusDropdownWidget,
-    TextInputWidget,
-)
+# Public API is imported lazily (PEP 562) - "import djcrudx" does not load
+# django.shortcuts, django.contrib.* or the optional permissions package
+_LAZY_IMPORTS = {
+    'create_crud': 'crud',
+    'create_crud_views': 'crud',
+    'CRUDFactory': 'crud',
+    'CRUDView': 'crud',
+    'MultiSelectDropdownWidget': 'widgets',
+    'SingleSelectDropdownWidget': 'widgets',
+    'ColoredSelectDropdownWidget': 'widgets',
+    'DateTimePickerWidget': 'widgets',
+    'DateRangePickerWidget': 'widgets',
+    'ActiveStatusDropdownWidget': 'widgets',
+    'TextInputWidget': 'widgets',
+    'MultiSelectFilter': 'filters',
+    'DateRangeFilter': 'filters',
+}
+
+if TYPE_CHECKING:
+    from .crud import create_crud, create_crud_views, CRUDFactory, CRUDView
+    from .widgets import (
+        MultiSelectDropdownWidget,
+        SingleSelectDropdownWidget,
+        ColoredSelectDropdownWidget,
+        DateTimePickerWidget,
+        DateRangePickerWidget,
+        ActiveStatusDropdownWidget,
+        TextInputWidget,
+    )
+    from .filters import MultiSelectFilter, DateRangeFilter
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{module_name}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value  # cache - next access skips __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __all__ = [
     'create_crud',
@@ -41,6 +80,8 @@ __all__ = [
     'DateRangePickerWidget',
     'ActiveStatusDropdownWidget',
     'TextInputWidget',
+    'MultiSelectFilter',
+    'DateRangeFilter',
 ]
 
 # Default Django app config
@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class DjCrudXConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'djcrudx'
-    verbose_name = 'DjCrudX'
\ No newline at end of file
+    verbose_name = 'DjCrudX'
+
+    def ready(self):
+        from . import checks  # noqa: F401 - registers the system checks
@@ -0,0 +1,58 @@
+"""
+System checks for DjCrudX view configuration.
+
+Run with ``manage.py check`` and at ``runserver`` startup; the URLconf is
+imported so every factory-created view is registered.
+
+    djcrudx.W001  form_sections names a field the form does not have
+    djcrudx.W002  detail_sections names a field without a detail_config entry
+"""
+
+from django.core.checks import Tags, Warning, register
+
+from .registry import discover_views
+
+
+@register(Tags.urls)
+def check_form_sections(app_configs=None, **kwargs):
+    from .mixins import INLINE_FORMSETS
+
+    errors = []
+    for entry in discover_views():
+        form_class = entry.get("form_class")
+        if not entry.get("form_sections") or form_class is None:
+            continue
+        # Fields added in the form's __init__ are not in base_fields - hence a warning
+        known = set(getattr(form_class, "base_fields", {}))
+        for section in entry["form_sections"]:
+            for field_name in section.get("fields", []):
+                if field_name != INLINE_FORMSETS and field_name not in known:
+                    errors.append(Warning(
+                        f"form_sections of {entry['view_name']} section '{section.get('title', '')}' "
+                        f"names unknown field '{field_name}' of {form_class.__name__}; it is not rendered.",
+                        hint="Fix the name or add the field to the form.",
+                        obj=entry["view_name"],
+                        id="djcrudx.W001",
+                    ))
+    return errors
+
+
+@register(Tags.urls)
+def check_detail_sections(app_configs=None, **kwargs):
+    errors = []
+    for entry in discover_views():
+        sections = (entry.get("context") or {}).get("detail_sections")
+        if entry["kind"] != "detail" or not sections:
+            continue
+        known = {config.get("field") for config in entry.get("detail_config") or []}
+        for section in sections:
+            for field_name in section.get("fields", []):
+                if field_name not in known:
+                    errors.append(Warning(
+                        f"detail_sections of {entry['view_name']} section '{section.get('title', '')}' "
+                        f"names '{field_name}' which has no detail_config entry; it is not rendered.",
+                        hint="Add a detail_config entry with this \"field\" or fix the name.",
+                        obj=entry["view_name"],
+                        id="djcrudx.W002",
+                    ))
+    return errors
@@ -0,0 +1,130 @@
+"""
+Single-flight coalescing of identical list queries.
+
+When many users open the same list page at once, the requests with the same
+count/page query (same SQL and parameters - filters, ordering, permission
+scope - page and page size) wait for one in-flight computation and share its
+result instead of each running the queries.
+
+In-process, followers wait on the leader's thread. With a cache alias set the
+leader also takes a ``cache.add`` lock and publishes the result for
+DJCRUDX_COALESCE_RESULT_TTL seconds, so workers in other processes poll for it
+instead of running the same queries. A follower that waits longer than
+DJCRUDX_COALESCE_WAIT_MS, or whose leader failed, computes independently.
+
+A shared result may be up to the result TTL older than the database - keep it
+short. Only the count, aggregates and the primary keys of the page are shared;
+a follower loads its own row instances by primary key (one query, no count and
+no OFFSET), so preparing a page may modify them.
+
+Settings:
+    DJCRUDX_COALESCE = False              # True enables it for all list views
+    DJCRUDX_COALESCE_CACHE_ALIAS = None   # Django cache for coalescing across processes
+    DJCRUDX_COALESCE_WAIT_MS = 5000       # follower wait before computing independently
+    DJCRUDX_COALESCE_RESULT_TTL = 2       # seconds a result is kept for other processes
+"""
+
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+
+# Follower poll interval for a result computed in another process
+POLL_INTERVAL = 0.05
+
+
+def is_enabled():
+    return getattr(settings, "DJCRUDX_COALESCE", False)
+
+
+def query_key(*parts, querysets=()):
+    """Key of the querysets' SQL and ``parts``, or None when a queryset cannot be compiled"""
+    compiled = []
+    for queryset in querysets:
+        try:
+            compiled.append((queryset.db, queryset.query.sql_with_params()))
+        except EmptyResultSet:
+            return None
+    raw = repr((compiled, parts))
+    return "djcrudx:coalesce:" + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.failed = False
+
+
+class SingleFlight:
+    """Runs one computation per key at a time; concurrent callers share its result"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        """
+        Result of ``func()``, computed once for concurrent callers with the same key
+
+        Returns:
+            tuple: (result, shared) - shared is True when another request computed it
+        """
+        wait = getattr(settings, "DJCRUDX_COALESCE_WAIT_MS", 5000) / 1000
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if call.done.wait(wait) and not call.failed:
+                return call.result, True
+            return func(), False  # leader too slow or failed
+
+        try:
+            call.result, shared = self._run_shared(key, func, wait)
+        except BaseException:
+            call.failed = True
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, shared
+
+    def _run_shared(self, key, func, wait):
+        """Coalesce across processes through the cache lock, when configured"""
+        alias = getattr(settings, "DJCRUDX_COALESCE_CACHE_ALIAS", None)
+        if not alias:
+            return func(), False
+        cache = caches[alias]
+        result_key, lock_key = f"{key}:result", f"{key}:lock"
+        result = cache.get(result_key)
+        if result is not None:
+            return result, True
+
+        if cache.add(lock_key, 1, max(int(wait) + 1, 1)):
+            try:
+                result = func()
+                cache.set(result_key, result, getattr(settings, "DJCRUDX_COALESCE_RESULT_TTL", 2))
+            finally:
+                cache.delete(lock_key)
+            return result, False
+
+        # Another process computes it
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            result = cache.get(result_key)
+            if result is not None:
+                return result, True
+            if cache.get(lock_key) is None:
+                break  # the other process failed without a result
+        return func(), False
+
+
+single_flight = SingleFlight()
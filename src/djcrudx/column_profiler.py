@@ -0,0 +1,101 @@
+"""
+Sampling per-column cost profiler for table_config.
+
+A sampled ``prepare_datatable`` call measures wall time and query count of every
+column callable, split into phases: ``value``, ``url``, ``actions`` and ``badges``.
+Aggregates live in process memory and are shown by
+``djcrudx.views.column_profile_view``.
+
+Settings:
+    DJCRUDX_COLUMN_PROFILER_RATE = 0.05  # profile 5% of datatables (0 = off, default)
+"""
+
+import random
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+
+def call_column(label, phase, func, obj):
+    """Unprofiled column call"""
+    return func(obj)
+
+
+class ColumnProfiler:
+    """Thread-safe aggregates of column cost keyed by (view_name, label, phase)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def get_rate(self):
+        return getattr(settings, "DJCRUDX_COLUMN_PROFILER_RATE", 0)
+
+    @contextmanager
+    def sample(self, view_name):
+        """
+        Yield a ``measure(label, phase, func, obj)`` callable for one datatable
+
+        When the datatable is not sampled the callable just returns ``func(obj)``.
+        """
+        rate = self.get_rate()
+        if not rate or random.random() >= rate:
+            yield call_column
+            return
+
+        queries = [0]
+
+        def count_queries(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        def measure(label, phase, func, obj):
+            start_queries = queries[0]
+            start = time.perf_counter()
+            try:
+                return func(obj)
+            finally:
+                self.record(view_name, label, phase, time.perf_counter() - start, queries[0] - start_queries)
+
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(count_queries))
+            yield measure
+
+    def record(self, view_name, label, phase, seconds, queries):
+        key = (view_name or "unknown", str(label), phase)
+        with self._lock:
+            stats = self._stats.setdefault(key, [0, 0.0, 0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] += queries
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def report(self):
+        """Return aggregates as a list of dicts, most expensive first"""
+        with self._lock:
+            items = list(self._stats.items())
+        report = [
+            {
+                "view": view_name,
+                "column": label,
+                "phase": phase,
+                "calls": calls,
+                "total_ms": seconds * 1000,
+                "avg_ms": seconds * 1000 / calls if calls else 0,
+                "queries": queries,
+                "avg_queries": queries / calls if calls else 0,
+            }
+            for (view_name, label, phase), (calls, seconds, queries) in items
+        ]
+        report.sort(key=lambda row: row["total_ms"], reverse=True)
+        return report
+
+
+column_profiler = ColumnProfiler()
@@ -0,0 +1,116 @@
+"""
+Conditional GET (ETag / Last-Modified) for list and detail views.
+
+Enabled per factory with ``version_field`` - a field bumped on every change,
+typically ``updated_at = models.DateTimeField(auto_now=True)`` or an integer
+version. A list is validated by ``Max(version_field)`` and ``Count`` of the
+filtered queryset in one query that also computes the column aggregates, so
+the paginator and the footer reuse it and a rendered list runs no separate
+count query. A detail page is validated by the object's field value.
+The query string, the user, the language and the user's saved table views are
+part of the validator, so ``304 Not Modified`` is answered before the page
+fetch, row preparation and template rendering.
+
+Changes to related rows (e.g. a renamed category shown in a column) do not
+change the validator unless they bump ``version_field`` of the listed rows.
+
+Settings:
+    DJCRUDX_ETAG_SALT = ""   # change to invalidate all validators, e.g. after template changes
+"""
+
+import datetime
+import hashlib
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.utils.translation import get_language
+
+
+def is_conditional_request(request):
+    """Only GET/HEAD without pending messages (a 304 would not show them)"""
+    if request.method not in ("GET", "HEAD"):
+        return False
+    return not len(get_messages(request))
+
+
+def make_etag(request, view_name, *parts):
+    """Weak ETag of ``parts`` combined with the query string, user and language"""
+    from . import __version__
+
+    user = getattr(request, "user", None)
+    params = sorted((key, tuple(request.GET.getlist(key))) for key in request.GET)
+    raw = repr((
+        __version__, getattr(settings, "DJCRUDX_ETAG_SALT", ""), view_name, params,
+        user.pk if user is not None and user.is_authenticated else None, get_language(), parts,
+    ))
+    return 'W/"%s"' % hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def to_last_modified(value):
+    """Timestamp for Last-Modified, or None when the version is not a date"""
+    if isinstance(value, datetime.datetime):
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value, datetime.timezone.utc)
+        return int(value.timestamp())
+    return None
+
+
+def table_views_version(request, view_name):
+    """(last change, count) of the user's saved views - a new default view changes the page"""
+    from .models import TableView
+
+    values = TableView.objects.filter(user=request.user, view_name=view_name).aggregate(
+        changed=Max("updated_at"), count=Count("pk")
+    )
+    return values["changed"], values["count"]
+
+
+def list_validators(request, queryset, version_field, view_name, table_views=False, aggregates=None):
+    """
+    Validators of a filtered list
+
+    Only an ETag: deleting a row lowers the count but not Max(version_field), so a
+    Last-Modified date alone would answer 304 for a changed list.
+
+    Args:
+        queryset: filtered queryset, annotated with the "annotate" columns ``aggregates`` refer to
+            (CrudListMixin.get_aggregate_annotations)
+        aggregates: optional {alias: aggregate expression} computed in the same query
+
+    Returns:
+        tuple: (etag, row count, {alias: aggregate value})
+    """
+    values = queryset.order_by().aggregate(
+        djcrudx_version=Max(version_field), djcrudx_count=Count("pk"), **(aggregates or {})
+    )
+    version, count = values.pop("djcrudx_version"), values.pop("djcrudx_count")
+    parts = [version, count]
+    if table_views:
+        parts.extend(table_views_version(request, view_name))
+    return make_etag(request, view_name, *parts), count, values
+
+
+def object_validators(request, obj, version_field, view_name):
+    """(etag, last_modified) of a single object"""
+    value = getattr(obj, version_field)
+    return make_etag(request, view_name, obj.pk, value), to_last_modified(value)
+
+
+def not_modified(request, etag, last_modified=None):
+    """304 (or 412) response when the client's copy is current, else None"""
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    return set_validators(response, etag, last_modified) if response is not None else None
+
+
+def set_validators(response, etag, last_modified=None):
+    """Add validators to the response; private, always revalidated (no heuristic freshness)"""
+    if etag and not response.has_header("ETag"):
+        response.headers["ETag"] = etag
+    if last_modified is not None and not response.has_header("Last-Modified"):
+        response.headers["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
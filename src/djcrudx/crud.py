@@ -1,6 +1,8 @@
+from django.db.models import prefetch_related_objects
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ImproperlyConfigured
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 
@@ -18,44 +20,54 @@ except ImportError:
     def get_filtered_queryset(model, user, queryset):
         return queryset
 
-from .mixins import CrudListMixin, render_with_readonly
+from .conditional import is_conditional_request, not_modified, object_validators, set_validators
+from .importer import HAS_OPENPYXL, get_import_columns, import_file
+from .metrics import timed
+from .tracing import span
+from .mixins import build_detail_layout, get_detail_relations, list_view_response, render_with_readonly
+from .registry import register_view
 
 
 class CRUDFactory:
     """Factory class for creating CRUD views (simple version without permissions)"""
     
-    def __init__(self, model, form_class, filter_class=None):
+    def __init__(self, model, form_class, filter_class=None, version_field=None):
         self.model = model
         self.form_class = form_class
         self.filter_class = filter_class
+        self.version_field = version_field  # e.g. "updated_at" - enables ETag / 304 responses
         self.model_name = model._meta.model_name
         self.app_name = model._meta.app_label
     
-    def list_view(self, table_config, **kwargs):
+    def list_view(self, table_config, infinite_scroll=False, row_cache=False, statement_timeout=None, coalesce=None, **kwargs):
+        view_name = f"{self.app_name}:{self.model_name}_list"
+        if row_cache and not self.version_field:
+            raise ImproperlyConfigured(f"{view_name}: row_cache=True needs the factory's version_field")
+        row_cache_field = self.version_field if row_cache else None
+
         @login_required
         def view(request):
-            queryset = self.model.objects.all()
-            
-            if self.filter_class:
-                filter_obj = self.filter_class(request.GET, queryset=queryset)
-                queryset = filter_obj.qs
-            else:
-                filter_obj = None
-            
-            mixin = CrudListMixin()
-            context = mixin.get_datatable_context(queryset, filter_obj, table_config, request)
-            context.update(kwargs)
-            
-            return render(request, "crud/list_view.html", context)
+            return list_view_response(
+                request, self.model.objects.all(), table_config, view_name, filter_class=self.filter_class,
+                version_field=self.version_field, infinite_scroll=infinite_scroll, row_cache_field=row_cache_field,
+                timeout=statement_timeout, coalesce=coalesce, extra_context=kwargs,
+            )
+
+        register_view(view_name, "list", self.model, view, table_config=table_config, filter_class=self.filter_class, context=kwargs)
         return view
     
     def create_view(self, form_sections, readonly_fields=None, **kwargs):
+        view_name = f"{self.app_name}:{self.model_name}_create"
+
         @login_required
         def view(request):
             if request.method == "POST":
-                form = self.form_class(request.POST, request.FILES)
-                if form.is_valid():
-                    obj = form.save()
+                with timed(view_name, "form"):
+                    form = self.form_class(request.POST, request.FILES)
+                    is_valid = form.is_valid()
+                if is_valid:
+                    with timed(view_name, "save"), span("djcrudx.save", {"djcrudx.view": view_name}):
+                        obj = form.save()
                     messages.success(request, f"{obj} created successfully.")
                     return redirect(f"{self.app_name}:{self.model_name}_list")
                 else:
@@ -71,18 +83,27 @@ class CRUDFactory:
             }
             context.update(kwargs)
             
-            return render_with_readonly(request, "crud/form_view.html", context, readonly_fields)
+            with timed(view_name, "render"):
+                return render_with_readonly(request, "crud/form_view.html", context, readonly_fields)
+
+        register_view(view_name, "create", self.model, view, form_class=self.form_class, form_sections=form_sections, readonly_fields=readonly_fields, context=kwargs)
         return view
     
     def update_view(self, form_sections, readonly_fields=None, **kwargs):
+        view_name = f"{self.app_name}:{self.model_name}_update"
+
         @login_required
         def view(request, pk):
-            obj = get_object_or_404(self.model, pk=pk)
+            with timed(view_name, "fetch"):
+                obj = get_object_or_404(self.model, pk=pk)
             
             if request.method == "POST":
-                form = self.form_class(request.POST, request.FILES, instance=obj)
-                if form.is_valid():
-                    obj = form.save()
+                with timed(view_name, "form"):
+                    form = self.form_class(request.POST, request.FILES, instance=obj)
+                    is_valid = form.is_valid()
+                if is_valid:
+                    with timed(view_name, "save"), span("djcrudx.save", {"djcrudx.view": view_name}):
+                        obj = form.save()
                     messages.success(request, f"{obj} updated successfully.")
                     return redirect(f"{self.app_name}:{self.model_name}_list")
                 else:
@@ -99,33 +120,63 @@ class CRUDFactory:
             }
             context.update(kwargs)
             
-            return render_with_readonly(request, "crud/form_view.html", context, readonly_fields)
+            with timed(view_name, "render"):
+                return render_with_readonly(request, "crud/form_view.html", context, readonly_fields)
+
+        register_view(view_name, "update", self.model, view, form_class=self.form_class, form_sections=form_sections, readonly_fields=readonly_fields, context=kwargs)
         return view
     
     def detail_view(self, detail_config, **kwargs):
+        view_name = f"{self.app_name}:{self.model_name}_detail"
+        # Compiled once: sections -> configs, and the relations the configs read
+        detail_layout = build_detail_layout(detail_config, kwargs.get("detail_sections"))
+        select_related, prefetch_related = get_detail_relations(self.model, detail_config)
+        queryset = self.model.objects.select_related(*select_related) if select_related else self.model.objects.all()
+
         @login_required
         def view(request, pk):
-            obj = get_object_or_404(self.model, pk=pk)
+            with timed(view_name, "fetch"):
+                obj = get_object_or_404(queryset, pk=pk)
+
+            etag = last_modified = None
+            if self.version_field and is_conditional_request(request):
+                etag, last_modified = object_validators(request, obj, self.version_field, view_name)
+                response = not_modified(request, etag, last_modified)
+                if response is not None:
+                    return response
+
+            if prefetch_related:
+                with timed(view_name, "prefetch"):
+                    prefetch_related_objects([obj], *prefetch_related)
             
             context = {
                 "object": obj,
                 "detail_config": detail_config,
+                "detail_layout": detail_layout,
                 "back_url": f"{self.app_name}:{self.model_name}_list",
                 "edit_url": f"{self.app_name}:{self.model_name}_update",
             }
             context.update(kwargs)
             
-            return render(request, "crud/detail_view.html", context)
+            with timed(view_name, "render"):
+                response = render(request, "crud/detail_view.html", context)
+            return set_validators(response, etag, last_modified) if etag else response
+
+        register_view(view_name, "detail", self.model, view, detail_config=detail_config, context=kwargs)
         return view
     
     def delete_view(self, **kwargs):
+        view_name = f"{self.app_name}:{self.model_name}_delete"
+
         @login_required
         def view(request, pk):
-            obj = get_object_or_404(self.model, pk=pk)
+            with timed(view_name, "fetch"):
+                obj = get_object_or_404(self.model, pk=pk)
             
             if request.method == "POST":
                 obj_name = str(obj)
-                obj.delete()
+                with timed(view_name, "delete"):
+                    obj.delete()
                 messages.success(request, f"{obj_name} deleted successfully.")
                 return redirect(f"{self.app_name}:{self.model_name}_list")
             
@@ -135,9 +186,52 @@ class CRUDFactory:
             }
             context.update(kwargs)
             
-            return render(request, "crud/delete_confirm.html", context)
+            with timed(view_name, "render"):
+                return render(request, "crud/delete_confirm.html", context)
+
+        register_view(view_name, "delete", self.model, view, context=kwargs)
         return view
     
+    def import_view(self, columns=None, batch_size=None, **kwargs):
+        view_name = f"{self.app_name}:{self.model_name}_import"
+
+        @login_required
+        def view(request):
+            report = None
+            if request.method == "POST":
+                report = self._run_import(request, view_name, columns, batch_size)
+
+            context = {
+                "report": report,
+                "import_columns": get_import_columns(self.form_class, columns),
+                "has_xlsx": HAS_OPENPYXL,
+                "back_url": f"{self.app_name}:{self.model_name}_list",
+            }
+            context.update(kwargs)
+
+            with timed(view_name, "render"):
+                return render(request, "crud/import_view.html", context)
+
+        register_view(view_name, "import", self.model, view, form_class=self.form_class, columns=columns, context=kwargs)
+        return view
+    
+    def _run_import(self, request, view_name, columns, batch_size):
+        uploaded = request.FILES.get("file")
+        if uploaded is None:
+            messages.error(request, "Choose a CSV or XLSX file to import.")
+            return None
+        with timed(view_name, "import"), span("djcrudx.import", {"djcrudx.view": view_name}) as current:
+            report = import_file(uploaded, self.form_class, columns, batch_size, view_name)
+            current.set_attribute("djcrudx.created", report.created)
+            current.set_attribute("djcrudx.errors", report.error_count)
+        if report.file_error:
+            messages.error(request, report.file_error)
+        if report.created:
+            messages.success(request, f"{report.created} {self.model._meta.verbose_name_plural} imported.")
+        if report.error_count:
+            messages.error(request, f"{report.error_count} rows were not imported - see the errors below.")
+        return report
+
     def _add_form_errors(self, form, request):
         for field, errors in form.errors.items():
             for error in errors:
@@ -151,10 +245,11 @@ class CRUDFactory:
 class CRUDView:
     """Advanced CRUD class with permissions support"""
     
-    def __init__(self, model, form_class, filter_class=None):
+    def __init__(self, model, form_class, filter_class=None, version_field=None):
         self.model = model
         self.form_class = form_class
         self.filter_class = filter_class
+        self.version_field = version_field  # e.g. "updated_at" - enables ETag / 304 responses
         self.model_name = model._meta.model_name
         self.app_name = model._meta.app_label
         
@@ -165,40 +260,40 @@ class CRUDView:
             'app_name': self.app_name,
         }
     
-    def list_view(self, table_config, **kwargs):
+    def list_view(self, table_config, infinite_scroll=False, row_cache=False, statement_timeout=None, coalesce=None, **kwargs):
         """List view with permissions"""
+        view_name = f"{self.app_name}:{self.model_name}_list"
+        if row_cache and not self.version_field:
+            raise ImproperlyConfigured(f"{view_name}: row_cache=True needs the factory's version_field")
+        row_cache_field = self.version_field if row_cache else None
+
         @login_required
         @require_view_permission(f'{self.app_name}:{self.model_name}_list')
         def view(request):
-            base_queryset = self.model.objects.all()
-            queryset = get_filtered_queryset(self.model, request.user, base_queryset)
-            
-            if self.filter_class:
-                filter_obj = self.filter_class(request.GET, queryset=queryset)
-                queryset = filter_obj.qs
-            else:
-                filter_obj = None
-            
-            mixin = CrudListMixin()
-            context = mixin.get_datatable_context(queryset, filter_obj, table_config, request, 
-                                                view_name=f"{self.app_name}:{self.model_name}_list")
-            
-            context.update(self.get_base_context())
-            context.update(kwargs)
-            
-            return render(request, "crud/list_view.html", context)
+            queryset = get_filtered_queryset(self.model, request.user, self.model.objects.all())
+            return list_view_response(
+                request, queryset, table_config, view_name, filter_class=self.filter_class,
+                version_field=self.version_field, infinite_scroll=infinite_scroll, row_cache_field=row_cache_field,
+                timeout=statement_timeout, coalesce=coalesce, extra_context={**self.get_base_context(), **kwargs},
+            )
         
+        register_view(view_name, "list", self.model, view, table_config=table_config, filter_class=self.filter_class, context=kwargs)
         return view
     
     def create_view(self, form_sections, readonly_fields=None, **kwargs):
         """Create view with permissions"""
+        view_name = f"{self.app_name}:{self.model_name}_create"
+
         @login_required
         @require_view_permission(f'{self.app_name}:{self.model_name}_create')
         def view(request):
             if request.method == "POST":
-                form = self.form_class(request.POST, request.FILES)
-                if form.is_valid():
-                    obj = form.save()
+                with timed(view_name, "form"):
+                    form = self.form_class(request.POST, request.FILES)
+                    is_valid = form.is_valid()
+                if is_valid:
+                    with timed(view_name, "save"), span("djcrudx.save", {"djcrudx.view": view_name}):
+                        obj = form.save()
                     messages.success(request, f"{obj} created successfully.")
                     return redirect(f"{self.app_name}:{self.model_name}_list")
                 else:
@@ -215,21 +310,29 @@ class CRUDView:
             context.update(self.get_base_context())
             context.update(kwargs)
             
-            return render_with_readonly(request, "crud/form_view.html", context, readonly_fields)
+            with timed(view_name, "render"):
+                return render_with_readonly(request, "crud/form_view.html", context, readonly_fields)
         
+        register_view(view_name, "create", self.model, view, form_class=self.form_class, form_sections=form_sections, readonly_fields=readonly_fields, context=kwargs)
         return view
     
     def update_view(self, form_sections, readonly_fields=None, **kwargs):
         """Update view with permissions"""
+        view_name = f"{self.app_name}:{self.model_name}_update"
+
         @login_required
         @require_view_permission(f'{self.app_name}:{self.model_name}_update')
         def view(request, pk):
-            obj = get_object_or_404(self.model, pk=pk)
+            with timed(view_name, "fetch"):
+                obj = get_object_or_404(self.model, pk=pk)
             
             if request.method == "POST":
-                form = self.form_class(request.POST, request.FILES, instance=obj)
-                if form.is_valid():
-                    obj = form.save()
+                with timed(view_name, "form"):
+                    form = self.form_class(request.POST, request.FILES, instance=obj)
+                    is_valid = form.is_valid()
+                if is_valid:
+                    with timed(view_name, "save"), span("djcrudx.save", {"djcrudx.view": view_name}):
+                        obj = form.save()
                     messages.success(request, f"{obj} updated successfully.")
                     return redirect(f"{self.app_name}:{self.model_name}_list")
                 else:
@@ -247,40 +350,68 @@ class CRUDView:
             context.update(self.get_base_context())
             context.update(kwargs)
             
-            return render_with_readonly(request, "crud/form_view.html", context, readonly_fields)
+            with timed(view_name, "render"):
+                return render_with_readonly(request, "crud/form_view.html", context, readonly_fields)
         
+        register_view(view_name, "update", self.model, view, form_class=self.form_class, form_sections=form_sections, readonly_fields=readonly_fields, context=kwargs)
         return view
     
     def detail_view(self, detail_config, **kwargs):
         """Detail view with permissions"""
+        view_name = f"{self.app_name}:{self.model_name}_detail"
+        # Compiled once: sections -> configs, and the relations the configs read
+        detail_layout = build_detail_layout(detail_config, kwargs.get("detail_sections"))
+        select_related, prefetch_related = get_detail_relations(self.model, detail_config)
+        queryset = self.model.objects.select_related(*select_related) if select_related else self.model.objects.all()
+
         @login_required
         @require_view_permission(f'{self.app_name}:{self.model_name}_detail')
         def view(request, pk):
-            obj = get_object_or_404(self.model, pk=pk)
+            with timed(view_name, "fetch"):
+                obj = get_object_or_404(queryset, pk=pk)
+
+            etag = last_modified = None
+            if self.version_field and is_conditional_request(request):
+                etag, last_modified = object_validators(request, obj, self.version_field, view_name)
+                response = not_modified(request, etag, last_modified)
+                if response is not None:
+                    return response
+
+            if prefetch_related:
+                with timed(view_name, "prefetch"):
+                    prefetch_related_objects([obj], *prefetch_related)
             
             context = {
                 "object": obj,
                 "detail_config": detail_config,
+                "detail_layout": detail_layout,
                 "back_url": f"{self.app_name}:{self.model_name}_list",
                 "edit_url": f"{self.app_name}:{self.model_name}_update",
             }
             context.update(self.get_base_context())
             context.update(kwargs)
             
-            return render(request, "crud/detail_view.html", context)
+            with timed(view_name, "render"):
+                response = render(request, "crud/detail_view.html", context)
+            return set_validators(response, etag, last_modified) if etag else response
         
+        register_view(view_name, "detail", self.model, view, detail_config=detail_config, context=kwargs)
         return view
     
     def delete_view(self, **kwargs):
         """Delete view with permissions"""
+        view_name = f"{self.app_name}:{self.model_name}_delete"
+
         @login_required
         @require_view_permission(f'{self.app_name}:{self.model_name}_delete')
         def view(request, pk):
-            obj = get_object_or_404(self.model, pk=pk)
+            with timed(view_name, "fetch"):
+                obj = get_object_or_404(self.model, pk=pk)
             
             if request.method == "POST":
                 obj_name = str(obj)
-                obj.delete()
+                with timed(view_name, "delete"):
+                    obj.delete()
                 messages.success(request, f"{obj_name} deleted successfully.")
                 return redirect(f"{self.app_name}:{self.model_name}_list")
             
@@ -291,10 +422,55 @@ class CRUDView:
             context.update(self.get_base_context())
             context.update(kwargs)
             
-            return render(request, "crud/delete_confirm.html", context)
+            with timed(view_name, "render"):
+                return render(request, "crud/delete_confirm.html", context)
+        
+        register_view(view_name, "delete", self.model, view, context=kwargs)
+        return view
+    
+    def import_view(self, columns=None, batch_size=None, **kwargs):
+        """Batched CSV/XLSX import with permissions (an import creates objects)"""
+        view_name = f"{self.app_name}:{self.model_name}_import"
+
+        @login_required
+        @require_view_permission(f'{self.app_name}:{self.model_name}_create')
+        def view(request):
+            report = None
+            if request.method == "POST":
+                report = self._run_import(request, view_name, columns, batch_size)
+
+            context = {
+                "report": report,
+                "import_columns": get_import_columns(self.form_class, columns),
+                "has_xlsx": HAS_OPENPYXL,
+                "back_url": f"{self.app_name}:{self.model_name}_list",
+            }
+            context.update(self.get_base_context())
+            context.update(kwargs)
+
+            with timed(view_name, "render"):
+                return render(request, "crud/import_view.html", context)
         
+        register_view(view_name, "import", self.model, view, form_class=self.form_class, columns=columns, context=kwargs)
         return view
     
+    def _run_import(self, request, view_name, columns, batch_size):
+        uploaded = request.FILES.get("file")
+        if uploaded is None:
+            messages.error(request, "Choose a CSV or XLSX file to import.")
+            return None
+        with timed(view_name, "import"), span("djcrudx.import", {"djcrudx.view": view_name}) as current:
+            report = import_file(uploaded, self.form_class, columns, batch_size, view_name)
+            current.set_attribute("djcrudx.created", report.created)
+            current.set_attribute("djcrudx.errors", report.error_count)
+        if report.file_error:
+            messages.error(request, report.file_error)
+        if report.created:
+            messages.success(request, f"{report.created} {self.model._meta.verbose_name_plural} imported.")
+        if report.error_count:
+            messages.error(request, f"{report.error_count} rows were not imported - see the errors below.")
+        return report
+
     def _add_form_errors(self, form, request):
         """Add form errors to messages"""
         for field, errors in form.errors.items():
@@ -307,25 +483,27 @@ class CRUDView:
 
 
 # Main API functions
-def create_crud(model, form_class, filter_class=None):
+def create_crud(model, form_class, filter_class=None, version_field=None):
     """Create simple CRUD views without permissions"""
-    crud = CRUDFactory(model, form_class, filter_class)
+    crud = CRUDFactory(model, form_class, filter_class, version_field)
     return {
         'list': crud.list_view,
         'create': crud.create_view,
         'update': crud.update_view,
         'detail': crud.detail_view,
         'delete': crud.delete_view,
+        'import': crud.import_view,
     }
 
 
-def create_crud_views(model, form_class, filter_class=None):
+def create_crud_views(model, form_class, filter_class=None, version_field=None):
     """Create advanced CRUD views with permissions support"""
-    crud = CRUDView(model, form_class, filter_class)
+    crud = CRUDView(model, form_class, filter_class, version_field)
     return {
         'list': crud.list_view,
         'create': crud.create_view,
         'update': crud.update_view,
         'detail': crud.detail_view,
         'delete': crud.delete_view,
+        'import': crud.import_view,
     }
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+Facet counts for multi-select filter options.
+
+For every faceted filter one grouped ``values().annotate(Count)`` query runs over
+the currently filtered queryset with that filter's own parameter removed, so
+each option shows how many rows selecting it would add. Counts are cached by
+filter fingerprint: the SQL of the filter's base queryset (so permission-scoped
+querysets of different users never share counts) and the other filters'
+parameters.
+
+Settings:
+    DJCRUDX_FACET_MAX_ROWS = 100000    # no facets when the filtered list is larger (None = no limit)
+    DJCRUDX_FACET_CACHE_TIMEOUT = 60   # seconds, 0 disables the cache
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Count
+
+from .tracing import span
+
+# Query parameters that do not filter rows
+NON_FILTER_PARAMS = {"page", "per_page", "ordering", "view"}
+
+
+def get_param_names(filter_instance, name):
+    """Query parameters read by the filter's widget, e.g. {"created_at_0", "created_at_1"} for a range"""
+    field = filter_instance.form.fields.get(name)
+    widget = getattr(field, "widget", None)
+    # django-filter SuffixedMultiWidget and DateRangePickerWidget: name_<suffix>
+    suffixes = getattr(widget, "suffixes", None)
+    if suffixes is not None:
+        return {f"{name}_{suffix}" if suffix else name for suffix in suffixes}
+    # Django MultiWidget: name<widget name>, e.g. name_0
+    widgets_names = getattr(widget, "widgets_names", None)
+    if widgets_names is not None:
+        return {name + widget_name for widget_name in widgets_names}
+    return {name}
+
+
+def base_fingerprint(queryset):
+    """(db, SQL, params) of the queryset the filter narrows, or None when it cannot be compiled"""
+    try:
+        return (queryset.db, queryset.query.sql_with_params())
+    except EmptyResultSet:
+        return None
+
+
+def facet_fingerprint(view_name, filter_instance, name, base=None):
+    """Cache key for the facet ``name`` given the base queryset and all other filter parameters"""
+    data = filter_instance.data
+    own = get_param_names(filter_instance, name)
+    params = sorted(
+        (key, tuple(data.getlist(key)) if hasattr(data, "getlist") else (str(data[key]),))
+        for key in data
+        if key not in NON_FILTER_PARAMS and key not in own
+    )
+    raw = repr((view_name, filter_instance._meta.model._meta.label, base, name, params))
+    return "djcrudx:facets:" + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def get_facet_field(filter_instance, name):
+    """Model field path of the filter, or None for method based filters"""
+    filter_obj = filter_instance.filters.get(name)
+    if filter_obj is None or getattr(filter_obj, "method", None):
+        return None
+    return filter_obj.field_name
+
+
+def count_facet(filter_instance, name, field):
+    """{str(value): count} for ``field`` over the queryset filtered without ``name``"""
+    data = filter_instance.data.copy() if hasattr(filter_instance.data, "copy") else dict(filter_instance.data)
+    for key in get_param_names(filter_instance, name):
+        data.pop(key, None)
+    others = type(filter_instance)(data, queryset=filter_instance.queryset, request=filter_instance.request)
+    rows = others.qs.order_by().values(field).annotate(djcrudx_facet_count=Count("pk", distinct=True))
+    return {str(row[field]): row["djcrudx_facet_count"] for row in rows if row[field] is not None}
+
+
+def compute_facets(filter_instance, facets, view_name=None):
+    """
+    Compute facet counts
+
+    Args:
+        filter_instance: bound django-filter FilterSet
+        facets: {filter_name: field_path}
+        view_name: part of the cache key
+
+    Returns:
+        dict: {filter_name: {str(value): count}}
+    """
+    timeout = getattr(settings, "DJCRUDX_FACET_CACHE_TIMEOUT", 60)
+    base = base_fingerprint(filter_instance.queryset) if timeout else None
+    if base is None:
+        timeout = 0  # nothing to key the counts on
+    keys = {name: facet_fingerprint(view_name, filter_instance, name, base) for name in facets}
+    with span("djcrudx.facet_cache", {"djcrudx.view": view_name, "djcrudx.facet_count": len(keys)}) as current:
+        cached = cache.get_many(list(keys.values())) if timeout else {}
+        hits = sum(1 for key in keys.values() if key in cached)
+        current.set_attribute("djcrudx.cache_hit", hits == len(keys))
+        current.set_attribute("djcrudx.cache_hits", hits)
+        current.set_attribute("djcrudx.cache_misses", len(keys) - hits)
+
+        results = {}
+        missing = {}
+        for name, field in facets.items():
+            if keys[name] in cached:
+                results[name] = cached[keys[name]]
+            else:
+                results[name] = missing[keys[name]] = count_facet(filter_instance, name, field)
+
+        if timeout and missing:
+            cache.set_many(missing, timeout)
+    return results
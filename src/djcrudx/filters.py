@@ -0,0 +1,140 @@
+"""
+django-filter filters paired with the DjCrudX widgets.
+
+MultiSelectFilter   - MultiSelectDropdownWidget; to-many relations are filtered
+                      with correlated EXISTS subqueries (no JOIN + DISTINCT)
+DateRangeFilter     - DateRangePickerWidget; half-open range on the raw column
+                      (no __date cast, so an index on the column can be used)
+
+Usage:
+    class ProductFilter(django_filters.FilterSet):
+        tags = MultiSelectFilter(queryset=Tag.objects.all())              # any of the tags
+        labels = MultiSelectFilter(queryset=Label.objects.all(), match="all")
+        created_at = DateRangeFilter()
+"""
+
+import datetime
+
+import django_filters
+from django import forms
+from django.conf import settings
+from django.db import models
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .index_advisor import resolve_path
+from .widgets import DateRangePickerWidget, MultiSelectDropdownWidget
+
+MATCH_ANY = "any"
+MATCH_ALL = "all"
+
+
+class MultiSelectFilter(django_filters.ModelMultipleChoiceFilter):
+    """
+    Multi-select relation filter
+
+    match="any" keeps rows related to at least one selected value, match="all" rows
+    related to every selected value. Single-valued relations (ForeignKey) use a plain
+    IN lookup.
+    """
+
+    def __init__(self, *args, match=MATCH_ANY, **kwargs):
+        if match not in (MATCH_ANY, MATCH_ALL):
+            raise ValueError(f"match must be '{MATCH_ANY}' or '{MATCH_ALL}'")
+        self.match = match
+        kwargs.setdefault("widget", MultiSelectDropdownWidget())
+        kwargs.setdefault("distinct", False)
+        super().__init__(*args, **kwargs)
+
+    def get_values(self, value):
+        to_field_name = self.field.to_field_name or "pk"
+        return [getattr(item, to_field_name) if hasattr(item, "_meta") else item for item in value]
+
+    def filter(self, qs, value):
+        if not value:
+            return qs
+        values = self.get_values(value)
+        path = self.field_name
+        field = self.model._meta.get_field(path) if "__" not in path else None
+
+        if field is not None and not (field.many_to_many or field.one_to_many):
+            # Single-valued relation - no duplicated rows
+            if self.match == MATCH_ALL and len(set(values)) > 1:
+                return qs.none()
+            return qs.filter(**{f"{path}__in": values})
+
+        if self.match == MATCH_ALL:
+            for item in dict.fromkeys(values):
+                qs = qs.filter(self.exists(qs, path, field, [item]))
+            return qs
+        return qs.filter(self.exists(qs, path, field, values))
+
+    def exists(self, qs, path, field, values):
+        """EXISTS subquery: the outer row is related to one of ``values``"""
+        to_field_name = self.field.to_field_name or "pk"
+        if field is not None and field.many_to_many and not field.auto_created:
+            # Forward ManyToManyField - query the through table only
+            through = field.remote_field.through
+            target = field.m2m_reverse_field_name()
+            lookup = f"{target}__in" if to_field_name == "pk" else f"{target}__{to_field_name}__in"
+            return Exists(through._default_manager.filter(**{field.m2m_field_name(): OuterRef("pk"), lookup: values}))
+        lookup = f"{path}__in" if to_field_name == "pk" else f"{path}__{to_field_name}__in"
+        return Exists(qs.model._default_manager.filter(pk=OuterRef("pk"), **{lookup: values}))
+
+
+class DateRangeField(forms.Field):
+    """[from, to] from DateRangePickerWidget cleaned to (date or None, date or None)"""
+
+    widget = DateRangePickerWidget
+    input_formats = ["%Y-%m-%d", "%d.%m.%Y"]
+
+    def to_python(self, value):
+        if not value:
+            return None
+        start, end = (list(value) + [None, None])[:2]
+        date_field = forms.DateField(required=False, input_formats=self.input_formats)
+        start, end = date_field.clean(start), date_field.clean(end)
+        if start is None and end is None:
+            return None
+        if start and end and start > end:
+            raise forms.ValidationError("Data początkowa jest późniejsza niż końcowa.", code="invalid_range")
+        return start, end
+
+
+class DateRangeFilter(django_filters.Filter):
+    """
+    Date range filter on a DateField or DateTimeField
+
+    Emits ``field >= start`` and ``field < end + 1 day`` (inclusive end date); for
+    DateTimeFields the bounds are midnights in the current time zone.
+    """
+
+    field_class = DateRangeField
+
+    def is_datetime(self):
+        resolved = resolve_path(self.model, self.field_name)
+        return resolved is not None and isinstance(resolved[1], models.DateTimeField)
+
+    def bounds(self, start, end):
+        """(lower, upper) of the half-open range"""
+        end = end + datetime.timedelta(days=1) if end else None
+        if not self.is_datetime():
+            return start, end
+
+        def midnight(day):
+            value = datetime.datetime.combine(day, datetime.time.min)
+            return timezone.make_aware(value) if settings.USE_TZ else value
+
+        return (midnight(start) if start else None), (midnight(end) if end else None)
+
+    def filter(self, qs, value):
+        if not value:
+            return qs
+        start, end = self.bounds(*value)
+        lookups = {}
+        if start is not None:
+            lookups[f"{self.field_name}__gte"] = start
+        if end is not None:
+            lookups[f"{self.field_name}__lt"] = end
+        qs = self.get_method(qs)(**lookups)
+        return qs.distinct() if self.distinct else qs
@@ -0,0 +1,495 @@
+"""
+Batched CSV/XLSX import through a CRUD form_class.
+
+The uploaded file is read row by row (CSV from the upload stream, XLSX with
+openpyxl in read-only mode) and processed in batches of
+DJCRUDX_IMPORT_BATCH_SIZE rows:
+
+    1. ForeignKey / ManyToMany columns of the batch are resolved with one query
+       per field instead of one query per row and field (values already seen in
+       earlier batches are not fetched again)
+    2. every row is validated by form_class; invalid rows are reported with
+       their row number and skipped
+    3. unique fields, unique_together and unconditional UniqueConstraints are
+       checked for the whole batch - one query per check instead of one per
+       row - together with duplicates within the batch
+    4. the valid rows are inserted with bulk_create in one transaction per
+       batch; a batch still failing with an integrity error (e.g. a concurrent
+       insert or a constraint the form does not validate) is rolled back and
+       split in halves, each inserted in its own savepoint, until only the
+       failing rows are left - those are reported, the others are inserted
+
+bulk_create does not call Model.save() or send pre/post_save signals - forms
+whose save() does more than form.save(commit=False) are not suited for imports.
+Relation fields of the form are replaced by PrefetchedChoiceField /
+PrefetchedMultipleChoiceField, so custom cleaning of those fields is not run.
+
+Columns are matched to form fields by name or label (case-insensitive) or by
+the ``columns`` mapping {header: field name}. Relations are looked up by pk, or
+by the form field's ``to_field_name`` (e.g. a category name). Multiple values
+of a ManyToMany column are separated by DJCRUDX_IMPORT_MULTI_SEPARATOR.
+
+Settings:
+    DJCRUDX_IMPORT_BATCH_SIZE = 500
+    DJCRUDX_IMPORT_MAX_ERRORS = 100          # rows with errors listed in the report (all are counted)
+    DJCRUDX_IMPORT_ENCODING = "utf-8-sig"    # CSV encoding
+    DJCRUDX_IMPORT_MULTI_SEPARATOR = ","
+"""
+
+import codecs
+import csv
+from itertools import chain
+
+from django import forms
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import Q
+from django.utils.datastructures import MultiValueDict
+
+from .tracing import span
+
+# Optional XLSX support
+try:
+    import openpyxl
+    HAS_OPENPYXL = True
+except ImportError:
+    HAS_OPENPYXL = False
+
+CSV_DELIMITERS = (",", ";", "\t")
+FALSE_VALUES = {"", "0", "false", "no", "n", "nie", "off"}
+
+
+class ImportFileError(Exception):
+    """The uploaded file cannot be read"""
+
+
+class ImportReport:
+    """Result of an import: created rows and the rows rejected with their errors"""
+
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.error_count = 0
+        self.errors = []  # [(row number, [message, ...]), ...] up to DJCRUDX_IMPORT_MAX_ERRORS
+        self.file_error = None
+
+    def add_error(self, row_number, row_messages):
+        self.error_count += 1
+        if len(self.errors) < getattr(settings, "DJCRUDX_IMPORT_MAX_ERRORS", 100):
+            self.errors.append((row_number, row_messages))
+
+    @property
+    def errors_truncated(self):
+        return self.error_count > len(self.errors)
+
+
+def cell_value(value):
+    """Cell as form data: None -> "", 3.0 -> 3 (XLSX numbers), strings stripped"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def read_rows(uploaded):
+    """Iterator over the rows (lists of cells) of an uploaded CSV or XLSX file"""
+    name = uploaded.name.lower()
+    if name.endswith(".xlsx"):
+        if not HAS_OPENPYXL:
+            raise ImportFileError("XLSX import needs openpyxl (pip install openpyxl).")
+        return _read_xlsx(uploaded)
+    if name.endswith((".csv", ".txt")):
+        return _read_csv(uploaded)
+    raise ImportFileError("Unsupported file type - upload a CSV or XLSX file.")
+
+
+def _read_csv(uploaded):
+    lines = codecs.iterdecode(uploaded, getattr(settings, "DJCRUDX_IMPORT_ENCODING", "utf-8-sig"))
+    first = next(lines, "")
+    # Excel in many locales writes ";" - take the separator used most in the header
+    delimiter = max(CSV_DELIMITERS, key=first.count)
+    for row in csv.reader(chain([first], lines), delimiter=delimiter):
+        yield [cell_value(value) for value in row]
+
+
+def _read_xlsx(uploaded):
+    try:
+        workbook = openpyxl.load_workbook(uploaded, read_only=True, data_only=True)
+    except Exception as e:
+        raise ImportFileError(f"The XLSX file cannot be opened: {e}") from e
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield [cell_value(value) for value in row]
+    finally:
+        workbook.close()
+
+
+def match_columns(header, form, columns=None):
+    """Form field name of every column (None for columns that are not imported)"""
+    mapping = {str(title).strip().lower(): name for title, name in (columns or {}).items()}
+    by_title = {}
+    for name, field in form.fields.items():
+        by_title[name.lower()] = name
+        if field.label:
+            by_title.setdefault(str(field.label).strip().lower(), name)
+    fields = []
+    for title in header:
+        key = str(title).strip().lower()
+        name = mapping.get(key) or by_title.get(key)
+        fields.append(name if name in form.fields else None)
+    return fields
+
+
+def get_import_columns(form_class, columns=None):
+    """Columns accepted by the import: [{"name", "label", "required", "multiple"}, ...]"""
+    form = form_class()
+    headers = {name: title for title, name in (columns or {}).items()}
+    return [
+        {
+            "name": headers.get(name, name),
+            "label": field.label or name,
+            "required": field.required,
+            "multiple": isinstance(field, (forms.ModelMultipleChoiceField, forms.MultipleChoiceField)),
+        }
+        for name, field in form.fields.items()
+        if not field.disabled and not isinstance(field.widget, forms.HiddenInput)
+    ]
+
+
+def row_data(fields, form, row):
+    """Form data of one row; multi-valued columns are split, boolean words normalized"""
+    separator = getattr(settings, "DJCRUDX_IMPORT_MULTI_SEPARATOR", ",")
+    data = MultiValueDict()
+    for name, value in zip(fields, row):
+        if name is None:
+            continue
+        field = form.fields[name]
+        if isinstance(field, (forms.ModelMultipleChoiceField, forms.MultipleChoiceField)):
+            data.setlist(name, [part.strip() for part in str(value).split(separator) if part.strip()])
+        elif isinstance(field, forms.BooleanField) and str(value).lower() in FALSE_VALUES:
+            data[name] = "false"  # CheckboxInput treats any other non-empty string as checked
+        else:
+            data[name] = value
+    return data
+
+
+def _target_field(field):
+    model = field.queryset.model
+    return model._meta.pk if not field.to_field_name else model._meta.get_field(field.to_field_name)
+
+
+def prefetch_choices(form, batch_data, choices=None):
+    """
+    {field name: {key: object}} of the relation values used in the batch, one query per field
+
+    ``choices`` from earlier batches is extended in place; only values not seen
+    before are fetched.
+    """
+    choices = {} if choices is None else choices
+    for name, field in form.fields.items():
+        if not isinstance(field, forms.ModelChoiceField):
+            continue
+        raw_values = [value for data in batch_data for value in data.getlist(name) if value not in field.empty_values]
+        if not raw_values:
+            continue
+        known = choices.setdefault(name, {})
+        target = _target_field(field)
+        values = set()
+        for value in raw_values:
+            try:
+                values.add(target.to_python(value))
+            except ValidationError:
+                pass  # reported as an invalid choice by the form
+        key = field.to_field_name or "pk"
+        values = [value for value in values if str(value) not in known]
+        if values:
+            known.update((str(getattr(obj, key)), obj) for obj in field.queryset.filter(**{f"{key}__in": values}))
+    return choices
+
+
+def lookup_choice(field, value):
+    """Prefetched object of ``value`` (pk or to_field_name) or an invalid_choice error"""
+    try:
+        return field.objects[str(_target_field(field).to_python(value))]
+    except (KeyError, ValidationError):
+        raise ValidationError(field.error_messages["invalid_choice"], code="invalid_choice", params={"value": value})
+
+
+class PrefetchedChoiceField(forms.ModelChoiceField):
+    """ModelChoiceField resolving values from objects prefetched for the batch instead of querying per row"""
+
+    def __init__(self, field, objects):
+        super().__init__(
+            field.queryset, empty_label=None, required=field.required, label=field.label, disabled=field.disabled,
+            to_field_name=field.to_field_name, validators=field.validators, error_messages=field.error_messages,
+        )
+        self.objects = objects
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        return lookup_choice(self, value)
+
+
+class PrefetchedMultipleChoiceField(forms.ModelMultipleChoiceField):
+    """ModelMultipleChoiceField resolving values from objects prefetched for the batch"""
+
+    def __init__(self, field, objects):
+        super().__init__(
+            field.queryset, required=field.required, label=field.label, disabled=field.disabled,
+            to_field_name=field.to_field_name, validators=field.validators, error_messages=field.error_messages,
+        )
+        self.objects = objects
+
+    def clean(self, value):
+        value = self.prepare_value(value)
+        if not value:
+            if self.required:
+                raise ValidationError(self.error_messages["required"], code="required")
+            return []
+        if not isinstance(value, (list, tuple)):
+            raise ValidationError(self.error_messages["invalid_list"], code="invalid_list")
+        objects = list(dict.fromkeys(lookup_choice(self, item) for item in value))
+        self.run_validators(value)
+        return objects
+
+
+def use_choices(form, choices):
+    """Replace the form's relation fields by fields reading the prefetched objects"""
+    for name, objects in choices.items():
+        field = form.fields.get(name)
+        if isinstance(field, forms.ModelMultipleChoiceField):
+            form.fields[name] = PrefetchedMultipleChoiceField(field, objects)
+        elif isinstance(field, forms.ModelChoiceField):
+            form.fields[name] = PrefetchedChoiceField(field, objects)
+
+
+def import_form_class(form_class):
+    """
+    form_class validating rows for a batch import
+
+    Uniqueness is left to check_unique() (one query per check for the whole batch),
+    and ForeignKey values resolved from prefetched objects are not queried again by
+    model validation - they come from the field's queryset, limit_choices_to included.
+    """
+
+    class ImportForm(form_class):
+        def _get_validation_exclusions(self):
+            exclude = set(super()._get_validation_exclusions())
+            exclude.update(
+                name for name, field in self.fields.items()
+                if isinstance(field, PrefetchedChoiceField) and self.cleaned_data.get(name) is not None
+            )
+            return exclude
+
+        def validate_unique(self):
+            pass  # see check_unique()
+
+    ImportForm.__name__ = ImportForm.__qualname__ = f"Import{form_class.__name__}"
+    return ImportForm
+
+
+def get_unique_checks(model, form_fields):
+    """
+    Field name tuples of unique fields, unique_together and UniqueConstraints that are all on the form
+
+    Only constraints on plain fields without a condition (Meta.total_unique_constraints)
+    can be checked with a lookup; the others are left to the database (see save_batch()).
+    """
+    checks = [(field.name,) for field in model._meta.fields if field.unique and not field.primary_key]
+    checks.extend(tuple(names) for names in model._meta.unique_together)
+    checks.extend(tuple(constraint.fields) for constraint in model._meta.total_unique_constraints)
+    checks = list(dict.fromkeys(checks))
+    return [check for check in checks if all(name in form_fields for name in check)]
+
+
+def check_unique(valid, report):
+    """
+    Valid rows without uniqueness conflicts; the others are reported
+
+    Each unique check runs one query for the whole batch; rows repeating a value
+    of an earlier row of the batch are rejected too.
+    """
+    if not valid:
+        return valid
+    model = valid[0][1]._meta.model
+    using = router.db_for_write(model)
+    empty_is_null = connections[using].features.interprets_empty_strings_as_nulls
+    rejected = set()
+    for check in get_unique_checks(model, valid[0][1].fields):
+        attnames = [model._meta.get_field(name).attname for name in check]
+        rows = {}
+        for row_number, form in valid:
+            key = tuple(getattr(form.instance, attname) for attname in attnames)
+            # NULLs never conflict
+            if row_number not in rejected and not any(value is None or (value == "" and empty_is_null) for value in key):
+                rows[row_number] = key
+        if not rows:
+            continue
+        if len(attnames) == 1:
+            lookup = Q(**{f"{attnames[0]}__in": [key[0] for key in rows.values()]})
+        else:
+            lookup = Q()
+            for key in set(rows.values()):
+                lookup |= Q(**dict(zip(attnames, key)))
+        taken = set(model._default_manager.using(using).filter(lookup).values_list(*attnames))
+        for row_number, form in valid:
+            key = rows.get(row_number)
+            if key is None:
+                continue
+            if key in taken:
+                error = form.instance.unique_error_message(model, check)
+                form.add_error(check[0] if len(check) == 1 else None, error)
+                report.add_error(row_number, form_errors(form))
+                rejected.add(row_number)
+            else:
+                taken.add(key)  # later rows of the batch with the same value conflict
+    return [(row_number, form) for row_number, form in valid if row_number not in rejected]
+
+
+def form_errors(form):
+    """Error messages of a row form, prefixed with the field label"""
+    row_messages = []
+    for name, errors in form.errors.items():
+        label = form.fields[name].label if name in form.fields else None
+        row_messages.extend(f"{label or name}: {error}" if name != "__all__" else error for error in errors)
+    return row_messages
+
+
+def save_m2m(valid):
+    """Many-to-many values of the inserted rows - one bulk insert per auto-created through table"""
+    model = valid[0][1]._meta.model
+    for field in model._meta.many_to_many:
+        through = field.remote_field.through
+        forms_with_values = [form for _, form in valid if form.cleaned_data.get(field.name)]
+        if not forms_with_values:
+            continue
+        if not through._meta.auto_created:
+            for form in forms_with_values:
+                field.save_form_data(form.instance, form.cleaned_data[field.name])
+            continue
+        source = through._meta.get_field(field.m2m_field_name()).attname
+        target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+        through._default_manager.bulk_create([
+            through(**{source: form.instance.pk, target: obj.pk})
+            for form in forms_with_values
+            for obj in form.cleaned_data[field.name]
+        ])
+
+
+def save_batch(valid, report):
+    """Insert the validated rows of a batch; on an integrity error only the failing rows are reported"""
+    if not valid:
+        return
+    model = valid[0][1]._meta.model
+    using = router.db_for_write(model)
+    for _, form in valid:
+        form.save(commit=False)
+    has_m2m = any(form.cleaned_data.get(field.name) for _, form in valid for field in model._meta.many_to_many)
+    # Without returned pks the many-to-many rows cannot be linked - save row by row
+    if not has_m2m or connections[using].features.can_return_rows_from_bulk_insert:
+        bulk_save(valid, report, model, using, has_m2m)
+        return
+
+    for row_number, form in valid:
+        try:
+            with transaction.atomic(using=using):
+                form.save()
+        except IntegrityError as e:
+            report.add_error(row_number, [str(e)])
+        else:
+            report.created += 1
+
+
+def bulk_save(valid, report, model, using, has_m2m):
+    """
+    bulk_create ``valid`` in a savepoint; when it fails, retry both halves
+
+    Failing rows are found with about log2(len(valid)) extra inserts each, the
+    rest of the batch is still inserted.
+    """
+    try:
+        with transaction.atomic(using=using):
+            model._default_manager.using(using).bulk_create([form.instance for _, form in valid])
+            if has_m2m:
+                save_m2m(valid)
+    except IntegrityError as e:
+        for _, form in valid:
+            # Rolled back - rows inserted by an earlier statement of bulk_create got a pk
+            form.instance.pk = None
+            form.instance._state.adding = True
+        if len(valid) == 1:
+            report.add_error(valid[0][0], [str(e)])
+            return
+        middle = len(valid) // 2
+        bulk_save(valid[:middle], report, model, using, has_m2m)
+        bulk_save(valid[middle:], report, model, using, has_m2m)
+    else:
+        report.created += len(valid)
+
+
+def import_batch(form_class, form, fields, batch, report, view_name=None, choices=None):
+    """
+    Validate and insert one batch of (row number, cells)
+
+    ``form_class`` should come from import_form_class(); ``choices`` carries the
+    prefetched relation objects over to the next batches.
+    """
+    with span("djcrudx.import_batch", {"djcrudx.view": view_name, "djcrudx.batch_size": len(batch)}):
+        batch_data = [(row_number, row_data(fields, form, row)) for row_number, row in batch]
+        choices = prefetch_choices(form, [data for _, data in batch_data], choices)
+        valid = []
+        for row_number, data in batch_data:
+            row_form = form_class(data=data)
+            use_choices(row_form, choices)
+            if row_form.is_valid():
+                valid.append((row_number, row_form))
+            else:
+                report.add_error(row_number, form_errors(row_form))
+        save_batch(check_unique(valid, report), report)
+
+
+def import_file(uploaded, form_class, columns=None, batch_size=None, view_name=None):
+    """
+    Import an uploaded CSV/XLSX file through ``form_class``
+
+    Rows are numbered as in a spreadsheet (the header is row 1). Batches inserted
+    before a read error stay in the database.
+
+    Returns:
+        ImportReport
+    """
+    batch_size = batch_size or getattr(settings, "DJCRUDX_IMPORT_BATCH_SIZE", 500)
+    report = ImportReport()
+    try:
+        rows = read_rows(uploaded)
+        header = next(rows, None)
+        if not header:
+            raise ImportFileError("The file is empty.")
+        form_class = import_form_class(form_class)
+        form = form_class()
+        fields = match_columns(header, form, columns)
+        if not any(fields):
+            raise ImportFileError("No column of the file matches a form field.")
+
+        batch = []
+        choices = {}
+        for row_number, row in enumerate(rows, start=2):
+            if all(value == "" for value in row):
+                continue  # blank line
+            report.rows += 1
+            batch.append((row_number, row))
+            if len(batch) >= batch_size:
+                import_batch(form_class, form, fields, batch, report, view_name, choices)
+                batch = []
+        if batch:
+            import_batch(form_class, form, fields, batch, report, view_name, choices)
+    except ImportFileError as e:
+        report.file_error = str(e)
+    except (UnicodeDecodeError, csv.Error) as e:
+        report.file_error = f"The file cannot be read: {e}"
+    return report
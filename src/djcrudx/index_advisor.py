@@ -0,0 +1,205 @@
+"""
+Index advisor for table_config sort fields and filter fields.
+
+Cross-checks every sortable ``field`` of a ``table_config`` and every filter of
+the view's ``filter_class`` (following related paths like ``category__name``)
+against the indexes that exist in the database, and suggests missing single
+column and composite (filter + sort) indexes.
+
+Suggestions are only made for project apps. Apps installed into site-packages
+(``django.contrib.*``, third-party packages) and the app labels listed in
+
+    DJCRUDX_INDEX_ADVISOR_EXCLUDE_APPS = ["legacy"]
+
+are reported but get no ``Meta.indexes`` snippet - their models are not yours
+to change.
+"""
+
+import os
+import site
+import sysconfig
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, models
+
+# Lookups that a B-tree index cannot serve
+UNINDEXABLE_LOOKUPS = {"contains", "icontains", "iexact", "endswith", "iendswith", "regex", "iregex", "search"}
+EQUALITY_LOOKUPS = {"exact", "in"}
+
+
+def resolve_path(model, path):
+    """
+    Follow a "relation__field__lookup" path
+
+    Returns:
+        tuple: (target_model, field, relations, lookup) or None if the path is not a model field
+    """
+    current = model
+    field = None
+    relations = []
+    parts = path.split("__")
+    for index, part in enumerate(parts):
+        try:
+            field = current._meta.get_field(part)
+        except FieldDoesNotExist:
+            if field is None or index != len(parts) - 1:
+                return None
+            # Trailing part is a lookup (e.g. name__icontains, category__in)
+            if relations and relations[-1] is field:
+                relations.pop()
+                current = field.model
+            return current, field, relations, part
+        if field.is_relation and index < len(parts) - 1:
+            relations.append(field)
+            current = field.related_model
+    return current, field, relations, "exact"
+
+
+def get_existing_indexes(model, using="default"):
+    """
+    Return index column tuples of the model table
+
+    The database is introspected; if the table does not exist yet, the model
+    definition (db_index, unique, Meta.indexes, unique_together) is used instead.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            if table in connection.introspection.table_names(cursor):
+                constraints = connection.introspection.get_constraints(cursor, table)
+                return [
+                    tuple(constraint["columns"])
+                    for constraint in constraints.values()
+                    if constraint["columns"] and (constraint["index"] or constraint["unique"] or constraint["primary_key"])
+                ]
+    except Exception:
+        pass
+
+    indexes = []
+    for field in model._meta.concrete_fields:
+        if field.primary_key or field.unique or field.db_index:
+            indexes.append((field.column,))
+    for index in model._meta.indexes:
+        if index.fields:
+            indexes.append(tuple(model._meta.get_field(name.lstrip("-")).column for name in index.fields))
+    for fields in model._meta.unique_together:
+        indexes.append(tuple(model._meta.get_field(name).column for name in fields))
+    return indexes
+
+
+def find_index(indexes, columns):
+    """Return the first index whose leading columns match ``columns``"""
+    columns = tuple(columns)
+    for index_columns in indexes:
+        if index_columns[: len(columns)] == columns:
+            return index_columns
+    return None
+
+
+def get_filter_paths(filter_class):
+    """Return [(filter_name, field_path)] for filters based on model fields"""
+    if filter_class is None:
+        return []
+    paths = []
+    for name, filter_obj in filter_class.base_filters.items():
+        if getattr(filter_obj, "method", None) or not filter_obj.field_name:
+            continue
+        lookup = filter_obj.lookup_expr or "exact"
+        paths.append((name, f"{filter_obj.field_name}__{lookup}" if lookup != "exact" else filter_obj.field_name))
+    return paths
+
+
+def analyze(model, table_config, filter_class=None, using="default"):
+    """
+    Analyze one list view configuration
+
+    Returns:
+        dict: {"checks": [...], "missing": [(model, field)], "composite": [(model, (field, field))]}
+    """
+    checks = []
+    missing = []
+    composite = []
+    index_cache = {}
+
+    def indexes_for(target):
+        if target not in index_cache:
+            index_cache[target] = get_existing_indexes(target, using)
+        return index_cache[target]
+
+    def check(kind, name, path):
+        resolved = resolve_path(model, path)
+        if resolved is None:
+            checks.append({"kind": kind, "name": name, "status": "skip", "detail": "not a model field"})
+            return None
+        target, field, relations, lookup = resolved
+
+        for relation in relations:
+            if relation.many_to_one and relation.concrete and not relation.db_index:
+                checks.append({"kind": kind, "name": name, "status": "missing", "detail": f"join column {relation.model._meta.db_table}.{relation.column}"})
+                missing.append((relation.model, relation.name))
+
+        if field.many_to_many or field.one_to_many or not getattr(field, "concrete", False):
+            checks.append({"kind": kind, "name": name, "status": "ok", "detail": "relation (indexed join table / foreign key)"})
+            return None
+        if lookup in UNINDEXABLE_LOOKUPS:
+            checks.append({"kind": kind, "name": name, "status": "skip", "detail": f"'{lookup}' cannot use a B-tree index"})
+            return None
+
+        index = find_index(indexes_for(target), [field.column])
+        table = target._meta.db_table
+        if index:
+            checks.append({"kind": kind, "name": name, "status": "ok", "detail": f"{table}({', '.join(index)})"})
+        else:
+            checks.append({"kind": kind, "name": name, "status": "missing", "detail": f"{table}.{field.column}"})
+            missing.append((target, field.name))
+        return target, field, relations, lookup
+
+    sort_fields = []
+    for col in table_config:
+        if col.get("field"):
+            resolved = check("sort", col["field"], col["field"])
+            if resolved and not resolved[2]:
+                sort_fields.append(resolved[1])
+
+    for name, path in get_filter_paths(filter_class):
+        resolved = check("filter", name, path)
+        if not resolved or resolved[2] or resolved[3] not in EQUALITY_LOOKUPS:
+            continue
+        # Equality filter on the model itself + sort on the same table = composite candidate
+        filter_field = resolved[1]
+        for sort_field in sort_fields:
+            if sort_field == filter_field:
+                continue
+            columns = (filter_field.column, sort_field.column)
+            if not find_index(indexes_for(model), columns):
+                composite.append((model, (filter_field.name, sort_field.name)))
+                checks.append({"kind": "composite", "name": f"{filter_field.name} + {sort_field.name}", "status": "candidate", "detail": f"{model._meta.db_table}({', '.join(columns)})"})
+
+    return {"checks": checks, "missing": missing, "composite": composite}
+
+
+def build_index(model, fields):
+    """Create a named models.Index for ``fields`` of ``model``"""
+    index = models.Index(fields=list(fields))
+    index.set_name_with_model(model)
+    return index
+
+
+def get_package_dirs():
+    """Directories that installed (non-project) packages live in"""
+    dirs = set(site.getsitepackages()) | {site.getusersitepackages()}
+    dirs.update(sysconfig.get_paths()[key] for key in ("purelib", "platlib"))
+    return {os.path.realpath(path) for path in dirs if path}
+
+
+def is_project_app(app_config, exclude=()):
+    """True for apps of the project itself - not installed packages, not excluded"""
+    excluded = set(exclude) | set(getattr(settings, "DJCRUDX_INDEX_ADVISOR_EXCLUDE_APPS", ()))
+    if app_config.label in excluded or app_config.name in excluded:
+        return False
+    path = os.path.realpath(app_config.path)
+    if {"site-packages", "dist-packages"} & set(path.split(os.sep)):
+        return False
+    return not any(path == root or path.startswith(root + os.sep) for root in get_package_dirs())
@@ -0,0 +1,141 @@
+"""
+Keyset (cursor) pagination helpers for the infinite-scroll datatable.
+
+Rows are ordered by (sort field, pk) with NULLs last, and a cursor holds the
+sort value and pk of the last row sent. The next chunk is selected with a
+row-value comparison ``(field, pk) > (value, pk)``, a single range on a
+``(field, pk)`` index instead of an ever growing OFFSET. For nullable sort
+fields the trailing NULL block is added with ``OR field IS NULL``, which
+planners may serve as a second range; non-nullable fields get the plain range
+(and a plain ORDER BY direction that a backward index scan can serve).
+"""
+
+import base64
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import BooleanField, Expression, F, Q, Value
+
+from .index_advisor import resolve_path
+
+SORT_ALIAS = "djcrudx_sort_value"
+
+
+class RowValueCompare(Expression):
+    """``(a, b) > (c, d)`` row-value comparison; expanded to ORs where row values are not supported"""
+
+    output_field = BooleanField()
+    conditional = True
+
+    def __init__(self, lhs, operator, rhs):
+        super().__init__()
+        self.lhs, self.operator, self.rhs = list(lhs), operator, list(rhs)
+
+    def get_source_expressions(self):
+        return [*self.lhs, *self.rhs]
+
+    def set_source_expressions(self, exprs):
+        self.lhs, self.rhs = exprs[:len(self.lhs)], exprs[len(self.lhs):]
+
+    def compile_sides(self, compiler):
+        return [compiler.compile(expr) for expr in self.lhs], [compiler.compile(expr) for expr in self.rhs]
+
+    def as_sql(self, compiler, connection):
+        lhs, rhs = self.compile_sides(compiler)
+        params = [param for _sql, side_params in lhs + rhs for param in side_params]
+        sql = "(%s) %s (%s)" % (", ".join(sql for sql, _ in lhs), self.operator, ", ".join(sql for sql, _ in rhs))
+        return sql, params
+
+    def as_oracle(self, compiler, connection):
+        # (a > c) OR (a = c AND b > d)
+        lhs, rhs = self.compile_sides(compiler)
+        branches, params = [], []
+        for index in range(len(lhs)):
+            parts = []
+            for (left, left_params), (right, right_params) in zip(lhs[:index], rhs[:index]):
+                parts.append(f"{left} = {right}")
+                params.extend(left_params + right_params)
+            (left, left_params), (right, right_params) = lhs[index], rhs[index]
+            parts.append(f"{left} {self.operator} {right}")
+            params.extend(left_params + right_params)
+            branches.append("(%s)" % " AND ".join(parts))
+        return "(%s)" % " OR ".join(branches), params
+
+
+def is_nullable(model, field):
+    """Can the sort value be NULL (nullable column, nullable or reverse join on the path, annotation)?"""
+    if field == "pk":
+        return False
+    resolved = resolve_path(model, field)
+    if resolved is None or resolved[3] != "exact":
+        return True
+    _target, model_field, relations, _lookup = resolved
+    if any(getattr(relation, "null", True) for relation in relations):
+        return True
+    return getattr(model_field, "null", True) or not getattr(model_field, "concrete", False)
+
+
+def get_sort_key(queryset, ordering=None):
+    """
+    Return (field, descending) for ``ordering`` ("-price") or the model's default ordering
+
+    Falls back to the primary key when the default ordering is not a plain field name.
+    """
+    if not ordering:
+        default = queryset.model._meta.ordering
+        ordering = default[0] if default and isinstance(default[0], str) else "pk"
+    descending = ordering.startswith("-")
+    field = ordering.lstrip("-")
+    if field in ("pk", queryset.model._meta.pk.name):
+        field = "pk"
+    return field, descending
+
+
+def order_queryset(queryset, field, descending):
+    """Order by (field, pk) with NULLs last; the sort value is annotated as SORT_ALIAS"""
+    pk_order = "-pk" if descending else "pk"
+    if field == "pk":
+        return queryset.order_by(pk_order)
+    queryset = queryset.annotate(**{SORT_ALIAS: F(field)})
+    nulls_last = True if is_nullable(queryset.model, field) else None
+    expression = F(SORT_ALIAS).desc(nulls_last=nulls_last) if descending else F(SORT_ALIAS).asc(nulls_last=nulls_last)
+    return queryset.order_by(expression, pk_order)
+
+
+def encode_cursor(obj, field):
+    value = obj.pk if field == "pk" else getattr(obj, SORT_ALIAS)
+    raw = json.dumps([value, obj.pk], cls=DjangoJSONEncoder)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    """Return (value, pk) or None; raises ValueError for malformed cursors"""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        value, pk = json.loads(raw)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+    return value, pk
+
+
+def apply_cursor(queryset, field, descending, cursor):
+    """Filter ``queryset`` (ordered by order_queryset) to rows after ``cursor``"""
+    value, pk = cursor
+    after_pk = Q(pk__lt=pk) if descending else Q(pk__gt=pk)
+    if field == "pk":
+        return queryset.filter(after_pk)
+    if value is None:
+        # Inside the trailing NULL block only the pk decides
+        return queryset.filter(Q(**{f"{SORT_ALIAS}__isnull": True}) & after_pk)
+    output_field = queryset.query.annotations[SORT_ALIAS].output_field
+    after = RowValueCompare(
+        [F(SORT_ALIAS), F("pk")],
+        "<" if descending else ">",
+        [Value(value, output_field=output_field), Value(pk, output_field=queryset.model._meta.pk)],
+    )
+    if not is_nullable(queryset.model, field):
+        return queryset.filter(after)
+    # Row values with a NULL compare as unknown - the NULL block after the last value is added explicitly
+    return queryset.filter(Q(after) | Q(**{f"{SORT_ALIAS}__isnull": True}))
@@ -0,0 +1,94 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from ...index_advisor import analyze, build_index, is_project_app
+from ...registry import discover_views
+
+
+class Command(BaseCommand):
+    help = "Report missing indexes for sortable and filterable fields of DjCrudX list views"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--config", help="Dotted path to a table_config (instead of discovering registered views)")
+        parser.add_argument("--model", help="Model for --config, e.g. shop.Product")
+        parser.add_argument("--filter", dest="filter_class", help="Dotted path to the django-filter FilterSet for --config")
+        parser.add_argument("--view", action="append", default=[], help="Only analyze this view name (repeatable)")
+        parser.add_argument("--no-composite", action="store_true", help="Do not suggest composite indexes")
+        parser.add_argument("--exclude-app", action="append", default=[], help="Do not suggest indexes for this app label (repeatable)")
+        parser.add_argument("--database", default="default", help="Database to introspect")
+
+    def handle(self, *args, **options):
+        targets = self.get_targets(options)
+        if not targets:
+            self.stdout.write(self.style.WARNING("No DjCrudX list views found."))
+            return
+
+        suggestions = {}
+        for view_name, model, table_config, filter_class in targets:
+            result = analyze(model, table_config, filter_class, using=options["database"])
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{view_name} ({model._meta.label})"))
+            for check in result["checks"]:
+                if check["kind"] == "composite" and options["no_composite"]:
+                    continue
+                line = f"  {check['kind']:<9} {check['name']:<30} {check['status']:<9} {check['detail']}"
+                if check["status"] == "missing":
+                    self.stdout.write(self.style.ERROR(line))
+                elif check["status"] == "candidate":
+                    self.stdout.write(self.style.WARNING(line))
+                else:
+                    self.stdout.write(line)
+
+            for target, field_name in result["missing"]:
+                suggestions.setdefault(target, []).append((field_name,))
+            if not options["no_composite"]:
+                for target, fields in result["composite"]:
+                    suggestions.setdefault(target, []).append(fields)
+
+        if not suggestions:
+            self.stdout.write(self.style.SUCCESS("\nAll sortable and filterable fields are indexed."))
+            return
+
+        skipped = []
+        for target, field_sets in suggestions.items():
+            indexes = [build_index(target, fields) for fields in dict.fromkeys(field_sets)]
+            if not is_project_app(target._meta.app_config, options["exclude_app"]):
+                skipped.append((target, indexes))
+                continue
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\nSuggested Meta.indexes for {target._meta.label}:"))
+            self.stdout.write("    class Meta:")
+            self.stdout.write("        indexes = [")
+            for index in indexes:
+                self.stdout.write(f"            models.Index(fields={list(index.fields)!r}, name={index.name!r}),")
+            self.stdout.write("        ]")
+
+        if skipped:
+            self.stdout.write(self.style.WARNING("\nNot a project app, index these in the database yourself if needed:"))
+            for target, indexes in skipped:
+                fields = ", ".join(f"({', '.join(index.fields)})" for index in indexes)
+                self.stdout.write(f"  {target._meta.label}: {fields}")
+
+    def get_targets(self, options):
+        """Return [(view_name, model, table_config, filter_class)]"""
+        if options["config"]:
+            if not options["model"]:
+                raise CommandError("--model is required with --config")
+            try:
+                model = apps.get_model(options["model"])
+                table_config = import_string(options["config"])
+                filter_class = import_string(options["filter_class"]) if options["filter_class"] else None
+            except (ImportError, LookupError, ValueError) as e:
+                raise CommandError(str(e))
+            return [(options["config"], model, table_config, filter_class)]
+
+        targets = []
+        seen = set()
+        for entry in discover_views():
+            if entry["kind"] != "list" or (options["view"] and entry["view_name"] not in options["view"]):
+                continue
+            key = (entry["view_name"], id(entry["table_config"]))
+            if key in seen:
+                continue
+            seen.add(key)
+            targets.append((entry["view_name"], entry["model"], entry["table_config"], entry.get("filter_class")))
+        return targets
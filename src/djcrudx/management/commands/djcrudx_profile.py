@@ -0,0 +1,97 @@
+import io
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from ...profiling import collapse_pstats, profile_request, write_collapsed
+
+
+def default_host():
+    """First ALLOWED_HOSTS entry usable as HTTP_HOST (the test client uses 'testserver')"""
+    for host in settings.ALLOWED_HOSTS:
+        if host != "*":
+            return host.lstrip(".")
+    return "testserver" if settings.ALLOWED_HOSTS else "localhost"
+
+
+class Command(BaseCommand):
+    help = "Replay a request against a DjCrudX view under cProfile and capture the SQL log"
+
+    def add_arguments(self, parser):
+        parser.add_argument("url", help="Path to replay, e.g. /products/?page=3")
+        parser.add_argument("--user", help="Username to log in as")
+        parser.add_argument("--repeat", type=int, default=1, help="Number of profiled requests")
+        parser.add_argument("--method", default="GET", choices=["GET", "POST"])
+        parser.add_argument("--data", action="append", default=[], help="POST field as key=value (repeatable)")
+        parser.add_argument(
+            "--allow-writes", action="store_true",
+            help="Commit the replayed requests (by default every replay is rolled back)",
+        )
+        parser.add_argument("--warm", action="store_true", help="Send one unprofiled request first (cold caches excluded)")
+        parser.add_argument("--host", help="HTTP Host header (default: first ALLOWED_HOSTS entry)")
+        parser.add_argument("--output", default="djcrudx_profile.folded", help="Collapsed stacks file for flamegraph tools")
+        parser.add_argument("--stats-file", help="Also dump raw cProfile stats (for snakeviz, pstats)")
+        parser.add_argument("--top", type=int, default=25, help="Number of functions and queries in the summary")
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1")
+        user = None
+        if options["user"]:
+            try:
+                user = get_user_model()._default_manager.get_by_natural_key(options["user"])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"User '{options['user']}' does not exist")
+
+        data = {}
+        for item in options["data"]:
+            key, sep, value = item.partition("=")
+            if not sep:
+                raise CommandError(f"--data expects key=value, got '{item}'")
+            data.setdefault(key, []).append(value)
+
+        host = options["host"] or default_host()
+        rollback = not options["allow_writes"]
+        if options["warm"]:
+            profile_request(options["url"], user, options["method"], data, repeat=1, host=host, rollback=rollback)
+        result = profile_request(
+            options["url"], user, options["method"], data, repeat=options["repeat"], host=host, rollback=rollback
+        )
+
+        stacks = collapse_pstats(result["stats"])
+        write_collapsed(stacks, options["output"])
+        if options["stats_file"]:
+            result["stats"].dump_stats(options["stats_file"])
+
+        self.print_summary(result, options)
+        self.stdout.write(self.style.SUCCESS(f"\nCollapsed stacks written to {options['output']}"))
+
+    def print_summary(self, result, options):
+        responses = result["responses"]
+        top = options["top"]
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{options['method']} {options['url']} x{len(responses)}"))
+        for index, (status, seconds) in enumerate(responses, 1):
+            query_count = len(result["queries"][index - 1])
+            query_ms = sum(float(query["time"]) for query in result["queries"][index - 1]) * 1000
+            self.stdout.write(f"  #{index}: {status}  {seconds * 1000:8.1f} ms  {query_count} queries ({query_ms:.1f} ms SQL)")
+        if any(status >= 400 for status, _seconds in responses):
+            self.stdout.write(self.style.WARNING("  Some requests failed - check --user and the URL"))
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\nTop {top} functions by cumulative time:"))
+        stream = io.StringIO()
+        stats = result["stats"]
+        stats.stream = stream
+        stats.sort_stats("cumulative").print_stats(top)
+        self.stdout.write(stream.getvalue().split("\n", 4)[-1] if "ncalls" in stream.getvalue() else stream.getvalue())
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Slowest {top} queries:"))
+        queries = sorted(
+            (query for request_queries in result["queries"] for query in request_queries),
+            key=lambda query: float(query["time"]),
+            reverse=True,
+        )
+        for query in queries[:top]:
+            sql = query["sql"] if len(query["sql"]) <= 200 else query["sql"][:200] + "..."
+            self.stdout.write(f"  {float(query['time']) * 1000:8.1f} ms  {sql}")
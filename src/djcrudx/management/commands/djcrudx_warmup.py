@@ -0,0 +1,38 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from ...warmup import SHARED_STEPS, warmup
+
+
+class Command(BaseCommand):
+    help = "Warm the shared DjCrudX caches (widget choices, first list pages)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Username used to render the first page of every list view")
+        parser.add_argument(
+            "--skip", action="append", default=[], choices=[name for name, _step in SHARED_STEPS],
+            help="Skip a step (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        failed = []
+
+        def report(name, seconds, detail, error):
+            line = f"  {name:<14} {seconds * 1000:8.1f} ms  "
+            if error is not None:
+                failed.append(name)
+                self.stdout.write(self.style.ERROR(f"{line}{type(error).__name__}: {error}"))
+            else:
+                self.stdout.write(f"{line}{detail}")
+
+        start = time.perf_counter()
+        try:
+            warmup(username=options["user"], skip=options["skip"], callback=report, steps=SHARED_STEPS)
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist")
+
+        if failed:
+            raise CommandError(f"Warm-up steps failed: {', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS(f"Warm-up finished in {(time.perf_counter() - start) * 1000:.1f} ms"))
@@ -0,0 +1,156 @@
+"""
+Per-phase timing for DjCrudX views.
+
+Every phase of a CRUD view (filter, count, page fetch, datatable preparation,
+widget rendering, template rendering, ...) is timed and passed to a pluggable
+hook. The default hook keeps Prometheus-style histograms in process memory,
+exposed in text format by ``djcrudx.views.metrics_view``.
+
+Settings:
+    DJCRUDX_METRICS_ENABLED = True      # False switches timing off completely
+    DJCRUDX_METRICS_HOOK = "myapp.metrics.observe"  # callable(view_name, phase, seconds)
+    DJCRUDX_METRICS_BUCKETS = (0.005, 0.01, ...)    # histogram buckets in seconds
+    DJCRUDX_METRICS_TOKEN = "..."       # Bearer token for metrics_view (staff users need none)
+"""
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NULL_CONTEXT = nullcontext()
+
+
+def metrics_enabled():
+    """Check if phase timing is switched on"""
+    return getattr(settings, "DJCRUDX_METRICS_ENABLED", True)
+
+
+_hook = None
+
+
+def get_hook():
+    """Return the configured timing hook (dotted path or callable), resolved once"""
+    global _hook
+    if _hook is None:
+        hook = getattr(settings, "DJCRUDX_METRICS_HOOK", None)
+        if hook is None:
+            hook = observe
+        elif isinstance(hook, str):
+            hook = import_string(hook)
+        _hook = hook
+    return _hook
+
+
+def _reset_on_setting_change(setting, **kwargs):
+    global _hook, _registry
+    if setting == "DJCRUDX_METRICS_HOOK":
+        _hook = None
+    elif setting == "DJCRUDX_METRICS_BUCKETS":
+        _registry = None
+
+
+setting_changed.connect(_reset_on_setting_change)
+
+
+@contextmanager
+def _timer(view_name, phase):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        get_hook()(view_name or "unknown", phase, time.perf_counter() - start)
+
+
+def timed(view_name, phase):
+    """
+    Context manager timing one phase of a view
+
+    Example:
+        with timed("shop:product_list", "count"):
+            total = queryset.count()
+    """
+    if not metrics_enabled():
+        return _NULL_CONTEXT
+    return _timer(view_name, phase)
+
+
+class HistogramRegistry:
+    """Thread-safe in-memory histograms keyed by (view_name, phase)"""
+
+    def __init__(self, buckets=None):
+        self.buckets = tuple(sorted(buckets or DEFAULT_BUCKETS))
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, view_name, phase, seconds):
+        """Record one duration"""
+        with self._lock:
+            series = self._series.get((view_name, phase))
+            if series is None:
+                series = self._series[(view_name, phase)] = {
+                    "counts": [0] * len(self.buckets),
+                    "sum": 0.0,
+                    "count": 0,
+                }
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series["counts"][index] += 1
+                    break
+            series["sum"] += seconds
+            series["count"] += 1
+
+    def reset(self):
+        """Drop all recorded data"""
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self):
+        """Return a copy of all series: {(view_name, phase): {"counts", "sum", "count"}}"""
+        with self._lock:
+            return {key: {"counts": list(value["counts"]), "sum": value["sum"], "count": value["count"]} for key, value in self._series.items()}
+
+    def render_prometheus(self, metric_name="djcrudx_phase_duration_seconds"):
+        """Render all histograms in Prometheus text exposition format"""
+        lines = [
+            f"# HELP {metric_name} Time spent in each phase of DjCrudX views.",
+            f"# TYPE {metric_name} histogram",
+        ]
+        for (view_name, phase), series in sorted(self.snapshot().items()):
+            labels = f'view="{_escape_label(view_name)}",phase="{_escape_label(phase)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, series["counts"]):
+                cumulative += count
+                lines.append(f'{metric_name}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+            lines.append(f'{metric_name}_bucket{{{labels},le="+Inf"}} {series["count"]}')
+            lines.append(f"{metric_name}_sum{{{labels}}} {series['sum']:.6f}")
+            lines.append(f"{metric_name}_count{{{labels}}} {series['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Return the process-wide histogram registry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = HistogramRegistry(getattr(settings, "DJCRUDX_METRICS_BUCKETS", None))
+    return _registry
+
+
+def observe(view_name, phase, seconds):
+    """Default hook - record duration in the built-in histograms"""
+    get_registry().observe(view_name, phase, seconds)
@@ -1,10 +1,130 @@
-from django.core.paginator import Paginator
+import json
+from decimal import Decimal
+from itertools import chain, islice
+from urllib.parse import urlencode
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.paginator import Page, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Avg, Count, F, Max, Min, QuerySet, Sum
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
 from django.apps import apps
 from django.conf import settings
 from django.forms import inlineformset_factory
 from django.template import Template, Context
+from django.utils.html import format_html
+from django.template.loader import get_template, render_to_string
 from django.templatetags.static import static
+from django.urls import NoReverseMatch, reverse
+
+from . import coalesce
+from .coalesce import single_flight
+from .column_profiler import call_column, column_profiler
+from .conditional import is_conditional_request, list_validators, not_modified, set_validators
+from .facets import compute_facets, get_facet_field
+from .index_advisor import resolve_path
+from .keyset import apply_cursor, decode_cursor, encode_cursor, get_sort_key, order_queryset
+from .metrics import timed
+from .row_cache import get_cached_rows
+from .slow_queries import capture_slow_queries
+from .timeouts import StatementTimeout, get_default_timeout, statement_timeout
+from .tracing import span
+
+ROWS_MARKER = "<!--djcrudx:rows-->"
+
+AGGREGATES = {"sum": Sum, "avg": Avg, "min": Min, "max": Max, "count": Count}
+
+
+def get_referenced_names(expression):
+    """First path segment of every F() in an ORM expression, e.g. {"tag_count"} for Sum("tag_count")"""
+    if isinstance(expression, F):
+        return {expression.name.split("__")[0]}
+    names = set()
+    for source in getattr(expression, "get_source_expressions", lambda: [])():
+        if source is not None:
+            names |= get_referenced_names(source)
+    return names
+
+
+class TableRow(list):
+    """Cells of a datatable row; sort_keys is the JSON of client-side sort values"""
+
+    sort_keys = ""
+
+
+# form_sections entry rendering all inline formsets
+INLINE_FORMSETS = "inline_config"
+
+
+def build_form_layout(form, form_sections):
+    """
+    Resolve form_sections to bound fields once, in section order
+
+    Returns:
+        list: [{"section": section, "fields": [BoundField or INLINE_FORMSETS, ...]}, ...]
+        Names that are not form fields are skipped (reported by the djcrudx.W001 check).
+    """
+    layout = []
+    for section in form_sections:
+        fields = []
+        for field_name in section.get("fields", []):
+            if field_name == INLINE_FORMSETS:
+                fields.append(INLINE_FORMSETS)
+            elif field_name in form.fields:
+                fields.append(form[field_name])
+        layout.append({"section": section, "fields": fields})
+    return layout
+
+
+def build_detail_layout(detail_config, detail_sections):
+    """
+    Index detail_config by field and resolve detail_sections once (at view creation)
+
+    Returns:
+        list: [{"section": section, "fields": [config, ...]}, ...]
+        Names without a detail_config entry are skipped (reported by the djcrudx.W002 check).
+    """
+    configs = {}
+    for config in detail_config:
+        configs.setdefault(config.get("field"), config)
+    return [
+        {"section": section, "fields": [configs[name] for name in section.get("fields", []) if name in configs]}
+        for section in detail_sections or []
+    ]
+
+
+def get_detail_relations(model, detail_config):
+    """
+    (select_related, prefetch_related) implied by the fields of detail_config
+
+    To-one paths (foreign keys, one-to-one relations in both directions) are joined,
+    paths through to-many relations are prefetched. Generic foreign keys are skipped.
+    Entries may also declare "select_related" / "prefetch_related" explicitly.
+    """
+    select_related = []
+    prefetch_related = []
+    for config in detail_config:
+        select_related.extend(config.get("select_related", []))
+        prefetch_related.extend(config.get("prefetch_related", []))
+        resolved = resolve_path(model, config["field"]) if config.get("field") else None
+        if resolved is None:
+            continue
+        _target, field, relations, _lookup = resolved
+        if field.is_relation:
+            relations = [*relations, field]
+        if not relations:
+            continue
+        if any(relation.many_to_many or relation.one_to_many for relation in relations):
+            # Reverse relations are prefetched by their accessor (e.g. "order_set")
+            prefetch_related.append("__".join(
+                relation.get_accessor_name() if not relation.concrete and hasattr(relation, "get_accessor_name") else relation.name
+                for relation in relations
+            ))
+        elif all(relation.concrete or (relation.one_to_one and relation.auto_created) for relation in relations):
+            # Reverse one-to-one relations are joined by their query name (e.g. "profile")
+            select_related.append("__".join(relation.name for relation in relations))
+    return list(dict.fromkeys(select_related)), list(dict.fromkeys(prefetch_related))
 
 
 def add_base_template_context(context):
@@ -124,20 +244,21 @@ def render_with_readonly(request, template_name, context, readonly_fields=None,
         instance = context.get('form').instance if context.get('form') else None
         
         for config in inline_config:
-            formset_class = inlineformset_factory(
-                config['parent_model'],
-                config['child_model'],
-                form=config.get('form_class'),
-                fields=config['fields'],
-                extra=config.get('extra', 3),
-                can_delete=config.get('can_delete', True),
-                can_delete_extra=True
-            )
-            
-            if request.method == 'POST':
-                formset = formset_class(request.POST, instance=instance)
-            else:
-                formset = formset_class(instance=instance)
+            with span("djcrudx.formset", {"djcrudx.formset": config['name']}):
+                formset_class = inlineformset_factory(
+                    config['parent_model'],
+                    config['child_model'],
+                    form=config.get('form_class'),
+                    fields=config['fields'],
+                    extra=config.get('extra', 3),
+                    can_delete=config.get('can_delete', True),
+                    can_delete_extra=True
+                )
+                
+                if request.method == 'POST':
+                    formset = formset_class(request.POST, instance=instance)
+                else:
+                    formset = formset_class(instance=instance)
                 
             formsets[config['name']] = {
                 'formset': formset,
@@ -145,10 +266,87 @@ def render_with_readonly(request, template_name, context, readonly_fields=None,
             }
         
         context['inline_formsets'] = formsets
+
+    # Section -> bound field layout, so the template does not search the form per field name
+    if context.get("form_sections") and "form" in context and "form_layout" not in context:
+        context["form_layout"] = build_form_layout(context["form"], context["form_sections"])
     
     return render(request, template_name, context)
 
 
+def render_list(request, template_name, context):
+    """
+    Render a list view; pages marked with ``stream_rows`` are streamed
+
+    The page is rendered with a marker in place of the table body and sent as a
+    StreamingHttpResponse: everything before the marker, then rows rendered one by
+    one from the ``rows`` generator, then the rest of the page.
+    """
+    if not context.get("stream_rows"):
+        return render(request, template_name, context)
+
+    context["rows_marker"] = ROWS_MARKER
+    head, _marker, tail = render_to_string(template_name, context, request).partition(ROWS_MARKER)
+    row_template = get_template("crud/_partials/datatable_row.html").template
+
+    def render_rows():
+        for row in context["rows"]:
+            yield row_template.render(Context({"row": row}))
+
+    return StreamingHttpResponse(chain([head], render_rows(), [tail]), content_type="text/html; charset=utf-8")
+
+
+def list_view_response(request, queryset, table_config, view_name, filter_class=None, version_field=None,
+                       infinite_scroll=False, row_cache_field=None, timeout=None, coalesce=None, extra_context=None):
+    """
+    Response of a CRUD list view for an already scoped ``queryset``
+
+    Filters the queryset, answers conditional GETs (the validator query's count and
+    column aggregates are reused by the page), serves the infinite-scroll rows
+    endpoint and renders ``crud/list_view.html`` with ``extra_context``.
+    """
+    if filter_class:
+        with timed(view_name, "filter"), span("djcrudx.filter", {"djcrudx.view": view_name}):
+            filter_obj = filter_class(request.GET, queryset=queryset)
+            queryset = filter_obj.qs
+    else:
+        filter_obj = None
+
+    mixin = CrudListMixin()
+    mixin.statement_timeout = timeout
+    mixin.coalesce = coalesce
+    etag = count = aggregate_values = None
+    rows_request = infinite_scroll and request.GET.get("format") == "rows"
+    if version_field and is_conditional_request(request):
+        # 304 before the page fetch and rendering; the count and column aggregates are reused below
+        aggregates = None if rows_request else mixin.get_aggregates(table_config)
+        validated = queryset.annotate(**mixin.get_aggregate_annotations(table_config)) if aggregates else queryset
+        try:
+            with timed(view_name, "validate"), statement_timeout(mixin.get_statement_timeout()):
+                etag, count, aggregate_values = list_validators(
+                    request, validated, version_field, view_name, mixin.table_views_enabled(request, view_name), aggregates,
+                )
+        except StatementTimeout:
+            etag = count = aggregate_values = None  # as slow as the count - the list view degrades below
+        if etag:
+            response = not_modified(request, etag)
+            if response is not None:
+                return response
+
+    if rows_request:
+        response = mixin.get_rows_response(queryset, table_config, request, view_name=view_name, row_cache_field=row_cache_field)
+        return set_validators(response, etag) if etag else response
+    context = mixin.get_datatable_context(
+        queryset, filter_obj, table_config, request, view_name=view_name, infinite_scroll=infinite_scroll,
+        count=count, aggregate_values=aggregate_values, row_cache_field=row_cache_field,
+    )
+    context.update(extra_context or {})
+
+    with timed(view_name, "render"):
+        response = render_list(request, "crud/list_view.html", context)
+    return set_validators(response, etag) if etag else response
+
+
 def apply_readonly_fields(form, readonly_fields):
     """Apply readonly to form fields"""
     for field_name in readonly_fields:
@@ -184,20 +382,21 @@ class InlineFormsetMixin:
         formsets = {}
         
         for config in self.get_inline_config():
-            formset_class = inlineformset_factory(
-                config['parent_model'],
-                config['child_model'],
-                form=config.get('form_class'),
-                fields=config['fields'],
-                extra=config.get('extra', 3),
-                can_delete=config.get('can_delete', True),
-                can_delete_extra=True
-            )
-            
-            if request.method == 'POST':
-                formset = formset_class(request.POST, instance=instance)
-            else:
-                formset = formset_class(instance=instance)
+            with span("djcrudx.formset", {"djcrudx.formset": config['name']}):
+                formset_class = inlineformset_factory(
+                    config['parent_model'],
+                    config['child_model'],
+                    form=config.get('form_class'),
+                    fields=config['fields'],
+                    extra=config.get('extra', 3),
+                    can_delete=config.get('can_delete', True),
+                    can_delete_extra=True
+                )
+                
+                if request.method == 'POST':
+                    formset = formset_class(request.POST, instance=instance)
+                else:
+                    formset = formset_class(instance=instance)
                 
             formsets[config['name']] = formset
             
@@ -208,7 +407,8 @@ class InlineFormsetMixin:
         for name, formset in formsets.items():
             if formset.is_valid():
                 formset.instance = instance
-                formset.save()
+                with span("djcrudx.formset_save", {"djcrudx.formset": name}):
+                    formset.save()
     
     def validate_inline_formsets(self, formsets):
         """Validate all inline formsets"""
@@ -218,7 +418,7 @@ class InlineFormsetMixin:
 class PaginationMixin:
     """Mixin for easy pagination in views"""
 
-    def paginate_queryset(self, queryset, request, per_page_default=25):
+    def paginate_queryset(self, queryset, request, per_page_default=25, aggregates=None, single_page_annotations=None, count=None, count_queryset=None, aggregate_values=None):
         """
         Paginate queryset and return page_obj and context for pagination component
 
@@ -226,44 +426,244 @@ class PaginationMixin:
             queryset: QuerySet to paginate
             request: HttpRequest object
             per_page_default: default number of items per page
+            aggregates: optional {alias: aggregate expression} computed in the count query
+            single_page_annotations: optional {alias: expression} added to the rows when all of them fit on one page
+            count: row count when already known (e.g. from the conditional GET validator); skips the count query
+            count_queryset: queryset for the count/aggregate query, e.g. without display-only annotations
+            aggregate_values: {alias: value} of ``aggregates`` when already known together with ``count``
 
         Returns:
             tuple: (page_obj, pagination_context)
         """
-        per_page = int(request.GET.get("per_page", per_page_default))
+        per_page = self.get_per_page(request, per_page_default)
         paginator = Paginator(queryset, per_page)
+        count_queryset = queryset if count_queryset is None else count_queryset
         page_number = request.GET.get("page")
-        page_obj = paginator.get_page(page_number)
-        
-        # Build query string preserving existing params
-        from urllib.parse import urlencode
+        view_name = getattr(self, "view_name", None)
+
+        def fetch():
+            return self.fetch_page(request, paginator, page_number, count_queryset, aggregates, single_page_annotations, count, aggregate_values)
+
+        key = self.get_coalesce_key(queryset, count_queryset, page_number, per_page, aggregates, single_page_annotations, count, aggregate_values)
+        if key is None:
+            result = fetch()
+        else:
+            own_rows = []
+
+            def fetch_shared():
+                # Only primary keys are shared - every request builds its own instances
+                result = fetch()
+                if result["rows"] is not None:
+                    own_rows.append(result["rows"])
+                    result = dict(result, rows=[obj.pk for obj in result["rows"]])
+                return result
+
+            with timed(view_name, "coalesce"), span("djcrudx.coalesce", {"djcrudx.view": view_name}) as current:
+                result, shared = single_flight.do(key, fetch_shared)
+                current.set_attribute("djcrudx.coalesced", shared)
+            if own_rows:
+                result = dict(result, rows=own_rows[0])
+            elif result["rows"] is not None:
+                annotations = single_page_annotations if result["single_page"] else None
+                try:
+                    rows = self.get_rows_by_pk(paginator.object_list, result["rows"], annotations)
+                except StatementTimeout:
+                    result = dict(result, rows=[], query_timeout=True)
+                else:
+                    result = dict(result, rows=rows)
+
+        # Rebuild the page from the (possibly shared) result
+        paginator.count = result["count"]
+        if result["rows"] is None:
+            # Streamed page - rows are iterated while the response is sent
+            page_obj = paginator.page(result["number"])
+            if result["single_page"] and single_page_annotations and isinstance(paginator.object_list, QuerySet):
+                page_obj.object_list = paginator.object_list.annotate(**single_page_annotations)
+        else:
+            page_obj = Page(list(result["rows"]), result["number"], paginator)
+        total_count = result["total_count"]
+        row_count = result["row_count"]
+        stream_rows = result["rows"] is None
+        single_page = result["single_page"]
+        aggregate_values = dict(result["aggregate_values"])
+        query_timeout = result["query_timeout"]
+
+        # Build query string preserving existing params (QueryDict.urlencode keeps multi-valued filters)
         query_params = request.GET.copy()
         query_params.pop('page', None)  # Remove page for base_url
-        base_url = f"{request.path}?{urlencode(query_params)}&" if query_params else f"{request.path}?"
+        base_url = f"{request.path}?{query_params.urlencode()}&" if query_params else f"{request.path}?"
         
         query_params_per_page = request.GET.copy()
         query_params_per_page.pop('per_page', None)  # Remove per_page
         query_params_per_page.pop('page', None)  # Remove page
-        per_page_base_url = f"{request.path}?{urlencode(query_params_per_page)}&" if query_params_per_page else f"{request.path}?"
+        per_page_base_url = f"{request.path}?{query_params_per_page.urlencode()}&" if query_params_per_page else f"{request.path}?"
         
         # Generate page range for pagination
         page_range = self._get_page_range(page_obj, paginator)
 
+        max_per_page = self.get_max_per_page()
         pagination_context = {
             "page_obj": page_obj,
             "request_get": request.GET,
-            "per_page_options": [10, 25, 50, 100],
+            "per_page_options": [option for option in [10, 25, 50, 100] if not max_per_page or option <= max_per_page],
             "current_per_page": per_page,
-            "start_index": page_obj.start_index() if page_obj.object_list else 0,
-            "end_index": page_obj.end_index() if page_obj.object_list else 0,
-            "total_count": paginator.count,
+            "start_index": page_obj.start_index() if row_count else 0,
+            "end_index": page_obj.start_index() + row_count - 1 if row_count else 0,
+            "total_count": total_count,
             "base_url": base_url,
             "per_page_base_url": per_page_base_url,
             "page_range": page_range,
+            "stream_rows": stream_rows,
+            "single_page": single_page,
+            "aggregate_values": aggregate_values,
+            "query_timeout": query_timeout,
         }
 
         return page_obj, pagination_context
     
+    def fetch_page(self, request, paginator, page_number, count_queryset, aggregates=None, single_page_annotations=None, count=None, aggregate_values=None):
+        """
+        Run the count/aggregate and page queries
+
+        Returns a plain dict (picklable, shared by coalesced requests) with the final
+        paginator count, the page number and rows - None for pages left lazy to be streamed.
+        A known ``count`` (with ``aggregate_values`` when there are aggregates) skips the count query.
+        """
+        view_name = getattr(self, "view_name", None)
+        queryset = paginator.object_list
+        per_page = paginator.per_page
+        timeout = self.get_statement_timeout()
+        query_timeout = False
+        known = count is not None and set(aggregates or ()) <= set(aggregate_values or ())
+        with timed(view_name, "count"), span("djcrudx.count", {"djcrudx.view": view_name}) as current, capture_slow_queries(view_name, "count", timeout):
+            try:
+                with statement_timeout(timeout):
+                    if known:
+                        # Counted by the conditional GET validator query
+                        paginator.count = count  # Paginator.count is a cached_property
+                        aggregate_values = {alias: aggregate_values[alias] for alias in aggregates or {}}
+                    elif aggregates:
+                        # Count and column aggregates in a single query
+                        aggregate_values = count_queryset.order_by().aggregate(djcrudx_count=Count("pk"), **aggregates)
+                        paginator.count = aggregate_values.pop("djcrudx_count")
+                    else:
+                        aggregate_values = {}
+                        if count_queryset is not queryset:
+                            paginator.count = count_queryset.count()
+                    total_count = paginator.count
+            except StatementTimeout:
+                # Degrade - no exact count and no aggregates, the page is fetched without them
+                query_timeout = True
+                aggregate_values = {}
+                total_count = None
+            current.set_attribute("djcrudx.total_count", total_count)
+            current.set_attribute("djcrudx.query_timeout", query_timeout)
+
+        page_attributes = {"djcrudx.view": view_name, "djcrudx.per_page": per_page, "djcrudx.ordering": request.GET.get("ordering")}
+        with timed(view_name, "page"), span("djcrudx.page_fetch", page_attributes) as current, capture_slow_queries(view_name, "page", timeout):
+            if query_timeout:
+                page_obj = self.get_page_without_count(paginator, page_number, timeout)
+                total_count = paginator.count  # rows known so far
+                row_count = len(page_obj.object_list)
+                stream_rows = single_page = False
+            else:
+                page_obj = paginator.get_page(page_number)
+                row_count = page_obj.end_index() - page_obj.start_index() + 1 if total_count else 0
+                stream_rows = self.should_stream(row_count)
+                single_page = total_count <= per_page
+                if single_page and single_page_annotations and isinstance(paginator.object_list, QuerySet):
+                    # The whole result is this page - fetch it unsliced together with the annotations
+                    page_obj.object_list = paginator.object_list.annotate(**single_page_annotations)
+                if not stream_rows:
+                    # Fetch the page here so the query is timed apart from datatable preparation
+                    try:
+                        with statement_timeout(timeout):
+                            page_obj.object_list = list(page_obj.object_list)
+                    except StatementTimeout:
+                        query_timeout = True
+                        page_obj.object_list = []
+            current.set_attribute("djcrudx.page", page_obj.number)
+            current.set_attribute("djcrudx.row_count", row_count)
+
+        return {
+            "count": paginator.count,
+            "total_count": total_count,
+            "aggregate_values": aggregate_values,
+            "number": page_obj.number,
+            "rows": None if stream_rows else page_obj.object_list,
+            "row_count": row_count,
+            "single_page": single_page,
+            "query_timeout": query_timeout,
+        }
+
+    def get_rows_by_pk(self, queryset, pks, annotations=None):
+        """Rows of ``queryset`` with the given primary keys, in their order (page shared by a coalesced request)"""
+        if not pks:
+            return []
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        with timed(getattr(self, "view_name", None), "page"), statement_timeout(self.get_statement_timeout()):
+            objects = queryset.order_by().in_bulk(pks)  # StatementTimeout is handled by the caller
+        return [objects[pk] for pk in pks if pk in objects]
+
+    def get_coalesce_key(self, queryset, count_queryset, page_number, per_page, aggregates=None, single_page_annotations=None, count=None, aggregate_values=None):
+        """Single-flight key of the count/page queries, or None when coalescing is off"""
+        enabled = getattr(self, "coalesce", None)
+        if not (enabled if enabled is not None else coalesce.is_enabled()):
+            return None
+        if not isinstance(queryset, QuerySet) or not isinstance(count_queryset, QuerySet):
+            return None
+        parts = (
+            getattr(self, "view_name", None), page_number or "1", per_page, count, self.get_statement_timeout(),
+            repr(sorted((aggregates or {}).items())), repr(sorted((single_page_annotations or {}).items())),
+            repr(sorted((aggregate_values or {}).items())),
+        )
+        return coalesce.query_key(*parts, querysets=(queryset, count_queryset))
+
+    def get_statement_timeout(self):
+        """Milliseconds for the count/page/facet queries (statement_timeout attribute or setting)"""
+        timeout = getattr(self, "statement_timeout", None)
+        return timeout if timeout is not None else get_default_timeout()
+
+    def get_page_without_count(self, paginator, page_number, timeout):
+        """
+        Page fetched as per_page + 1 rows after the count timed out
+
+        paginator.count is set to the rows known so far, so "next" exists exactly when
+        the extra row does. A page query that times out too gives an empty page.
+        """
+        try:
+            number = max(int(page_number), 1)
+        except (TypeError, ValueError):
+            number = 1
+        offset = (number - 1) * paginator.per_page
+        try:
+            with statement_timeout(timeout):
+                rows = list(paginator.object_list[offset:offset + paginator.per_page + 1])
+        except StatementTimeout:
+            rows = []
+        paginator.count = offset + len(rows)
+        return Page(rows[:paginator.per_page], number, paginator)
+
+    def get_max_per_page(self):
+        return getattr(settings, "DJCRUDX_MAX_PER_PAGE", 500)
+
+    def get_per_page(self, request, per_page_default=25):
+        """per_page from the query string; invalid values fall back to the default, large ones are capped"""
+        try:
+            per_page = int(request.GET.get("per_page", per_page_default))
+        except (TypeError, ValueError):
+            per_page = per_page_default
+        if per_page < 1:
+            per_page = per_page_default
+        max_per_page = self.get_max_per_page()
+        return min(per_page, max_per_page) if max_per_page else per_page
+
+    def should_stream(self, row_count):
+        """Stream pages with at least DJCRUDX_STREAM_ROWS_THRESHOLD rows"""
+        threshold = getattr(settings, "DJCRUDX_STREAM_ROWS_THRESHOLD", None)
+        return bool(threshold) and row_count >= threshold
+
     def _get_page_range(self, page_obj, paginator):
         """Generate smart page range with ellipsis"""
         current = page_obj.number
@@ -284,77 +684,156 @@ class PaginationMixin:
 class DataTableMixin:
     """Mixin for datatable handling"""
 
-    def prepare_datatable(self, table_config, page_obj):
+    def prepare_datatable(self, table_config, page_obj, row_cache_field=None):
         """
         Generate datatable data from configuration
 
         Args:
             table_config: list of dictionaries with column configuration
             page_obj: pagination object
+            row_cache_field: version field enabling the rendered row cache (see row_cache.py)
 
         Returns:
             tuple: (table_headers, table_rows)
         """
+        table_headers = self.prepare_headers(table_config)
+
+        table_rows = []
+        with column_profiler.sample(getattr(self, "view_name", None)) as measure:
+            if row_cache_field:
+                rows, _rendered = get_cached_rows(
+                    page_obj.object_list, table_config, row_cache_field,
+                    lambda obj: [render_cell_html(self.prepare_cell(col, obj, measure)) for col in table_config],
+                    get_prefetch_related(table_config),
+                )
+                table_rows = [TableRow(cells) for cells in rows]
+            else:
+                for obj in page_obj.object_list:
+                    table_rows.append(TableRow(self.prepare_cell(col, obj, measure) for col in table_config))
+
+        return table_headers, table_rows
+
+    def prepare_headers(self, table_config):
         table_headers = []
         for col in table_config:
             header = {"label": col["label"], "filter_field": col.get("filter_field"), "field": col.get("field"), "key": col.get("key")}
             table_headers.append(header)
+        return table_headers
 
-        table_rows = []
-        for obj in page_obj.object_list:
-            row = []
-            for col in table_config:
-                cell_value = col["value"](obj)
-
-                # If cell has URL, create link
-                if col.get("url"):
-                    url_data = col["url"](obj)
-                    if isinstance(url_data, tuple) and len(url_data) == 2:
-                        # Format: ("app:name", {"arg": value})
-                        from django.urls import reverse
-
-                        url_name, url_kwargs = url_data
-                        url = reverse(url_name, kwargs=url_kwargs)
-                    else:
-                        # Fallback for string URL
-                        url = str(url_data)
-                    cell_value = f'<a href="{url}" class="text-blue-600 hover:text-blue-800">{cell_value}</a>'
-
-                # If cell has actions, add action icons
-                if col.get("actions"):
-                    actions_html = ""
-                    for action in col["actions"]:
-                        action_url_data = action["url"](obj)
-                        if isinstance(action_url_data, tuple) and len(action_url_data) == 2:
-                            from django.urls import reverse
-
-                            action_url = reverse(action_url_data[0], kwargs=action_url_data[1])
-                        else:
-                            action_url = str(action_url_data)
-                        action_title = action.get("title", "")
-                        actions_html += f'<a href="{action_url}" class="mr-1 text-gray-600 hover:text-gray-800" title="{action_title}">{action["icon"]}</a>'
-                    cell_value = f"{actions_html}{cell_value}"
-
-                # If cell has is_badge flag, pass it to template
-                if col.get("is_badge"):
-                    if col.get("badge_data"):
-                        # Handle badge_data for multiple badges
-                        badges = col["badge_data"](obj)
-                        badge_html = ""
-                        for badge in badges:
-                            # Check if color starts with [ (custom) or is Tailwind class
-                            bg_class = f"bg-{badge['background_color']}" if not badge["background_color"].startswith("[") else f"bg-{badge['background_color']}"
-                            text_class = f"text-{badge['text_color']}" if not badge["text_color"].startswith("[") else f"text-{badge['text_color']}"
-                            badge_html += f'<span class="px-2 py-1 rounded text-xs {bg_class} {text_class}">{badge["name"]}</span>'
-                        cell_value = badge_html
-                    elif hasattr(cell_value, "bg_color"):
-                        # Handle single badge with attributes
-                        cell_value.is_badge = True
-
-                row.append(cell_value)
-            table_rows.append(row)
+    def iter_rows(self, table_config, object_list, chunk_size=500, row_cache_field=None):
+        """
+        Generate rows one by one without materializing the page (streaming mode)
 
-        return table_headers, table_rows
+        With row_cache_field rows go through the row cache chunk by chunk; the columns'
+        prefetch_related lookups (left out by optimize_queryset) run for the missing rows.
+        """
+        if isinstance(object_list, QuerySet):
+            object_list = object_list.iterator(chunk_size=chunk_size)
+        if not row_cache_field:
+            for obj in object_list:
+                yield [self.prepare_cell(col, obj) for col in table_config]
+            return
+
+        prefetch_related = get_prefetch_related(table_config)
+        object_list = iter(object_list)
+        while True:
+            chunk = list(islice(object_list, chunk_size))
+            if not chunk:
+                return
+            rows, _rendered = get_cached_rows(
+                chunk, table_config, row_cache_field,
+                lambda obj: [render_cell_html(self.prepare_cell(col, obj)) for col in table_config],
+                prefetch_related,
+            )
+            for cells in rows:
+                yield TableRow(cells)
+
+    def prepare_cell(self, col, obj, measure=None):
+        """
+        Generate a single cell value
+
+        Args:
+            col: column configuration
+            obj: row object
+            measure: optional callable(label, phase, func, obj) used by the column profiler
+        """
+        measure = measure or call_column
+        label = col["label"]
+        cell_value = measure(label, "value", col["value"], obj)
+
+        # If cell has URL, create link
+        if col.get("url"):
+            url = measure(label, "url", lambda o: _resolve_url(col["url"](o)), obj)
+            cell_value = f'<a href="{url}" class="text-blue-600 hover:text-blue-800">{cell_value}</a>'
+
+        # If cell has actions, add action icons
+        if col.get("actions"):
+            actions_html = measure(label, "actions", lambda o: _render_actions(col["actions"], o), obj)
+            cell_value = f"{actions_html}{cell_value}"
+
+        # If cell has is_badge flag, pass it to template
+        if col.get("is_badge"):
+            if col.get("badge_data"):
+                # Handle badge_data for multiple badges
+                cell_value = measure(label, "badges", lambda o: _render_badges(col["badge_data"](o)), obj)
+            elif hasattr(cell_value, "bg_color"):
+                # Handle single badge with attributes
+                cell_value.is_badge = True
+
+        return cell_value
+
+
+def render_cell_html(cell):
+    """HTML of a prepared cell, as rendered by _partials/datatable_row.html"""
+    if getattr(cell, "is_badge", False) and getattr(cell, "bg_color", None) and getattr(cell, "txt_color", None):
+        return format_html(
+            '<span class="px-2 py-1 rounded text-xs bg-[{}] text-[{}]">{}</span>', cell.bg_color, cell.txt_color, cell.name
+        )
+    return str(cell)
+
+
+def _js_value(value):
+    """JSON safe to embed in an inline <script>"""
+    return json.dumps(value).replace("<", "\\u003c").replace(">", "\\u003e").replace("&", "\\u0026")
+
+
+def get_prefetch_related(table_config):
+    """prefetch_related lookups of the displayed columns"""
+    return list(dict.fromkeys(chain.from_iterable(col.get("prefetch_related", []) for col in table_config)))
+
+
+def get_column_key(col):
+    """Stable column identifier used by saved table views"""
+    return col.get("key") or col.get("field") or str(col["label"])
+
+
+def _resolve_url(url_data):
+    """Resolve ("app:name", {"arg": value}) tuple or plain string to URL"""
+    if isinstance(url_data, tuple) and len(url_data) == 2:
+        # Format: ("app:name", {"arg": value})
+        url_name, url_kwargs = url_data
+        return reverse(url_name, kwargs=url_kwargs)
+    # Fallback for string URL
+    return str(url_data)
+
+
+def _render_actions(actions, obj):
+    actions_html = ""
+    for action in actions:
+        action_url = _resolve_url(action["url"](obj))
+        action_title = action.get("title", "")
+        actions_html += f'<a href="{action_url}" class="mr-1 text-gray-600 hover:text-gray-800" title="{action_title}">{action["icon"]}</a>'
+    return actions_html
+
+
+def _render_badges(badges):
+    badge_html = ""
+    for badge in badges:
+        # Check if color starts with [ (custom) or is Tailwind class
+        bg_class = f"bg-{badge['background_color']}" if not badge["background_color"].startswith("[") else f"bg-{badge['background_color']}"
+        text_class = f"text-{badge['text_color']}" if not badge["text_color"].startswith("[") else f"text-{badge['text_color']}"
+        badge_html += f'<span class="px-2 py-1 rounded text-xs {bg_class} {text_class}">{badge["name"]}</span>'
+    return badge_html
 
 
 class ReadonlyFormMixin:
@@ -378,13 +857,368 @@ class ReadonlyFormMixin:
 class CrudListMixin(PaginationMixin, DataTableMixin):
     """Complete mixin for list views with datatable and personalization"""
 
-    def apply_user_view(self, table_config, request, view_name):
-        """Apply user's personalized view - requires TableView model in your app"""
-        # This method requires a TableView model in your application
-        # Remove or customize this method based on your needs
-        return table_config
+    view_name = None
+    statement_timeout = None  # ms for count/page/facet queries, defaults to DJCRUDX_STATEMENT_TIMEOUT_MS
+    coalesce = None  # share count/page queries of identical concurrent requests, defaults to DJCRUDX_COALESCE
+
+    def table_views_enabled(self, request, view_name):
+        """Saved views need djcrudx.urls in the URLconf and a logged-in user"""
+        if not view_name or not getattr(settings, "DJCRUDX_TABLE_VIEWS", True):
+            return False
+        if not getattr(request, "user", None) or not request.user.is_authenticated:
+            return False
+        try:
+            reverse("djcrudx:table_views", kwargs={"view_name": view_name})
+        except NoReverseMatch:
+            return False
+        return True
+
+    def get_user_view(self, request, view_name):
+        """TableView chosen with ?view=<id>, otherwise the user's default (?view=none - all columns)"""
+        from .models import TableView
+
+        requested = request.GET.get("view")
+        views = TableView.objects.filter(user=request.user, view_name=view_name)
+        if requested == "none":
+            return None
+        if requested and requested.isdigit():
+            return views.filter(pk=requested).first()
+        return views.filter(is_default=True).first()
+
+    def apply_user_view(self, table_config, table_view):
+        """
+        Return table_config with the user's column order, hidden columns removed
+
+        Hidden columns are dropped before rows are prepared, so their value/url/badge
+        callables and their select_related/prefetch_related/only fields cost nothing.
+        Columns missing from the saved config (added later) are shown at the end, keys
+        of removed columns and malformed entries are ignored. A view hiding every
+        column shows all of them.
+        """
+        if table_view is None:
+            return table_config
+        column_config = table_view.column_config if isinstance(table_view.column_config, list) else []
+        settings_by_key = {item.get("key"): item for item in column_config if isinstance(item, dict)}
+        columns = []
+        for index, col in enumerate(table_config):
+            item = settings_by_key.get(get_column_key(col))
+            if item is None:
+                columns.append((len(table_config) + index, col))
+            elif item.get("visible", True) is not False:
+                order = item.get("order")
+                columns.append((order if isinstance(order, int) and not isinstance(order, bool) else index, col))
+        if not columns:
+            return table_config
+        return [col for _order, col in sorted(columns, key=lambda entry: entry[0])]
+
+    def get_aggregates(self, table_config):
+        """
+        {alias: expression} for columns declaring "aggregate"
+
+        Column keys:
+            "aggregate": "sum" | "avg" | "min" | "max" | "count"
+            "aggregate_field": "amount"  # defaults to "field"
+            "aggregate_format": lambda value: f"{value:.2f} zł"  # optional
+        """
+        aggregates = {}
+        for index, col in enumerate(table_config):
+            if not col.get("aggregate"):
+                continue
+            function = AGGREGATES.get(col["aggregate"])
+            field = col.get("aggregate_field") or col.get("field")
+            if function is None or not field:
+                raise ImproperlyConfigured(
+                    f"Column '{col['label']}': aggregate must be one of {', '.join(AGGREGATES)} and needs a field"
+                )
+            aggregates[f"djcrudx_aggregate_{index}"] = function(field)
+        return aggregates
+
+    def get_aggregate_annotations(self, table_config):
+        """
+        {alias: expression} of "annotate" columns the column aggregates refer to
+
+        The count/aggregate query runs without the display annotations, so an
+        aggregate over an annotated column (e.g. the sum of "tag_count") needs them.
+        """
+        annotated = {col["field"]: col["annotate"] for col in table_config if "annotate" in col and col.get("field")}
+        if not annotated:
+            return {}
+        referenced = set()
+        for expression in self.get_aggregates(table_config).values():
+            referenced |= get_referenced_names(expression)
+        return {alias: expression for alias, expression in annotated.items() if alias in referenced}
+
+    def map_aggregate_values(self, aggregate_values, all_columns, table_config):
+        """Aggregate values of ``all_columns`` re-keyed to the column positions of ``table_config`` (a user view)"""
+        if aggregate_values is None or table_config is all_columns:
+            return aggregate_values
+        positions = {id(col): index for index, col in enumerate(all_columns)}
+        mapped = {}
+        for index, col in enumerate(table_config):
+            alias = f"djcrudx_aggregate_{positions.get(id(col))}"
+            if alias in aggregate_values:
+                mapped[f"djcrudx_aggregate_{index}"] = aggregate_values[alias]
+        return mapped
+
+    def prepare_footer(self, table_config, aggregate_values):
+        """Footer cells aligned with the columns (None for columns without an aggregate)"""
+        if not aggregate_values:
+            return None
+        footer = []
+        for index, col in enumerate(table_config):
+            alias = f"djcrudx_aggregate_{index}"
+            if alias not in aggregate_values:
+                footer.append(None)
+                continue
+            value = aggregate_values[alias]
+            if value is not None and col.get("aggregate_format"):
+                value = col["aggregate_format"](value)
+            footer.append({"value": "" if value is None else value, "aggregate": col["aggregate"]})
+        return footer
+
+    def apply_annotations(self, queryset, table_config, all_columns, ordering=None):
+        """
+        Annotate columns declaring "annotate" that are displayed or sorted on
+
+        Column keys:
+            "field": "total"                   # annotation alias, also the ?ordering= name
+            "annotate": Sum("lines__amount")   # ORM expression
+            "value": lambda o: o.total
+        """
+        sort_field = ordering.lstrip("-") if ordering else None
+        displayed = {id(col) for col in table_config}
+        annotations = {}
+        for col in all_columns:
+            if "annotate" not in col:
+                continue
+            if not col.get("field"):
+                raise ImproperlyConfigured(f"Column '{col['label']}': \"annotate\" needs a \"field\" alias")
+            if id(col) in displayed or col["field"] == sort_field:
+                annotations[col["field"]] = col["annotate"]
+        return queryset.annotate(**annotations) if annotations else queryset
+
+    def order_by_column(self, queryset, ordering, table_config):
+        """
+        Apply ?ordering=; annotated columns sort with NULLs last and a pk tiebreak
+
+        (aggregates such as Sum/Count repeat values often, so rows would move between pages)
+        """
+        field = ordering.lstrip("-")
+        if not any(col.get("field") == field and "annotate" in col for col in table_config):
+            return queryset.order_by(ordering)
+        if ordering.startswith("-"):
+            return queryset.order_by(F(field).desc(nulls_last=True), "-pk")
+        return queryset.order_by(F(field).asc(nulls_last=True), "pk")
+
+    def optimize_queryset(self, queryset, table_config, version_field=None):
+        """
+        Apply "select_related", "prefetch_related" and "only" of the displayed columns
+
+        Column keys:
+            "select_related": ["category"]
+            "prefetch_related": ["tags"]
+            "only": ["name", "price"]  # fields read by the column callables
+
+        only() is applied when every displayed column declares "only"; version_field
+        (read by the row cache) is then loaded too. With the row cache prefetching is
+        left to get_cached_rows(), which prefetches only the rows it renders.
+        """
+        select_related = []
+        prefetch_related = []
+        only = []
+        for col in table_config:
+            select_related.extend(col.get("select_related", []))
+            prefetch_related.extend(col.get("prefetch_related", []))
+            if only is not None and "only" in col:
+                only.extend(col["only"])
+                # select_related relations must not be deferred
+                only.extend(path.split("__")[0] for path in col.get("select_related", []))
+            else:
+                only = None
+        if select_related:
+            queryset = queryset.select_related(*dict.fromkeys(select_related))
+        if prefetch_related and not version_field:
+            queryset = queryset.prefetch_related(*dict.fromkeys(prefetch_related))
+        if only:
+            if version_field:
+                only.append(version_field)
+            queryset = queryset.only(queryset.model._meta.pk.name, *dict.fromkeys(only))
+        return queryset
+
+    def apply_facets(self, table_headers, table_config, filter_instance, total_count):
+        """
+        Attach facet counts to header filter widgets of columns with "facet": True
+
+        Column keys:
+            "facet": True            # or the filter name if it differs from the header filter
+            "facet_field": "tags"    # model path, defaults to the filter's field_name
+        """
+        if filter_instance is None:
+            return
+        max_rows = getattr(settings, "DJCRUDX_FACET_MAX_ROWS", 100000)
+        if max_rows is not None and total_count > max_rows:
+            return
+
+        facets = {}
+        widgets = {}
+        for header, col in zip(table_headers, table_config):
+            bound_field = header["filter_field"]
+            if not col.get("facet") or not hasattr(bound_field, "field"):
+                continue
+            name = col["facet"] if isinstance(col["facet"], str) else bound_field.name
+            field = col.get("facet_field") or get_facet_field(filter_instance, name)
+            if field:
+                facets[name] = field
+                widgets[name] = bound_field.field.widget
+        if not facets:
+            return
+
+        with timed(self.view_name, "facets"), span("djcrudx.facets", {"djcrudx.view": self.view_name}) as current:
+            try:
+                with statement_timeout(self.get_statement_timeout()):
+                    counts = compute_facets(filter_instance, facets, self.view_name)
+            except StatementTimeout:
+                current.set_attribute("djcrudx.query_timeout", True)
+                return
+            current.set_attribute("djcrudx.facet_count", len(counts))
+        for name, widget in widgets.items():
+            widget.facet_counts = counts[name]
+
+    def client_side_enabled(self, pagination_context):
+        """Sort and text-filter in the browser when the whole result is on one page"""
+        max_rows = getattr(settings, "DJCRUDX_CLIENT_SIDE_MAX_ROWS", 500)
+        return (
+            bool(max_rows)
+            and pagination_context["single_page"]
+            and not pagination_context["stream_rows"]
+            and 0 < pagination_context["total_count"] <= max_rows
+        )
 
-    def get_datatable_context(self, queryset, filter_instance, table_config, request):
+    def get_sort_annotations(self, queryset, table_config):
+        """
+        {alias: F(field)} for sortable columns that can be sorted in the browser
+
+        The values come from the page query itself (no extra queries per row).
+        Fields across to-many relations would duplicate rows, so those columns
+        keep the server-side sort link, as do relation fields themselves (the server
+        sorts those by the related model's ordering).
+        """
+        annotations = {}
+        if not getattr(settings, "DJCRUDX_CLIENT_SIDE_MAX_ROWS", 500):
+            return annotations
+        for index, col in enumerate(table_config):
+            field = col.get("field")
+            if field and "annotate" in col:
+                # Annotated column (see apply_annotations) - one value per row
+                annotations[f"djcrudx_sort_{index}"] = F(field)
+                continue
+            resolved = resolve_path(queryset.model, field) if field else None
+            if resolved is None or resolved[3] != "exact":
+                continue
+            _target, model_field, relations, _lookup = resolved
+            if model_field.is_relation or any(rel.many_to_many or rel.one_to_many for rel in relations):
+                continue
+            annotations[f"djcrudx_sort_{index}"] = F(field)
+        return annotations
+
+    def attach_sort_keys(self, table_headers, table_rows, objects, annotations):
+        """Mark client-sortable headers and store each row's sort values in row.sort_keys"""
+        indexes = [int(alias.rsplit("_", 1)[1]) for alias in annotations]
+        for index in indexes:
+            table_headers[index]["client_sort"] = True
+        for row, obj in zip(table_rows, objects):
+            keys = {}
+            for index, alias in zip(indexes, annotations):
+                value = getattr(obj, alias, None)
+                keys[index] = float(value) if isinstance(value, Decimal) else value
+            row.sort_keys = json.dumps(keys, cls=DjangoJSONEncoder)
+
+    def prepare_sort_urls(self, table_headers, request):
+        """
+        Sort state and URLs of sortable headers, so the template only prints them
+
+        Sets header["sort_state"] ("asc", "desc" or None), header["sort_url_asc"],
+        header["sort_url_desc"] and header["sort_url"] (the link target: descending
+        when sorted ascending, else ascending). Multi-valued filter params are kept.
+        """
+        params = request.GET.copy()
+        params.pop("page", None)
+        ordering = params.pop("ordering", [None])[-1]
+        prefix = f"?{params.urlencode()}&" if params else "?"
+        for header in table_headers:
+            field = header["field"]
+            if not field:
+                continue
+            header["sort_state"] = "asc" if ordering == field else "desc" if ordering == f"-{field}" else None
+            header["sort_url_asc"] = prefix + urlencode({"ordering": field})
+            header["sort_url_desc"] = prefix + urlencode({"ordering": f"-{field}"})
+            header["sort_url"] = header["sort_url_desc"] if header["sort_state"] == "asc" else header["sort_url_asc"]
+
+    def get_search_url_prefix(self, request):
+        """Query string the search box appends "search=<text>" to (current params without search/page)"""
+        params = request.GET.copy()
+        for key in ("search", "page"):
+            params.pop(key, None)
+        return f"?{params.urlencode()}&" if params else "?"
+
+    def get_ordering(self, request, table_config):
+        """?ordering= if it names a sortable column (hidden columns stay sortable), else None"""
+        ordering = request.GET.get("ordering")
+        if ordering:
+            valid_fields = [col.get("field") for col in table_config if col.get("field")]
+            if ordering.lstrip("-") in valid_fields:
+                return ordering
+        return None
+
+    def get_rows_response(self, queryset, table_config, request, view_name=None, row_cache_field=None):
+        """
+        JSON rows endpoint of the infinite-scroll datatable
+
+        GET ?format=rows&cursor=<token> returns {"rows": [[cell html, ...], ...], "next": <token or null>}
+        with the same columns and cell output as the HTML table. No count query is run.
+        """
+        if view_name:
+            self.view_name = view_name
+
+        table_view = self.get_user_view(request, self.view_name) if self.table_views_enabled(request, self.view_name) else None
+        ordering = self.get_ordering(request, table_config)
+        field, descending = get_sort_key(queryset, ordering)
+        all_columns = table_config
+        table_config = self.apply_user_view(table_config, table_view)
+        queryset = self.apply_annotations(queryset, table_config, all_columns, ordering)
+        try:
+            cursor = decode_cursor(request.GET.get("cursor"))
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        queryset = self.optimize_queryset(order_queryset(queryset, field, descending), table_config, row_cache_field)
+        if cursor is not None:
+            queryset = apply_cursor(queryset, field, descending, cursor)
+
+        chunk_size = self.get_per_page(request)
+        with timed(self.view_name, "page"), span("djcrudx.page_fetch", {"djcrudx.view": self.view_name, "djcrudx.per_page": chunk_size}) as current, capture_slow_queries(self.view_name, "page", self.get_statement_timeout()):
+            try:
+                with statement_timeout(self.get_statement_timeout()):
+                    objects = list(queryset[:chunk_size + 1])
+            except StatementTimeout:
+                current.set_attribute("djcrudx.query_timeout", True)
+                return JsonResponse({"error": "Query timed out - refine the filters."}, status=503)
+            current.set_attribute("djcrudx.row_count", len(objects))
+        has_next = len(objects) > chunk_size
+        objects = objects[:chunk_size]
+
+        def render_row(obj):
+            return [render_cell_html(self.prepare_cell(col, obj)) for col in table_config]
+
+        with timed(self.view_name, "prepare"):
+            if row_cache_field:
+                rows, _rendered = get_cached_rows(objects, table_config, row_cache_field, render_row, get_prefetch_related(table_config))
+            else:
+                rows = [render_row(obj) for obj in objects]
+
+        return JsonResponse({"rows": rows, "next": encode_cursor(objects[-1], field) if has_next else None})
+
+    def get_datatable_context(self, queryset, filter_instance, table_config, request, view_name=None, infinite_scroll=False, count=None, row_cache_field=None, aggregate_values=None):
         """
         Complete datatable handling - filtering, pagination, data generation
 
@@ -393,35 +1227,99 @@ class CrudListMixin(PaginationMixin, DataTableMixin):
             filter_instance: django-filter instance
             table_config: column configuration
             request: HttpRequest object
+            view_name: URL name of the view (used for metrics and saved views)
+            infinite_scroll: render the first chunk only; further rows come from get_rows_response()
+            count: row count when already known; skips the count query
+            row_cache_field: version field enabling the rendered row cache, e.g. "updated_at"
+            aggregate_values: get_aggregates(table_config) values computed together with ``count``
 
         Returns:
             dict: context for template
         """
-        # Temporarily disabled - apply user's personalized view
-        # if view_name and (request.GET.get('view') or TableView.objects.filter(user=request.user, view_name=view_name, is_default=True).exists()):
-        #     table_config = self.apply_user_view(table_config, request, view_name)
+        if view_name:
+            self.view_name = view_name
+
+        all_columns = table_config
+        table_views_enabled = self.table_views_enabled(request, self.view_name)
+        table_view = self.get_user_view(request, self.view_name) if table_views_enabled else None
+        table_config = self.apply_user_view(table_config, table_view)
 
         # Handle sorting
-        ordering = request.GET.get("ordering")
-        if ordering:
-            # Check if field exists in table_config
-            valid_fields = [col.get("field") for col in table_config if col.get("field")]
-            field = ordering.lstrip("-")
-            if field in valid_fields:
-                queryset = queryset.order_by(ordering)
+        ordering = self.get_ordering(request, all_columns)
+        annotated = self.apply_annotations(queryset, table_config, all_columns, ordering)
+        # Rows are counted without the display annotations (aggregates would add JOINs and GROUP BY),
+        # except those the column aggregates refer to
+        aggregates = self.get_aggregates(table_config)
+        count_queryset = None
+        if annotated is not queryset:
+            aggregate_annotations = self.get_aggregate_annotations(table_config)
+            count_queryset = queryset.annotate(**aggregate_annotations) if aggregate_annotations else queryset
+        queryset = annotated
+        if infinite_scroll:
+            # Same (field, pk) order as the keyset rows endpoint
+            sort_field, descending = get_sort_key(queryset, ordering)
+            queryset = order_queryset(queryset, sort_field, descending)
+        elif ordering:
+            queryset = self.order_by_column(queryset, ordering, all_columns)
+
+        queryset = self.optimize_queryset(queryset, table_config, row_cache_field)
+        sort_annotations = {} if infinite_scroll else self.get_sort_annotations(queryset, table_config)
 
-        # Pagination
-        page_obj, pagination_context = self.paginate_queryset(queryset, request)
+        # Pagination (column aggregates are computed by the count query)
+        page_obj, pagination_context = self.paginate_queryset(
+            queryset, request, aggregates=aggregates, single_page_annotations=sort_annotations,
+            count=count, count_queryset=count_queryset,
+            aggregate_values=self.map_aggregate_values(aggregate_values, all_columns, table_config),
+        )
+        client_side = not infinite_scroll and self.client_side_enabled(pagination_context)
 
         # Generate datatable
-        table_headers, table_rows = self.prepare_datatable(table_config, page_obj)
+        if pagination_context["stream_rows"]:
+            # Rows are prepared lazily while the response is streamed (see render_list)
+            table_headers = self.prepare_headers(table_config)
+            table_rows = self.iter_rows(table_config, page_obj.object_list, row_cache_field=row_cache_field)
+        else:
+            with timed(self.view_name, "prepare"), span("djcrudx.prepare_rows", {"djcrudx.view": self.view_name}) as current:
+                table_headers, table_rows = self.prepare_datatable(table_config, page_obj, row_cache_field)
+                current.set_attribute("djcrudx.row_count", len(table_rows))
+                current.set_attribute("djcrudx.column_count", len(table_headers))
+            if client_side and sort_annotations:
+                self.attach_sort_keys(table_headers, table_rows, page_obj.object_list, sort_annotations)
+
+        # Header filters may be given by filter name, e.g. "filter_field": "tags"
+        if filter_instance is not None:
+            for header in table_headers:
+                if isinstance(header["filter_field"], str) and header["filter_field"] in filter_instance.form.fields:
+                    header["filter_field"] = filter_instance.form[header["filter_field"]]
+
+        if not pagination_context["query_timeout"]:
+            self.apply_facets(table_headers, table_config, filter_instance, pagination_context["total_count"])
+        self.prepare_sort_urls(table_headers, request)
+
+        # Render header filter widgets here so their cost is measured apart from the template
+        with timed(self.view_name, "widgets"):
+            for header in table_headers:
+                if hasattr(header["filter_field"], "as_widget"):
+                    header["filter_field"] = str(header["filter_field"])
 
         context = {
             "filter": filter_instance,
             "headers": table_headers,
             "rows": table_rows,
+            "footer": self.prepare_footer(table_config, pagination_context["aggregate_values"]),
+            "client_side": client_side,
+            "search_url_prefix": self.get_search_url_prefix(request),
             **pagination_context,
         }
+
+        if infinite_scroll and not pagination_context["stream_rows"]:
+            rows_params = request.GET.copy()
+            for key in ("page", "cursor"):
+                rows_params.pop(key, None)
+            rows_params["format"] = "rows"
+            context["infinite_scroll"] = True
+            context["rows_url"] = f"{request.path}?{rows_params.urlencode()}"
+            context["next_cursor"] = encode_cursor(page_obj.object_list[-1], sort_field) if page_obj.has_next() else ""
         
         # Dodaj base_template tylko jeśli nie został już ustawiony
         if "base_template" not in context:
@@ -438,9 +1336,20 @@ class CrudListMixin(PaginationMixin, DataTableMixin):
             'secondary_hover': 'gray-600'
         })
 
-        # Add data for column configuration - disabled
-        # if view_name:
-        #     context["view_name"] = view_name
-        #     context["all_columns"] = [{"key": col.get("key") or col.get("field") or col["label"], "label": col["label"]} for col in table_config]
+        # Data for the column configuration / saved views UI
+        if table_views_enabled:
+            visible = {get_column_key(col) for col in table_config}
+            context["view_name"] = self.view_name
+            context["all_columns"] = _js_value([
+                {"key": get_column_key(col), "label": str(col["label"]), "visible": get_column_key(col) in visible}
+                for col in all_columns
+            ])
+            context["current_table_view"] = table_view.to_dict() if table_view else None
+            context["current_table_view_json"] = _js_value(context["current_table_view"])
+            context["table_view_urls"] = _js_value({
+                "list": reverse("djcrudx:table_views", kwargs={"view_name": self.view_name}),
+                "save": reverse("djcrudx:save_table_view", kwargs={"view_name": self.view_name}),
+                "delete": reverse("djcrudx:delete_table_view", kwargs={"pk": 0}),
+            })
 
         return context
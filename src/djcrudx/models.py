@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.db import models
+
+
+class TableView(models.Model):
+    """
+    Saved datatable view of a user - visible columns and their order
+
+    column_config: [{"key": "name", "visible": true, "order": 0}, ...]
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="djcrudx_table_views")
+    view_name = models.CharField(max_length=200)
+    name = models.CharField(max_length=100)
+    column_config = models.JSONField(default=list)
+    is_default = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["name"]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "view_name", "name"], name="djcrudx_tableview_unique_name"),
+        ]
+
+    def __str__(self):
+        return f"{self.view_name}: {self.name}"
+
+    @property
+    def display_name(self):
+        return self.name
+
+    def to_dict(self):
+        return {
+            "id": self.pk,
+            "name": self.name,
+            "display_name": self.display_name,
+            "is_default": self.is_default,
+            "column_config": self.column_config,
+        }
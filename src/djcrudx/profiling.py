@@ -0,0 +1,123 @@
+"""
+Offline profiling of DjCrudX views.
+
+Replays requests through the Django test client under cProfile while capturing
+the SQL log, and converts the cProfile call graph to collapsed stacks
+(``flamegraph.pl`` / speedscope / inferno compatible).
+
+Every replay runs in a transaction that is rolled back afterwards, so
+profiling a POST with ``--repeat`` does not write to the database (on_commit
+callbacks do not run). Pass ``--allow-writes`` to keep the changes.
+
+Usage:
+    python manage.py djcrudx_profile /products/ --user admin --repeat 5
+"""
+
+import cProfile
+import os
+import pstats
+import time
+from contextlib import ExitStack
+
+from django.db import connections, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+MAX_STACK_DEPTH = 256
+
+
+def frame_label(func):
+    """Readable flamegraph frame for a pstats function key"""
+    filename, lineno, name = func
+    if filename == "~":
+        # built-in, e.g. "<method 'execute' of 'sqlite3.Cursor' objects>"
+        return name.replace(";", ",")
+    return f"{name} ({os.path.basename(filename)}:{lineno})".replace(";", ",")
+
+
+def collapse_pstats(stats, min_weight=1):
+    """
+    Convert pstats.Stats to collapsed stacks {"a;b;c": microseconds}
+
+    cProfile only records caller -> callee edges, so stacks are reconstructed by
+    walking callers up to a root and splitting a function's own time across its
+    callers proportionally to the time spent on each edge. Recursive frames appear
+    once per stack. The result is an approximation of the real stacks.
+    """
+    raw = stats.stats
+    stacks = {}
+
+    def walk(func, weight, path):
+        callers = raw[func][4] if func in raw else {}
+        edges = [(caller, edge[3]) for caller, edge in callers.items() if caller not in path]
+        if not edges and callers:
+            # Recursion (e.g. middleware chain): continue from callers of the recursive frames
+            escape = {}
+            for caller in callers:
+                for outer, edge in raw.get(caller, (None,) * 5)[4].items():
+                    if outer not in path:
+                        escape[outer] = escape.get(outer, 0) + edge[3]
+            edges = list(escape.items())
+        total = sum(ct for _caller, ct in edges)
+        if not edges or len(path) >= MAX_STACK_DEPTH:
+            key = ";".join(frame_label(f) for f in reversed(path))
+            stacks[key] = stacks.get(key, 0) + weight
+            return
+        if weight < min_weight * len(edges):
+            # Too little time to split - follow the heaviest caller only
+            edges = [max(edges, key=lambda edge: edge[1])]
+            total = edges[0][1]
+        for caller, ct in edges:
+            share = ct / total if total else 1 / len(edges)
+            walk(caller, weight * share, path + [caller])
+
+    for func, (_cc, _nc, tt, _ct, _callers) in raw.items():
+        if tt > 0:
+            walk(func, tt * 1_000_000, [func])
+
+    return {key: int(round(value)) for key, value in stacks.items() if round(value) >= min_weight}
+
+
+def write_collapsed(stacks, path):
+    with open(path, "w", encoding="utf-8") as fh:
+        for key, value in sorted(stacks.items()):
+            fh.write(f"{key} {value}\n")
+
+
+def profile_request(url, user=None, method="GET", data=None, repeat=1, host=None, rollback=True):
+    """
+    Replay a request ``repeat`` times under cProfile
+
+    With ``rollback`` each replay runs in transaction.atomic() on every database
+    and is rolled back, so repeated writes leave the database unchanged.
+
+    Returns:
+        dict: {"stats": pstats.Stats, "responses": [(status, seconds)], "queries": [[{sql, time}, ...] per request]}
+    """
+    client = Client(HTTP_HOST=host) if host else Client()
+    if user is not None:
+        client.force_login(user)
+    send = getattr(client, method.lower())
+
+    profiler = cProfile.Profile()
+    responses = []
+    queries = []
+    for _ in range(repeat):
+        with ExitStack() as stack:
+            if rollback:
+                for alias in connections:
+                    stack.enter_context(transaction.atomic(using=alias))
+            contexts = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+            start = time.perf_counter()
+            profiler.enable()
+            try:
+                response = send(url, data or {})
+            finally:
+                profiler.disable()
+                if rollback:
+                    for alias in connections:
+                        transaction.set_rollback(True, using=alias)
+            responses.append((response.status_code, time.perf_counter() - start))
+        queries.append([query for context in contexts for query in context.captured_queries])
+
+    return {"stats": pstats.Stats(profiler), "responses": responses, "queries": queries}
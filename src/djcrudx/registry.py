@@ -0,0 +1,38 @@
+"""
+Registry of views created by CRUDFactory / CRUDView.
+
+Every ``*_view()`` call of a factory registers the generated view together with
+its configuration, so management commands can find all DjCrudX views.
+"""
+
+_registry = []
+
+
+def register_view(view_name, kind, model, view, **config):
+    """
+    Register a generated view
+
+    Args:
+        view_name: URL name, e.g. "shop:product_list"
+        kind: "list", "create", "update", "detail", "delete" or "import"
+        model: model class
+        view: view function
+        **config: table_config, filter_class, form_class, form_sections, ...
+    """
+    view.djcrudx_view_name = view_name
+    entry = {"view_name": view_name, "kind": kind, "model": model, "view": view, **config}
+    _registry.append(entry)
+    return entry
+
+
+def get_registered_views(kind=None):
+    """Return registered views, optionally only of the given kind"""
+    return [entry for entry in _registry if kind is None or entry["kind"] == kind]
+
+
+def discover_views():
+    """Import the URLconf (which creates the views) and return all registered views"""
+    from django.urls import get_resolver
+
+    get_resolver().url_patterns  # importing the URLconf creates the views
+    return get_registered_views()
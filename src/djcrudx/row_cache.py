@@ -0,0 +1,152 @@
+"""
+Rendered row cache for list views.
+
+Opt-in per list view (``crud["list"](table_config, row_cache=True)``) on a
+factory created with ``version_field``. The rendered cells of a row are cached
+under (model, pk, version, table_config fingerprint, language), so only rows
+that changed since the last request run their value/url/actions/badge
+callables. A page is read with one ``get_many`` and written with one
+``set_many``; a bounded in-process LRU tier sits in front of the shared cache.
+
+The fingerprint covers column labels, options and the code of the column
+callables, not values captured by closures - change DJCRUDX_ROW_CACHE_SALT
+when such values change. Cells must depend on the row object only (not on the
+user or request).
+
+Settings:
+    DJCRUDX_ROW_CACHE_ALIAS = "default"     # Django cache for the shared tier
+    DJCRUDX_ROW_CACHE_TIMEOUT = 3600        # seconds
+    DJCRUDX_ROW_CACHE_LOCAL_SIZE = 10000    # rows in the in-process tier (0 = off)
+    DJCRUDX_ROW_CACHE_SALT = ""
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from types import CodeType
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import prefetch_related_objects
+from django.utils.functional import Promise
+from django.utils.translation import get_language
+
+from .tracing import span
+
+
+@lru_cache(maxsize=1024)
+def _code_fingerprint(code):
+    # Nested code objects (lambdas, generator expressions) repr with their address - hash them instead
+    consts = tuple(_code_fingerprint(const) if isinstance(const, CodeType) else const for const in code.co_consts)
+    raw = repr((code.co_filename, code.co_firstlineno, code.co_code, code.co_names, consts))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _value_fingerprint(value):
+    code = getattr(value, "__code__", None)
+    if code is not None:
+        return _code_fingerprint(code)
+    if callable(value):
+        return f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', type(value).__qualname__)}"
+    if isinstance(value, (list, tuple)):
+        return repr([_value_fingerprint(item) for item in value])
+    if isinstance(value, dict):
+        return repr(sorted((key, _value_fingerprint(item)) for key, item in value.items()))
+    if isinstance(value, Promise):
+        return str(value)
+    text = repr(value)
+    # Default reprs hold memory addresses that differ between processes
+    return type(value).__qualname__ if " at 0x" in text else text
+
+
+def config_fingerprint(table_config):
+    """Hash of the displayed columns (order, options and callable code)"""
+    from . import __version__
+
+    raw = repr((__version__, getattr(settings, "DJCRUDX_ROW_CACHE_SALT", ""), [_value_fingerprint(col) for col in table_config]))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class LocalRowCache:
+    """Bounded thread-safe LRU of rendered rows"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = OrderedDict()
+
+    def get_many(self, keys):
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._rows:
+                    self._rows.move_to_end(key)
+                    found[key] = self._rows[key]
+        return found
+
+    def set_many(self, rows):
+        size = getattr(settings, "DJCRUDX_ROW_CACHE_LOCAL_SIZE", 10000)
+        if not size:
+            return
+        with self._lock:
+            for key, cells in rows.items():
+                self._rows[key] = cells
+                self._rows.move_to_end(key)
+            while len(self._rows) > size:
+                self._rows.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+
+
+local_rows = LocalRowCache()
+
+
+def row_key(obj, version_field, fingerprint, language):
+    raw = repr((obj._meta.label, obj.pk, getattr(obj, version_field), fingerprint, language))
+    return "djcrudx:row:" + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def get_cached_rows(objects, table_config, version_field, render_row, prefetch_related=()):
+    """
+    Rendered rows of ``objects``; only rows missing from both tiers are rendered
+
+    Args:
+        objects: list of model instances
+        table_config: displayed columns (part of the key)
+        version_field: field changing on every save, e.g. "updated_at"
+        render_row: callable(obj) -> list of cell HTML strings
+        prefetch_related: lookups prefetched for the rendered rows only
+
+    Returns:
+        tuple: (rows, rendered_count)
+    """
+    fingerprint = config_fingerprint(table_config)
+    language = get_language()
+    keys = [row_key(obj, version_field, fingerprint, language) for obj in objects]
+
+    with span("djcrudx.row_cache", {"djcrudx.row_count": len(keys)}) as current:
+        found = local_rows.get_many(keys)
+        local_hits = len(found)
+        missing_keys = [key for key in keys if key not in found]
+        shared = caches[getattr(settings, "DJCRUDX_ROW_CACHE_ALIAS", "default")]
+        if missing_keys:
+            from_shared = shared.get_many(missing_keys)
+            local_rows.set_many(from_shared)
+            found.update(from_shared)
+
+        missing = {key: obj for key, obj in zip(keys, objects) if key not in found}
+        current.set_attribute("djcrudx.cache_hit", not missing)
+        current.set_attribute("djcrudx.cache_hits", len(keys) - len(missing))
+        current.set_attribute("djcrudx.cache_local_hits", local_hits)
+        current.set_attribute("djcrudx.cache_misses", len(missing))
+        if missing and prefetch_related:
+            prefetch_related_objects(list(missing.values()), *prefetch_related)
+        rendered = {key: render_row(obj) for key, obj in missing.items()}
+        if rendered:
+            shared.set_many(rendered, getattr(settings, "DJCRUDX_ROW_CACHE_TIMEOUT", 3600))
+            local_rows.set_many(rendered)
+            found.update(rendered)
+
+    return [found[key] for key in keys], len(rendered)
@@ -0,0 +1,272 @@
+"""
+Low-overhead statistical stack sampler for production requests.
+
+A single daemon thread wakes every ``DJCRUDX_SAMPLING_INTERVAL_MS`` and records
+the Python stack of every request thread being profiled (``sys._current_frames``);
+the request threads themselves are not instrumented. Collapsed stacks are
+aggregated per view name in a bounded in-memory store, shown to staff users by
+``djcrudx.views.sampling_profile_view`` in flamegraph format.
+
+A request is kept when it is every Nth request or slower than the threshold.
+With a threshold every DjCrudX request is sampled (the slowness is only known
+at the end) and fast requests are discarded.
+
+Streamed responses (``StreamingHttpResponse``, e.g. list pages with
+``stream_rows``) are sampled until the server closes the response, so the rows
+rendered while streaming are included. The sample follows the thread that
+iterates the response. Async streaming content is not sampled past the view.
+
+Settings:
+    DJCRUDX_SAMPLING_EVERY_N = 100         # keep every 100th request (0 = off, default)
+    DJCRUDX_SAMPLING_THRESHOLD_MS = 1000   # keep requests slower than 1 s (None = off, default)
+    DJCRUDX_SAMPLING_INTERVAL_MS = 5       # sampling interval
+    DJCRUDX_SAMPLING_MAX_VIEWS = 100       # views kept in the store
+    DJCRUDX_SAMPLING_MAX_STACKS = 5000     # distinct stacks kept per view
+
+Usage:
+    MIDDLEWARE = [..., "djcrudx.sampling.SamplingProfilerMiddleware"]
+
+    # or for a single view
+    @sample_profile("reports:summary")
+    def summary(request): ...
+"""
+
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+
+TRUNCATED_STACK = "[truncated]"
+MAX_STACK_DEPTH = 128
+
+
+def get_every_n():
+    return getattr(settings, "DJCRUDX_SAMPLING_EVERY_N", 0)
+
+
+def get_threshold_ms():
+    return getattr(settings, "DJCRUDX_SAMPLING_THRESHOLD_MS", None)
+
+
+def is_enabled():
+    return bool(get_every_n()) or get_threshold_ms() is not None
+
+
+def collapse_frame(frame):
+    """Collapsed stack (root first) of a frame"""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        labels.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})".replace(";", ","))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class Sampler:
+    """Shared daemon thread sampling the stacks of registered threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._active = {}
+        self._thread = None
+
+    def start(self, ident, stacks=None):
+        """Start sampling thread ``ident``; returns the dict collecting its stacks"""
+        stacks = {} if stacks is None else stacks
+        with self._lock:
+            self._active[ident] = stacks
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="djcrudx-sampler", daemon=True)
+                self._thread.start()
+            self._wakeup.notify()
+        return stacks
+
+    def stop(self, ident):
+        with self._lock:
+            return self._active.pop(ident, {})
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while True:
+            with self._lock:
+                while not self._active:
+                    self._wakeup.wait()
+                interval = getattr(settings, "DJCRUDX_SAMPLING_INTERVAL_MS", 5) / 1000
+            time.sleep(interval)
+
+            frames = sys._current_frames()
+            with self._lock:
+                for ident, stacks in self._active.items():
+                    frame = frames.get(ident)
+                    if frame is None or ident == own_ident:
+                        continue
+                    key = collapse_frame(frame)
+                    stacks[key] = stacks.get(key, 0) + 1
+            del frames
+
+
+class SampleStore:
+    """Bounded per-view aggregate of collapsed stacks"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = OrderedDict()
+
+    def add(self, view_name, stacks, duration_ms):
+        max_views = getattr(settings, "DJCRUDX_SAMPLING_MAX_VIEWS", 100)
+        max_stacks = getattr(settings, "DJCRUDX_SAMPLING_MAX_STACKS", 5000)
+        with self._lock:
+            entry = self._views.get(view_name)
+            if entry is None:
+                entry = self._views[view_name] = {"requests": 0, "samples": 0, "max_ms": 0.0, "stacks": {}}
+            self._views.move_to_end(view_name)
+            entry["requests"] += 1
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            for key, count in stacks.items():
+                entry["samples"] += count
+                if key not in entry["stacks"] and len(entry["stacks"]) >= max_stacks:
+                    key = TRUNCATED_STACK
+                entry["stacks"][key] = entry["stacks"].get(key, 0) + count
+            while len(self._views) > max_views:
+                self._views.popitem(last=False)
+
+    def views(self):
+        """Return {view_name: {"requests", "samples", "max_ms"}}"""
+        with self._lock:
+            return {
+                name: {key: value for key, value in entry.items() if key != "stacks"}
+                for name, entry in self._views.items()
+            }
+
+    def collapsed(self, view_name=None):
+        """Collapsed stacks text; the view name is the root frame when no view is given"""
+        with self._lock:
+            if view_name is not None:
+                entry = self._views.get(view_name)
+                items = list(entry["stacks"].items()) if entry else []
+            else:
+                items = [
+                    (f"{name};{key}", count)
+                    for name, entry in self._views.items()
+                    for key, count in entry["stacks"].items()
+                ]
+        return "".join(f"{key} {count}\n" for key, count in sorted(items))
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+sampler = Sampler()
+sample_store = SampleStore()
+_request_counter = itertools.count(1)
+
+
+class _Sample:
+    def __init__(self, view_name, keep):
+        self.view_name = view_name
+        self.keep = keep
+        self.ident = threading.get_ident()
+        self.start = time.perf_counter()
+        self.stacks = sampler.start(self.ident)
+        self.finished = False
+
+    def follow(self):
+        """Move sampling to the current thread (a streamed response may be iterated elsewhere)"""
+        ident = threading.get_ident()
+        if ident != self.ident and not self.finished:
+            sampler.stop(self.ident)
+            self.ident = ident
+            sampler.start(ident, self.stacks)
+
+    def finish(self):
+        if self.finished:
+            return
+        self.finished = True
+        stacks = sampler.stop(self.ident)
+        duration_ms = (time.perf_counter() - self.start) * 1000
+        threshold = get_threshold_ms()
+        if stacks and (self.keep or (threshold is not None and duration_ms >= threshold)):
+            sample_store.add(self.view_name, stacks, duration_ms)
+
+
+class SampledStream:
+    """Streaming content wrapper that keeps sampling until the response is closed"""
+
+    def __init__(self, content, sample):
+        self._content = iter(content)
+        self._sample = sample
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        self._sample.follow()
+        return next(self._content)
+
+    def close(self):
+        self._sample.finish()
+
+
+def finish_sample(current, response):
+    """Finish the sample now, or when a streamed response is closed by the server"""
+    if getattr(response, "streaming", False) and not getattr(response, "is_async", False):
+        response.streaming_content = SampledStream(response.streaming_content, current)
+    else:
+        current.finish()
+
+
+def begin_sample(view_name):
+    """Start sampling the current request, or return None when it is not profiled"""
+    every_n = get_every_n()
+    keep = bool(every_n) and next(_request_counter) % every_n == 0
+    if not keep and get_threshold_ms() is None:
+        return None
+    return _Sample(view_name, keep)
+
+
+class SamplingProfilerMiddleware:
+    """Samples requests handled by DjCrudX views (views with ``djcrudx_view_name``)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        current = getattr(request, "_djcrudx_sample", None)
+        if current is not None:
+            finish_sample(current, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_name = getattr(view_func, "djcrudx_view_name", None)
+        if view_name is not None and is_enabled():
+            request._djcrudx_sample = begin_sample(view_name)
+        return None
+
+
+def sample_profile(view_name=None):
+    """Decorator sampling a single view"""
+    def decorator(func):
+        name = view_name or f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(request, *args, **kwargs):
+            current = begin_sample(name) if is_enabled() else None
+            try:
+                response = func(request, *args, **kwargs)
+            except BaseException:
+                if current is not None:
+                    current.finish()
+                raise
+            if current is not None:
+                finish_sample(current, response)
+            return response
+        return wrapper
+    return decorator
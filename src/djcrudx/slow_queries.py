@@ -0,0 +1,172 @@
+"""
+Slow-query capture for list views.
+
+Count and page queries of list views slower than ``DJCRUDX_SLOW_QUERY_MS`` are
+logged (logger ``djcrudx.slow_queries``) with SQL, parameters and an EXPLAIN plan.
+Entries are deduplicated by query fingerprint and kept in a bounded in-memory ring
+buffer, shown to staff users by ``djcrudx.views.slow_queries_view``.
+
+Settings:
+    DJCRUDX_SLOW_QUERY_MS = 500                 # threshold in ms, None disables capture (default)
+    DJCRUDX_SLOW_QUERY_EXPLAIN_ANALYZE = False  # EXPLAIN ANALYZE executes the query once more
+                                                # (never for failed/cancelled queries)
+    DJCRUDX_SLOW_QUERY_LOG_SIZE = 100           # max number of distinct queries kept
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .timeouts import statement_timeout
+
+logger = logging.getLogger("djcrudx.slow_queries")
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*(?:(?:%s|\?)\s*,\s*)+(?:%s|\?)\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """Replace literals with placeholders so equal query shapes compare equal"""
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("(...)", sql)
+    return _WHITESPACE_RE.sub(" ", sql).strip()
+
+
+def fingerprint(sql):
+    return hashlib.sha1(normalize_sql(sql).encode("utf-8")).hexdigest()[:16]
+
+
+def explain(connection, sql, params, analyze=False, timeout=None):
+    """
+    Return EXPLAIN output for a query as text (or the reason it failed)
+
+    The EXPLAIN runs under ``timeout`` ms - with ANALYZE it executes the query
+    again, which must not bypass the list view's statement timeout.
+    """
+    options = {"analyze": True} if analyze else {}
+    try:
+        try:
+            prefix = connection.ops.explain_query_prefix(None, **options)
+        except ValueError:
+            # Backend does not support ANALYZE
+            prefix = connection.ops.explain_query_prefix(None)
+        with transaction.atomic(using=connection.alias), statement_timeout(timeout, using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(f"{prefix} {sql}", params)
+                rows = cursor.fetchall()
+    except Exception as e:
+        return f"EXPLAIN failed: {e}"
+    return "\n".join(" ".join(str(column) for column in row) for row in rows)
+
+
+class SlowQueryLog:
+    """Bounded ring buffer of slow queries, deduplicated by fingerprint"""
+
+    def __init__(self, maxlen=None):
+        self.maxlen = maxlen
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get_maxlen(self):
+        return self.maxlen or getattr(settings, "DJCRUDX_SLOW_QUERY_LOG_SIZE", 100)
+
+    def seen(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def record(self, key, view_name, phase, sql, params, duration_ms, plan=None):
+        """Add a query or update the existing entry; return True for a new fingerprint"""
+        now = timezone.now()
+        with self._lock:
+            entry = self._entries.get(key)
+            is_new = entry is None
+            if is_new:
+                entry = self._entries[key] = {
+                    "fingerprint": key,
+                    "view": view_name,
+                    "phase": phase,
+                    "sql": sql,
+                    "params": [repr(param) for param in params or ()],
+                    "plan": plan,
+                    "count": 0,
+                    "max_ms": 0.0,
+                    "first_seen": now,
+                }
+            entry["count"] += 1
+            entry["last_ms"] = duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            entry["last_seen"] = now
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.get_maxlen():
+                self._entries.popitem(last=False)
+        return is_new
+
+    def entries(self):
+        """Return entries, most recently seen first"""
+        with self._lock:
+            return [dict(entry) for entry in reversed(self._entries.values())]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog()
+
+
+@contextmanager
+def capture_slow_queries(view_name, phase, timeout=None):
+    """
+    Record queries executed inside the block that exceed DJCRUDX_SLOW_QUERY_MS
+
+    ``timeout`` is the statement timeout (ms) of the captured queries, applied to
+    their EXPLAIN as well. Queries that failed (e.g. were cancelled by the timeout)
+    are explained without ANALYZE.
+    """
+    threshold = getattr(settings, "DJCRUDX_SLOW_QUERY_MS", None)
+    if threshold is None:
+        yield
+        return
+
+    slow = []
+
+    def measure(execute, sql, params, many, context):
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = execute(sql, params, many, context)
+            failed = False
+            return result
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            if duration_ms >= threshold and not many:
+                slow.append((context["connection"], sql, params, duration_ms, failed))
+
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(measure))
+        yield
+
+    # EXPLAIN runs after the wrappers are removed so it is not captured itself
+    analyze = getattr(settings, "DJCRUDX_SLOW_QUERY_EXPLAIN_ANALYZE", False)
+    for connection, sql, params, duration_ms, failed in slow:
+        key = fingerprint(sql)
+        plan = None if slow_query_log.seen(key) else explain(connection, sql, params, analyze=analyze and not failed, timeout=timeout)
+        if slow_query_log.record(key, view_name, phase, sql, params, duration_ms, plan=plan):
+            logger.warning(
+                "Slow %s query in %s (%.1f ms): %s\nParams: %r\nPlan:\n%s",
+                phase, view_name, duration_ms, sql, params, plan,
+            )
+        else:
+            logger.debug("Slow %s query in %s (%.1f ms), fingerprint %s", phase, view_name, duration_ms, key)
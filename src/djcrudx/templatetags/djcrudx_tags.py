@@ -1,5 +1,6 @@
 from django import template
 from django.conf import settings
+from ..mixins import build_detail_layout, build_form_layout
 from ..translations import smart_translate
 
 register = template.Library()
@@ -23,4 +24,30 @@ def blocktrans(text, **kwargs):
 @register.filter
 def call_with(func, arg):
     """Call a function with an argument"""
-    return func(arg) if callable(func) else func
\ No newline at end of file
+    return func(arg) if callable(func) else func
+
+
+@register.simple_tag(takes_context=True)
+def get_detail_layout(context):
+    """detail_layout of the view, or built from detail_config for views passing only detail_sections"""
+    layout = context.get("detail_layout")
+    if layout is None:
+        layout = build_detail_layout(context.get("detail_config") or [], context.get("detail_sections"))
+    return layout
+
+
+@register.simple_tag(takes_context=True)
+def get_form_layout(context):
+    """
+    form_layout of the view, or built here for views rendering only form (and form_sections)
+
+    Without form_sections all form fields are shown in one section.
+    """
+    layout = context.get("form_layout")
+    if layout is None:
+        form = context.get("form")
+        if form is None:
+            return []
+        sections = context.get("form_sections") or [{"title": "", "fields": list(form.fields)}]
+        layout = build_form_layout(form, sections)
+    return layout
@@ -0,0 +1,117 @@
+"""
+Statement timeouts for expensive list queries.
+
+``statement_timeout(ms)`` limits the queries run inside it:
+
+    PostgreSQL   SET LOCAL statement_timeout inside a transaction
+    MySQL        max_execution_time (SELECT only) / MariaDB max_statement_time
+    SQLite       progress handler interrupting the statement
+    other        no limit
+
+A query running longer raises StatementTimeout. The list views use it for the
+count, page and facet queries and degrade instead of failing (see
+PaginationMixin.paginate_queryset).
+
+Settings:
+    DJCRUDX_STATEMENT_TIMEOUT_MS = 5000   # default for list views (None = off, default)
+"""
+
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import OperationalError, connections, transaction
+
+# Opcodes between progress handler calls on SQLite
+SQLITE_PROGRESS_STEPS = 1000
+
+
+class StatementTimeout(Exception):
+    """A query was cancelled by statement_timeout()"""
+
+
+def get_default_timeout():
+    return getattr(settings, "DJCRUDX_STATEMENT_TIMEOUT_MS", None)
+
+
+def is_timeout_error(exc):
+    """True for the errors databases raise when a statement is cancelled by a timeout"""
+    cause = exc.__cause__ or exc
+    code = getattr(cause, "sqlstate", None) or getattr(cause, "pgcode", None)
+    if code == "57014":  # PostgreSQL query_canceled
+        return True
+    if getattr(cause, "args", None) and cause.args[0] in (3024, 1969):  # MySQL / MariaDB
+        return True
+    return "interrupted" in str(exc)  # SQLite
+
+
+@contextmanager
+def statement_timeout(ms, using="default"):
+    """Cancel queries running longer than ``ms`` milliseconds; raises StatementTimeout"""
+    if not ms:
+        yield
+        return
+    connection = connections[using]
+    vendor = connection.vendor
+    try:
+        if vendor == "postgresql":
+            with _postgresql_timeout(connection, ms):
+                yield
+        elif vendor == "mysql":
+            with _mysql_timeout(connection, ms):
+                yield
+        elif vendor == "sqlite":
+            with _sqlite_timeout(connection, ms):
+                yield
+        else:
+            yield
+    except OperationalError as e:
+        if is_timeout_error(e):
+            raise StatementTimeout(str(e)) from e
+        raise
+
+
+@contextmanager
+def _postgresql_timeout(connection, ms):
+    restore = None
+    if connection.in_atomic_block:
+        # SET LOCAL would outlive our savepoint until the outer transaction ends
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW statement_timeout")
+            restore = cursor.fetchone()[0]
+    try:
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL statement_timeout = %s", [int(ms)])
+            yield
+    finally:
+        if restore is not None and not connection.needs_rollback:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT set_config('statement_timeout', %s, true)", [restore])
+
+
+@contextmanager
+def _mysql_timeout(connection, ms):
+    variable = "max_statement_time" if connection.mysql_is_mariadb else "max_execution_time"
+    value = ms / 1000 if connection.mysql_is_mariadb else int(ms)  # MariaDB uses seconds
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT @@SESSION.{variable}")
+        previous = cursor.fetchone()[0]
+        cursor.execute(f"SET SESSION {variable} = %s", [value])
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(f"SET SESSION {variable} = %s", [previous])
+
+
+@contextmanager
+def _sqlite_timeout(connection, ms):
+    connection.ensure_connection()
+    deadline = time.monotonic() + ms / 1000
+    # A non-zero return value interrupts the running statement ("interrupted")
+    connection.connection.set_progress_handler(lambda: time.monotonic() > deadline, SQLITE_PROGRESS_STEPS)
+    try:
+        yield
+    finally:
+        connection.connection.set_progress_handler(None, 0)
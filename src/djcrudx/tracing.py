@@ -0,0 +1,153 @@
+"""
+Optional tracing spans around DjCrudX operations.
+
+Spans go to OpenTelemetry when ``opentelemetry-api`` is installed and to any
+registered exporter (e.g. ``InMemorySpanExporter`` in tests). Without either,
+``span()`` returns a shared no-op context.
+
+Settings:
+    DJCRUDX_TRACING_ENABLED = True  # False disables OpenTelemetry spans
+
+Example:
+    exporter = InMemorySpanExporter()
+    add_exporter(exporter)
+    client.get("/products/")
+    [s.name for s in exporter.get_finished_spans()]
+    # ['djcrudx.filter', 'djcrudx.count', 'djcrudx.page_fetch', 'djcrudx.prepare_rows', ...]
+"""
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from django.conf import settings
+
+# Optional OpenTelemetry support
+try:
+    from opentelemetry import trace as otel_trace
+    HAS_OPENTELEMETRY = True
+except ImportError:
+    otel_trace = None
+    HAS_OPENTELEMETRY = False
+
+
+class NoopSpan:
+    """Span placeholder used when tracing is off"""
+
+    def set_attribute(self, key, value):
+        pass
+
+
+_NOOP_CONTEXT = nullcontext(NoopSpan())
+_exporters = []
+_local = threading.local()
+
+
+class SpanRecord:
+    """Finished span as seen by exporters"""
+
+    def __init__(self, name, attributes, parent=None):
+        self.name = name
+        self.attributes = dict(attributes)
+        self.parent = parent
+        self.start = time.perf_counter()
+        self.end = None
+        self.error = None
+
+    @property
+    def duration(self):
+        return (self.end or time.perf_counter()) - self.start
+
+    def __repr__(self):
+        return f"<SpanRecord {self.name} {self.attributes}>"
+
+
+class InMemorySpanExporter:
+    """Collects finished spans in memory - works fully offline"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans = []
+
+    def export(self, record):
+        with self._lock:
+            self._spans.append(record)
+
+    def get_finished_spans(self):
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+
+def add_exporter(exporter):
+    """Register exporter with an ``export(record)`` method"""
+    if exporter not in _exporters:
+        _exporters.append(exporter)
+
+
+def remove_exporter(exporter):
+    if exporter in _exporters:
+        _exporters.remove(exporter)
+
+
+def _otel_enabled():
+    return HAS_OPENTELEMETRY and getattr(settings, "DJCRUDX_TRACING_ENABLED", True)
+
+
+class _Span:
+    """Forwards attributes to the OpenTelemetry span and the exported record"""
+
+    def __init__(self, otel_span, record):
+        self.otel_span = otel_span
+        self.record = record
+
+    def set_attribute(self, key, value):
+        if value is None:
+            return
+        if self.otel_span is not None:
+            self.otel_span.set_attribute(key, value)
+        if self.record is not None:
+            self.record.attributes[key] = value
+
+
+@contextmanager
+def _span(name, attributes):
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+
+    record = SpanRecord(name, attributes, parent=stack[-1] if stack else None) if _exporters else None
+    otel_context = otel_trace.get_tracer("djcrudx").start_as_current_span(name, attributes=attributes) if _otel_enabled() else nullcontext()
+
+    stack.append(name)
+    try:
+        with otel_context as otel_span:
+            try:
+                yield _Span(otel_span, record)
+            except Exception as e:
+                if record is not None:
+                    record.error = repr(e)
+                raise
+    finally:
+        stack.pop()
+        if record is not None:
+            record.end = time.perf_counter()
+            for exporter in list(_exporters):
+                exporter.export(record)
+
+
+def span(name, attributes=None):
+    """
+    Context manager wrapping a DjCrudX operation in a tracing span
+
+    Example:
+        with span("djcrudx.count", {"djcrudx.view": view_name}) as current:
+            total = queryset.count()
+            current.set_attribute("djcrudx.total_count", total)
+    """
+    if not _exporters and not _otel_enabled():
+        return _NOOP_CONTEXT
+    return _span(name, {key: value for key, value in (attributes or {}).items() if value is not None})
@@ -31,6 +31,17 @@ BUILTIN_TRANSLATIONS = {
         'No results found': 'Nie znaleziono wyników',
         'Filter': 'Filtruj',
         'Clear filters': 'Wyczyść filtry',
+        'Import': 'Importuj',
+        'File': 'Plik',
+        'Columns': 'Kolumny',
+        'required': 'wymagane',
+        'multiple values separated by commas': 'wiele wartości oddzielonych przecinkami',
+        'Rows in file': 'Wierszy w pliku',
+        'Imported': 'Zaimportowano',
+        'Rejected': 'Odrzucono',
+        'Row': 'Wiersz',
+        'Errors': 'Błędy',
+        'Only the first rejected rows are listed.': 'Wyświetlono tylko pierwsze odrzucone wiersze.',
     }
 }
 
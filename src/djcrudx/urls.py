@@ -0,0 +1,16 @@
+from django.urls import path
+
+from . import views
+
+app_name = "djcrudx"
+
+urlpatterns = [
+    path("metrics/", views.metrics_view, name="metrics"),
+    path("debug/column-profile/", views.column_profile_view, name="column_profile"),
+    path("debug/slow-queries/", views.slow_queries_view, name="slow_queries"),
+    path("debug/sampling-profile/", views.sampling_profile_view, name="sampling_profile"),
+    path("table-views/<str:view_name>/", views.table_views_view, name="table_views"),
+    path("table-views/<str:view_name>/save/", views.save_table_view, name="save_table_view"),
+    path("table-view/<int:pk>/", views.load_table_view, name="load_table_view"),
+    path("table-view/<int:pk>/delete/", views.delete_table_view, name="delete_table_view"),
+]
@@ -0,0 +1,173 @@
+import json
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required, user_passes_test
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_http_methods
+
+from .column_profiler import column_profiler
+from .metrics import get_registry
+from .models import TableView
+from .sampling import sample_store
+from .slow_queries import slow_query_log
+
+staff_required = user_passes_test(lambda user: user.is_active and user.is_staff)
+
+
+def metrics_access_allowed(request):
+    """Staff users, or a scraper sending ``Authorization: Bearer <DJCRUDX_METRICS_TOKEN>``"""
+    user = getattr(request, "user", None)
+    if user is not None and user.is_active and user.is_staff:
+        return True
+    token = getattr(settings, "DJCRUDX_METRICS_TOKEN", None)
+    header = request.headers.get("Authorization", "")
+    return bool(token) and header.startswith("Bearer ") and constant_time_compare(header[7:], token)
+
+
+def metrics_view(request):
+    """Prometheus text-format endpoint with DjCrudX phase histograms (staff or token only)"""
+    if not metrics_access_allowed(request):
+        return HttpResponseForbidden("Forbidden\n", content_type="text/plain; charset=utf-8")
+    return HttpResponse(
+        get_registry().render_prometheus(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@staff_required
+@require_http_methods(["GET", "POST"])
+def column_profile_view(request):
+    """
+    Per-column cost report collected by the column profiler
+
+    GET ?format=json returns JSON, POST resets the aggregates.
+    """
+    if request.method == "POST":
+        column_profiler.reset()
+        return JsonResponse({"success": True})
+
+    report = column_profiler.report()
+    if request.GET.get("format") == "json":
+        return JsonResponse({"columns": report})
+
+    lines = [f"{'view':<40} {'column':<30} {'phase':<8} {'calls':>8} {'total ms':>10} {'avg ms':>8} {'queries':>8} {'avg q':>6}"]
+    for row in report:
+        lines.append(
+            f"{row['view']:<40} {row['column']:<30} {row['phase']:<8} {row['calls']:>8} "
+            f"{row['total_ms']:>10.2f} {row['avg_ms']:>8.3f} {row['queries']:>8} {row['avg_queries']:>6.2f}"
+        )
+    return HttpResponse("\n".join(lines) + "\n", content_type="text/plain; charset=utf-8")
+
+
+@staff_required
+@require_http_methods(["GET", "POST"])
+def slow_queries_view(request):
+    """
+    Slow list queries with their EXPLAIN plans
+
+    GET ?format=json returns JSON, POST clears the log.
+    """
+    if request.method == "POST":
+        slow_query_log.clear()
+        return JsonResponse({"success": True})
+
+    entries = slow_query_log.entries()
+    if request.GET.get("format") == "json":
+        return JsonResponse({"queries": entries})
+
+    blocks = []
+    for entry in entries:
+        blocks.append(
+            f"[{entry['fingerprint']}] {entry['view']} ({entry['phase']}) - {entry['count']}x, "
+            f"last {entry['last_ms']:.1f} ms, max {entry['max_ms']:.1f} ms, last seen {entry['last_seen']:%Y-%m-%d %H:%M:%S}\n"
+            f"SQL: {entry['sql']}\n"
+            f"Params: {', '.join(entry['params'])}\n"
+            f"Plan:\n{entry['plan']}\n"
+        )
+    return HttpResponse("\n".join(blocks) or "No slow queries recorded.\n", content_type="text/plain; charset=utf-8")
+
+
+@staff_required
+@require_http_methods(["GET", "POST"])
+def sampling_profile_view(request):
+    """
+    Collapsed stacks collected by the sampling profiler (flamegraph.pl / speedscope input)
+
+    GET ?view=<view name> limits the output to one view, ?format=json lists the
+    sampled views, POST resets the store.
+    """
+    if request.method == "POST":
+        sample_store.reset()
+        return JsonResponse({"success": True})
+
+    if request.GET.get("format") == "json":
+        return JsonResponse({"views": sample_store.views()})
+
+    collapsed = sample_store.collapsed(request.GET.get("view"))
+    return HttpResponse(collapsed, content_type="text/plain; charset=utf-8")
+
+
+@login_required
+@require_http_methods(["GET"])
+def table_views_view(request, view_name):
+    """Saved table views of the current user for a list view"""
+    views = TableView.objects.filter(user=request.user, view_name=view_name)
+    return JsonResponse({"views": [table_view.to_dict() for table_view in views]})
+
+
+@login_required
+@require_http_methods(["POST"])
+def save_table_view(request, view_name):
+    """
+    Create or update (by name) a saved table view
+
+    Body (JSON): {"name": "...", "is_default": false, "column_config": [{"key", "visible", "order"}, ...]}
+    """
+    try:
+        data = json.loads(request.body)
+    except ValueError:
+        return JsonResponse({"success": False, "error": "Invalid JSON"}, status=400)
+
+    name = str(data.get("name") or "").strip()[:100]
+    column_config = data.get("column_config")
+    if not name or not isinstance(column_config, list):
+        return JsonResponse({"success": False, "error": "name and column_config are required"}, status=400)
+
+    try:
+        column_config = [
+            {"key": str(item["key"]), "visible": bool(item.get("visible", True)), "order": int(item.get("order", index))}
+            for index, item in enumerate(column_config)
+            if isinstance(item, dict) and "key" in item
+        ]
+    except (TypeError, ValueError):
+        return JsonResponse({"success": False, "error": "Invalid column_config"}, status=400)
+
+    is_default = bool(data.get("is_default"))
+    with transaction.atomic():
+        if is_default:
+            TableView.objects.filter(user=request.user, view_name=view_name, is_default=True).update(is_default=False)
+        table_view, _created = TableView.objects.update_or_create(
+            user=request.user,
+            view_name=view_name,
+            name=name,
+            defaults={"column_config": column_config, "is_default": is_default},
+        )
+    return JsonResponse({"success": True, "view": table_view.to_dict()})
+
+
+@login_required
+@require_http_methods(["GET"])
+def load_table_view(request, pk):
+    table_view = get_object_or_404(TableView, pk=pk, user=request.user)
+    return JsonResponse({"success": True, "view": table_view.to_dict()})
+
+
+@login_required
+@require_http_methods(["POST"])
+def delete_table_view(request, pk):
+    table_view = get_object_or_404(TableView, pk=pk, user=request.user)
+    table_view.delete()
+    return JsonResponse({"success": True})
@@ -0,0 +1,174 @@
+"""
+Cache warm-up after deploys.
+
+Runs the steps that otherwise make the first requests on a fresh worker slow.
+
+Per-process steps (PROCESS_STEPS) - URL resolver population, template
+compilation, translation catalogs - only warm the process they run in, so they
+belong in the worker (gunicorn post_fork hook or AppConfig.ready). Shared steps
+(SHARED_STEPS) fill the Django cache used by all workers: widget choices
+(with DJCRUDX_CHOICES_CACHE_TIMEOUT set) and the first page of every
+registered list view (facet and row caches). The management command runs only
+the shared steps.
+
+Usage:
+    python manage.py djcrudx_warmup --user admin
+
+    # gunicorn post_fork hook, so every worker starts warm
+    def post_fork(server, worker):
+        from djcrudx.warmup import PROCESS_STEPS, warmup
+        warmup(steps=PROCESS_STEPS)
+"""
+
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.template.loader import get_template
+from django.test import RequestFactory
+from django.urls import NoReverseMatch, get_resolver, reverse
+from django.utils import translation
+
+from .registry import discover_views, get_registered_views
+from .translations import BUILTIN_TRANSLATIONS, smart_translate
+from .widgets import load_choices
+
+TEMPLATES = [
+    "crud/base.html",
+    "crud/list_view.html",
+    "crud/form_view.html",
+    "crud/detail_view.html",
+    "crud/delete_confirm.html",
+    "crud/form_field.html",
+    "crud/_partials/datatable.html",
+    "crud/_partials/pagination.html",
+    "crud/_partials/tooltip.html",
+]
+
+
+def warm_urls(user=None):
+    resolver = get_resolver()
+    resolver.url_patterns
+    names = {entry["view_name"] for entry in discover_views() if entry["kind"] in ("list", "create")}
+    resolved = 0
+    for name in names:
+        try:
+            reverse(name)
+            resolved += 1
+        except NoReverseMatch:
+            pass
+    return f"{resolved} view URLs reversed"
+
+
+def warm_templates(user=None):
+    names = list(TEMPLATES)
+    for entry in get_registered_views():
+        template_name = entry.get("context", {}).get("template_name")
+        if template_name and template_name not in names:
+            names.append(template_name)
+    for name in names:
+        get_template(name)
+    return f"{len(names)} templates compiled"
+
+
+def warm_translations(user=None):
+    languages = [code for code, _name in getattr(settings, "LANGUAGES", [])] or [settings.LANGUAGE_CODE]
+    messages = list(BUILTIN_TRANSLATIONS.get("pl", {}))
+    for code in languages:
+        with translation.override(code):
+            for message in messages:
+                smart_translate(message)
+    return f"{len(languages)} languages loaded"
+
+
+def _warm_form_choices(form):
+    count = 0
+    for name, field in form.fields.items():
+        if hasattr(field, "queryset"):
+            count += len(load_choices(field.widget, name))
+    return count
+
+
+def warm_choices(user=None):
+    if not getattr(settings, "DJCRUDX_CHOICES_CACHE_TIMEOUT", 0):
+        return "skipped (DJCRUDX_CHOICES_CACHE_TIMEOUT not set)"
+    count = 0
+    seen = set()
+    for entry in discover_views():
+        if entry["kind"] == "list" and entry.get("filter_class"):
+            key = entry["filter_class"]
+            if key not in seen:
+                seen.add(key)
+                filter_obj = entry["filter_class"](queryset=entry["model"]._default_manager.none())
+                count += _warm_form_choices(filter_obj.form)
+        elif entry["kind"] == "create" and entry.get("form_class"):
+            key = entry["form_class"]
+            if key not in seen:
+                seen.add(key)
+                count += _warm_form_choices(entry["form_class"]())
+    return f"{count} choices cached"
+
+
+def warm_list_pages(user=None):
+    if user is None:
+        return "skipped (no --user given)"
+    factory = RequestFactory()
+    pages = 0
+    for entry in get_registered_views("list"):
+        try:
+            url = reverse(entry["view_name"])
+        except NoReverseMatch:
+            continue
+        request = factory.get(url)
+        request.user = user
+        response = entry["view"](request)
+        if response.status_code == 200:
+            pages += 1
+    return f"{pages} list pages rendered (counts and first pages)"
+
+
+# Warm only the process they run in
+PROCESS_STEPS = [
+    ("urls", warm_urls),
+    ("templates", warm_templates),
+    ("translations", warm_translations),
+]
+
+# Fill the cache shared by all workers
+SHARED_STEPS = [
+    ("choices", warm_choices),
+    ("list_pages", warm_list_pages),
+]
+
+WARMUP_STEPS = PROCESS_STEPS + SHARED_STEPS
+
+
+def warmup(username=None, skip=(), callback=None, steps=None):
+    """
+    Run warm-up steps
+
+    Args:
+        username: user for rendering list pages (list pages are skipped without it)
+        skip: names of steps to skip
+        callback: called as callback(name, seconds, detail, error) after every step
+        steps: [(name, step)] to run, default WARMUP_STEPS
+
+    Returns:
+        list: [(name, seconds, detail, error)]
+    """
+    user = get_user_model()._default_manager.get_by_natural_key(username) if username else None
+    results = []
+    for name, step in WARMUP_STEPS if steps is None else steps:
+        if name in skip:
+            continue
+        start = time.perf_counter()
+        detail = error = None
+        try:
+            detail = step(user)
+        except Exception as e:
+            error = e
+        result = (name, time.perf_counter() - start, detail, error)
+        results.append(result)
+        if callback:
+            callback(*result)
+    return results
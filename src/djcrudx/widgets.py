@@ -1,10 +1,18 @@
+import hashlib
+
 from django import forms
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.forms.models import ModelChoiceIterator
 from django.forms.widgets import Widget
 from django.utils.html import format_html
+from django.utils.translation import get_language
 from django.utils.safestring import mark_safe
 from django.conf import settings
 from django.forms import inlineformset_factory
 
+from .tracing import span
+
 
 def get_ui_colors():
     """Pobierz kolory UI z ustawień Django"""
@@ -23,6 +31,51 @@ def get_ui_colors():
     )
 
 
+def choices_cache_key(iterator):
+    """Klucz cache dla ModelChoiceIterator (SQL querysetu, klasa pola, język) albo None"""
+    queryset = iterator.queryset
+    try:
+        sql = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return None
+    field = iterator.field
+    raw = repr((queryset.db, sql, type(field).__module__, type(field).__qualname__, str(field.empty_label), get_language()))
+    return "djcrudx:choices:" + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def get_model_choices(iterator):
+    """
+    Choices z ModelChoiceIterator jako [(value, label)] stringów
+
+    Przy DJCRUDX_CHOICES_CACHE_TIMEOUT lista jest trzymana w cache Django
+    (wspólnym dla workerów) - zwraca (choices, cache_hit).
+    """
+    timeout = getattr(settings, "DJCRUDX_CHOICES_CACHE_TIMEOUT", 0)
+    key = choices_cache_key(iterator) if timeout else None
+    if key:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached, True
+    choices = [(str(value), str(label)) for value, label in iterator]
+    if key:
+        cache.set(key, choices, timeout)
+    return choices, False
+
+
+def load_choices(widget, name):
+    """Pobierz choices z widget lub z bound field (queryset jest wykonywany tutaj)"""
+    with span("djcrudx.widget_choices", {"djcrudx.widget": type(widget).__name__, "djcrudx.field": name}) as current:
+        choices = getattr(widget, "choices", [])
+        if hasattr(widget, "field") and hasattr(widget.field, "queryset"):
+            choices = [(obj.pk, str(obj)) for obj in widget.field.queryset.all()]
+        elif isinstance(choices, ModelChoiceIterator):
+            choices, hit = get_model_choices(choices)
+            current.set_attribute("djcrudx.cache_hit", hit)
+        choices = list(choices)
+        current.set_attribute("djcrudx.choice_count", len(choices))
+    return choices
+
+
 class InlineFormsetWidget(Widget):
     """Universal widget for inline formsets - add/edit/delete related objects"""
 
@@ -167,9 +220,10 @@ class MultiSelectDropdownWidget(Widget):
         add_label = attrs.pop("data-add-label", None) or self.default_add_label
 
         # Pobierz choices z widget lub z bound field
-        choices = getattr(self, "choices", [])
-        if hasattr(self, "field") and hasattr(self.field, "queryset"):
-            choices = [(obj.pk, str(obj)) for obj in self.field.queryset.all()]
+        choices = load_choices(self, name)
+
+        # Liczniki facet ustawiane przez CrudListMixin.apply_facets
+        facet_counts = getattr(self, "facet_counts", None)
 
         # Generuj opcje z checkboxami
         options_html = ""
@@ -184,10 +238,17 @@ class MultiSelectDropdownWidget(Widget):
                 selected_labels.append(str(option_label))
 
             checked = "checked" if is_selected else ""
+            count_html = ""
+            label_class = "text-xs"
+            if facet_counts is not None:
+                count = facet_counts.get(str(option_value), 0)
+                count_html = f'<span class="ml-auto text-xs text-gray-400">{count}</span>'
+                if not count and not is_selected:
+                    label_class = "text-xs text-gray-400"
             options_html += f'''
                 <label class="flex items-center gap-2 px-3 py-2 hover:bg-gray-100 cursor-pointer">
                     <input type="checkbox" name="{name}" value="{option_value}" {checked}>
-                    <span class="text-xs">{option_label}</span>
+                    <span class="{label_class}">{option_label}</span>{count_html}
                 </label>
             '''
 
@@ -264,6 +325,9 @@ class MultiSelectDropdownWidget(Widget):
 class DateRangePickerWidget(Widget):
     """Widget z jednym polem do wyboru zakresu dat"""
 
+    # Parametry name_0 (od) i name_1 (do), jak SuffixedMultiWidget z django-filter
+    suffixes = ["0", "1"]
+
     def __init__(self, attrs=None):
         super().__init__(attrs)
 
@@ -275,7 +339,7 @@ class DateRangePickerWidget(Widget):
         return [None, None]
 
     def value_from_datadict(self, data, files, name):
-        return [data.get(name + "_0"), data.get(name + "_1")]
+        return [data.get(f"{name}_{suffix}") for suffix in self.suffixes]
 
     def render(self, name, value, attrs=None, renderer=None):
         if attrs is None:
@@ -398,25 +462,28 @@ class ColoredSelectDropdownWidget(Widget):
         ui_colors = get_ui_colors()
 
         # Pobierz choices z widget lub z bound field
-        choices = getattr(self, "choices", [])
-        if hasattr(self, "field") and hasattr(self.field, "queryset"):
-            choices = [
-                (
-                    obj.pk,
-                    str(obj),
-                    getattr(obj, "bg_color", "#ffffff"),
-                    getattr(obj, "txt_color", "#000000"),
-                )
-                for obj in self.field.queryset.all()
-            ]
-        elif not choices:
-            # Fallback - pobierz bezpośrednio z modelu Status
-            try:
-                from appointments.models import Status
+        with span("djcrudx.widget_choices", {"djcrudx.widget": type(self).__name__, "djcrudx.field": name}) as current:
+            choices = getattr(self, "choices", [])
+            if hasattr(self, "field") and hasattr(self.field, "queryset"):
+                choices = [
+                    (
+                        obj.pk,
+                        str(obj),
+                        getattr(obj, "bg_color", "#ffffff"),
+                        getattr(obj, "txt_color", "#000000"),
+                    )
+                    for obj in self.field.queryset.all()
+                ]
+            elif not choices:
+                # Fallback - pobierz bezpośrednio z modelu Status
+                try:
+                    from appointments.models import Status
 
-                choices = [(obj.pk, str(obj), obj.bg_color, obj.txt_color) for obj in Status.objects.all()]
-            except:
-                choices = []
+                    choices = [(obj.pk, str(obj), obj.bg_color, obj.txt_color) for obj in Status.objects.all()]
+                except:
+                    choices = []
+            choices = list(choices)
+            current.set_attribute("djcrudx.choice_count", len(choices))
 
         # Znajdź aktualnie wybrany status aby pobrać jego kolory
         selected_status = None
@@ -541,9 +608,7 @@ class SingleSelectDropdownWidget(Widget):
         add_label = attrs.pop("data-add-label", None) or self.default_add_label
 
         # Pobierz choices z widget lub z bound field
-        choices = getattr(self, "choices", [])
-        if hasattr(self, "field") and hasattr(self.field, "queryset"):
-            choices = [(obj.pk, str(obj)) for obj in self.field.queryset.all()]
+        choices = load_choices(self, name)
 
         # Generuj opcje z radio buttonami
         options_html = ""
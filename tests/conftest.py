@@ -0,0 +1,32 @@
+import pytest
+
+from tests.testapp.models import Category, Product, Tag
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user("user", password="x")
+
+
+@pytest.fixture
+def staff_user(django_user_model):
+    return django_user_model.objects.create_user("staff", password="x", is_staff=True)
+
+
+@pytest.fixture
+def user_client(client, user):
+    client.force_login(user)
+    return client
+
+
+@pytest.fixture
+def products(db):
+    """30 products in 3 categories; product i has the first i % 4 tags"""
+    categories = [Category.objects.create(name=f"c{i}") for i in range(3)]
+    tags = [Tag.objects.create(name=f"t{i}") for i in range(4)]
+    items = []
+    for i in range(30):
+        product = Product.objects.create(name=f"p{i:02d}", price=i, category=categories[i % 3])
+        product.tags.set(tags[: i % 4])
+        items.append(product)
+    return items
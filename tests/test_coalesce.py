@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+from django.core.cache import cache
+from django.test import RequestFactory, override_settings
+
+from djcrudx.coalesce import SingleFlight
+from djcrudx.mixins import CrudListMixin
+from tests.testapp.models import Product
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_single_flight_runs_once_for_concurrent_callers():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"count": 3}
+
+    def call():
+        results.append(flight.do("key", compute))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=call) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert sorted(shared for _result, shared in results) == [False, True, True, True]
+
+
+def paginate(per_page=5):
+    mixin = CrudListMixin()
+    mixin.coalesce = True
+    request = RequestFactory().get("/", {"page": "2", "per_page": str(per_page)})
+    return mixin.paginate_queryset(Product.objects.select_related("category").order_by("pk"), request)
+
+
+@pytest.mark.django_db
+@override_settings(DJCRUDX_COALESCE_CACHE_ALIAS="default")
+def test_followers_get_their_own_instances(products, django_assert_num_queries):
+    leader_page, leader_context = paginate()
+
+    # The second request finds the published result: no count, one query for its rows
+    with django_assert_num_queries(1):
+        follower_page, follower_context = paginate()
+        assert [obj.category.name for obj in follower_page.object_list] == ["c2", "c0", "c1", "c2", "c0"]
+
+    assert follower_context["total_count"] == leader_context["total_count"] == 30
+    assert [obj.pk for obj in follower_page] == [obj.pk for obj in leader_page] == [p.pk for p in products[5:10]]
+    assert not any(a is b for a, b in zip(follower_page, leader_page))
+
+    follower_page.object_list[0].name = "changed"
+    assert leader_page.object_list[0].name == "p05"
@@ -0,0 +1,69 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from django.test import override_settings
+
+from djcrudx.column_profiler import column_profiler
+from djcrudx.mixins import DataTableMixin
+from tests.testapp.models import Product
+
+pytestmark = pytest.mark.django_db
+
+
+def slow_name(obj):
+    time.sleep(0.01)
+    return obj.name
+
+
+TABLE_CONFIG = [
+    {"label": "Name", "value": slow_name},
+    {"label": "Category", "value": lambda obj: obj.category.name},  # one query per row without select_related
+    {"label": "Price", "value": lambda obj: obj.price},
+]
+
+
+@pytest.fixture(autouse=True)
+def reset_profiler():
+    column_profiler.reset()
+    yield
+    column_profiler.reset()
+
+
+def prepare(objects):
+    mixin = DataTableMixin()
+    mixin.view_name = "testapp:product_list"
+    return mixin.prepare_datatable(TABLE_CONFIG, SimpleNamespace(object_list=objects))
+
+
+@override_settings(DJCRUDX_COLUMN_PROFILER_RATE=1)
+def test_slow_column_is_reported_first(products):
+    prepare(list(Product.objects.all()[:3]))
+    report = column_profiler.report()
+    first = report[0]
+    assert (first["view"], first["column"], first["phase"], first["calls"]) == ("testapp:product_list", "Name", "value", 3)
+    assert first["avg_ms"] >= 10
+    by_column = {row["column"]: row for row in report}
+    assert by_column["Category"]["queries"] == 3 and by_column["Category"]["avg_queries"] == 1
+    assert by_column["Price"]["queries"] == 0
+
+
+def test_disabled_profiler_records_nothing(products):
+    prepare(list(Product.objects.all()[:3]))
+    assert column_profiler.report() == []
+
+
+@override_settings(DJCRUDX_COLUMN_PROFILER_RATE=1)
+def test_report_view(client, staff_user, products):
+    prepare(list(Product.objects.all()[:2]))
+    client.force_login(staff_user)
+    text = client.get("/djcrudx/debug/column-profile/").content.decode()
+    assert text.splitlines()[1].split()[:3] == ["testapp:product_list", "Name", "value"]
+    assert client.get("/djcrudx/debug/column-profile/", {"format": "json"}).json()["columns"][0]["calls"] == 2
+
+    client.post("/djcrudx/debug/column-profile/")
+    assert column_profiler.report() == []
+
+
+def test_report_view_is_staff_only(user_client):
+    assert user_client.get("/djcrudx/debug/column-profile/").status_code == 302
@@ -0,0 +1,96 @@
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from djcrudx.models import TableView
+from tests.testapp.models import Category, Product
+
+pytestmark = pytest.mark.django_db
+
+LIST_URL = "/products/"
+
+
+def count_queries(captured):
+    return [query["sql"] for query in captured if 'COUNT("testapp_product"."id")' in query["sql"]]
+
+
+def footer_sum(response):
+    return next(cell["value"] for cell in response.context["footer"] if cell)
+
+
+def test_list_returns_etag_and_304(user_client, products):
+    response = user_client.get(LIST_URL, {"name": "p0"})
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert "no-cache" in response.headers["Cache-Control"] and "private" in response.headers["Cache-Control"]
+
+    not_modified = user_client.get(LIST_URL, {"name": "p0"}, HTTP_IF_NONE_MATCH=etag)
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+
+
+def test_validator_count_is_reused(user_client, products):
+    with CaptureQueriesContext(connection) as context:
+        response = user_client.get(LIST_URL, {"name": "p0"})
+    # one query for the version, count and the price sum - no separate count
+    assert len(count_queries(context.captured_queries)) == 1
+    assert response.context["total_count"] == 10
+    assert footer_sum(response) == Decimal(sum(range(10)))
+
+
+def test_validator_aggregates_follow_the_user_view(user, user_client, products):
+    TableView.objects.create(
+        user=user, view_name="testapp:product_list", name="prices", is_default=True,
+        column_config=[{"key": "name", "visible": False}, {"key": "price", "order": 0}],
+    )
+    response = user_client.get(LIST_URL)
+    assert [header["label"] for header in response.context["headers"]] == ["Price", "Category"]
+    assert footer_sum(response) == Decimal(sum(range(30)))
+
+
+def test_validator_aggregates_annotated_columns(user_client):
+    for name, count in [("a", 1), ("b", 3), ("c", 0)]:
+        category = Category.objects.create(name=name)
+        for i in range(count):
+            Product.objects.create(name=f"{name}{i}", category=category)
+
+    response = user_client.get("/categories/", {"ordering": "-product_count"})
+    assert response.status_code == 200
+    assert [obj.name for obj in response.context["page_obj"].object_list] == ["b", "a", "c"]
+    assert response.context["footer"][1]["value"] == 4
+
+    etag = response.headers["ETag"]
+    assert user_client.get("/categories/", {"ordering": "-product_count"}, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+
+@pytest.mark.parametrize("change", ["update", "delete"])
+def test_changes_invalidate_the_etag(user_client, products, change):
+    etag = user_client.get(LIST_URL).headers["ETag"]
+    if change == "update":
+        products[5].save()
+    else:
+        products[5].delete()
+    response = user_client.get(LIST_URL, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_etag_depends_on_query_and_user(client, user_client, staff_user, products):
+    etag = user_client.get(LIST_URL).headers["ETag"]
+    assert user_client.get(LIST_URL, {"name": "p1"}).headers["ETag"] != etag
+    client.force_login(staff_user)
+    assert client.get(LIST_URL, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_detail_last_modified(user_client, products):
+    url = f"/products/{products[0].pk}/"
+    response = user_client.get(url)
+    assert response.status_code == 200
+    assert user_client.get(url, HTTP_IF_NONE_MATCH=response.headers["ETag"]).status_code == 304
+    assert user_client.get(url, HTTP_IF_MODIFIED_SINCE=response.headers["Last-Modified"]).status_code == 304
+
+    products[0].save()  # bumps updated_at
+    assert user_client.get(url, HTTP_IF_NONE_MATCH=response.headers["ETag"]).status_code == 200
@@ -0,0 +1,48 @@
+import pytest
+from django.shortcuts import render
+from django.test import RequestFactory
+
+from djcrudx.mixins import get_detail_relations
+from tests.testapp.models import Category, Product, ProductNote
+
+pytestmark = pytest.mark.django_db
+
+DETAIL_CONFIG = [
+    {"field": "name", "label": "Product name"},
+    {"field": "price", "label": "Unit price"},
+    {"field": "sku", "label": "Stock code"},
+]
+
+
+def test_detail_view_passes_layout(user_client, products):
+    response = user_client.get(f"/products/{products[3].pk}/")
+    assert response.status_code == 200
+    assert response.context["detail_layout"] == []  # no detail_sections configured
+
+
+def test_template_builds_layout_from_detail_sections(user, products):
+    request = RequestFactory().get("/")
+    request.user = user
+    context = {
+        "object": products[7],
+        "detail_config": DETAIL_CONFIG,
+        "detail_sections": [{"title": "Basics", "fields": ["name", "price", "missing"]}],
+    }
+    html = render(request, "crud/detail_view.html", context).content.decode()
+    assert "Basics" in html
+    assert "Product name" in html and "Unit price" in html
+    assert "Stock code" not in html
+
+
+def test_detail_relations():
+    config = [{"field": "category__name"}, {"field": "tags"}, {"field": "note__text"}, {"field": "note"}, {"field": "name"}]
+    assert get_detail_relations(Product, config) == (["category", "note"], ["tags"])
+    assert get_detail_relations(Category, [{"field": "product__name"}]) == ([], ["product_set"])
+
+
+def test_reverse_one_to_one_is_joined(products, django_assert_num_queries):
+    ProductNote.objects.create(product=products[0], text="fragile")
+    select_related, _prefetch = get_detail_relations(Product, [{"field": "note__text"}])
+    with django_assert_num_queries(1):
+        product = Product.objects.select_related(*select_related).get(pk=products[0].pk)
+        assert product.note.text == "fragile"
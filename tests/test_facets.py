@@ -0,0 +1,60 @@
+import pytest
+from django.core.cache import cache
+from django.http import QueryDict
+
+from djcrudx.facets import compute_facets, count_facet, facet_fingerprint, get_param_names
+from tests.testapp.forms import ProductFilter
+from tests.testapp.models import Product, Tag
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def bound_filter(query="", queryset=None):
+    return ProductFilter(QueryDict(query), queryset=Product.objects.all() if queryset is None else queryset)
+
+
+def test_param_names_come_from_the_widget():
+    filter_instance = bound_filter()
+    assert get_param_names(filter_instance, "tags") == {"tags"}
+    assert get_param_names(filter_instance, "created_at") == {"created_at_0", "created_at_1"}
+
+
+def test_facet_keeps_filters_sharing_the_name_prefix(products):
+    t0 = Tag.objects.get(name="t0")
+    filter_instance = bound_filter(f"tags=999&tags_all={t0.pk}")
+    counts = count_facet(filter_instance, "tags", "tags")
+    # tags_all=t0 stays applied: every counted product has t0
+    assert counts[str(t0.pk)] == Product.objects.filter(tags=t0).count()
+    assert sum(counts.values()) == sum(
+        product.tags.count() for product in Product.objects.filter(tags=t0)
+    )
+
+    key = facet_fingerprint("v", filter_instance, "tags")
+    assert key != facet_fingerprint("v", bound_filter("tags=999"), "tags")
+    assert key == facet_fingerprint("v", bound_filter(f"tags_all={t0.pk}"), "tags")
+
+
+def test_own_range_params_are_dropped():
+    assert facet_fingerprint("v", bound_filter("created_at_0=2020-01-01"), "created_at") == facet_fingerprint(
+        "v", bound_filter(), "created_at"
+    )
+
+
+def test_cache_is_scoped_to_the_base_queryset(products):
+    everything = compute_facets(bound_filter(), {"category": "category"}, "v")
+    scoped = compute_facets(bound_filter(queryset=Product.objects.filter(price__lt=3)), {"category": "category"}, "v")
+    assert sum(everything["category"].values()) == 30
+    assert sum(scoped["category"].values()) == 3
+
+
+def test_empty_base_queryset_is_not_cached(products):
+    filter_instance = bound_filter(queryset=Product.objects.filter(pk__in=[]))
+    assert compute_facets(filter_instance, {"category": "category"}, "v") == {"category": {}}
+    assert cache.get_many([facet_fingerprint("v", filter_instance, "category")]) == {}
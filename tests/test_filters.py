@@ -0,0 +1,90 @@
+import datetime
+
+import pytest
+from django.http import QueryDict
+from django.utils import timezone
+
+from djcrudx.filters import MultiSelectFilter
+from tests.testapp.forms import ProductFilter
+from tests.testapp.models import Category, Product, Tag
+
+pytestmark = pytest.mark.django_db
+
+
+def filtered(params):
+    query = QueryDict(mutable=True)
+    for key, value in params.items():
+        query.setlist(key, value if isinstance(value, list) else [value])
+    return ProductFilter(query, queryset=Product.objects.all())
+
+
+def names(filter_instance):
+    return sorted(filter_instance.qs.values_list("name", flat=True))
+
+
+def expected(predicate):
+    return sorted(f"p{i:02d}" for i in range(30) if predicate(i))
+
+
+def tag_pks(*names):
+    return [str(Tag.objects.get(name=name).pk) for name in names]
+
+
+def test_any_tag_uses_exists_without_distinct(products):
+    filter_instance = filtered({"tags": tag_pks("t1", "t2")})
+    assert names(filter_instance) == expected(lambda i: i % 4 >= 2)
+    sql = str(filter_instance.qs.query).upper()
+    assert "EXISTS" in sql and "DISTINCT" not in sql and "JOIN" not in sql.split("EXISTS")[0]
+
+
+def test_all_tags_requires_every_value(products):
+    assert names(filtered({"tags_all": tag_pks("t0", "t2")})) == expected(lambda i: i % 4 == 3)
+    assert names(filtered({"tags_all": tag_pks("t0")})) == expected(lambda i: i % 4 >= 1)
+
+
+def test_foreign_key_uses_in_lookup(products):
+    c0, c1 = Category.objects.get(name="c0"), Category.objects.get(name="c1")
+    filter_instance = filtered({"category": [str(c0.pk), str(c1.pk)]})
+    assert names(filter_instance) == expected(lambda i: i % 3 in (0, 1))
+    assert "EXISTS" not in str(filter_instance.qs.query).upper()
+
+
+def test_match_all_on_foreign_key(products):
+    c0, c1 = Category.objects.get(name="c0"), Category.objects.get(name="c1")
+    multi = MultiSelectFilter(field_name="category", queryset=Category.objects.all(), match="all")
+    multi.model = Product
+    assert multi.filter(Product.objects.all(), [c0]).count() == 10
+    assert not multi.filter(Product.objects.all(), [c0, c1]).exists()
+
+
+def test_invalid_match():
+    with pytest.raises(ValueError):
+        MultiSelectFilter(queryset=Tag.objects.all(), match="some")
+
+
+@pytest.fixture
+def dated_products(products):
+    """Product i created at 23:30 local time on 2024-01-(i + 1)"""
+    for i, product in enumerate(products):
+        created_at = timezone.make_aware(datetime.datetime(2024, 1, i + 1, 23, 30))
+        Product.objects.filter(pk=product.pk).update(created_at=created_at)
+    return products
+
+
+def test_date_range_is_inclusive_in_local_time(dated_products):
+    filter_instance = filtered({"created_at_0": "2024-01-03", "created_at_1": "05.01.2024"})
+    assert names(filter_instance) == ["p02", "p03", "p04"]
+    # half-open range on the raw column, no date cast
+    sql = str(filter_instance.qs.query)
+    assert "created_at\" >=" in sql and "created_at\" <" in sql and "cast" not in sql.lower()
+
+
+def test_date_range_open_ends(dated_products):
+    assert names(filtered({"created_at_0": "2024-01-29"})) == ["p28", "p29"]
+    assert names(filtered({"created_at_1": "2024-01-02"})) == ["p00", "p01"]
+
+
+def test_date_range_rejects_reversed_bounds(dated_products):
+    filter_instance = filtered({"created_at_0": "2024-01-05", "created_at_1": "2024-01-03"})
+    assert not filter_instance.is_valid()
+    assert filter_instance.errors["created_at"][0].startswith("Data początkowa")
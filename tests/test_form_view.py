@@ -0,0 +1,74 @@
+import pytest
+from django.core.checks import Warning
+from django.shortcuts import render
+from django.test import RequestFactory
+from django.views.generic import UpdateView
+
+from djcrudx import checks
+from djcrudx.mixins import ReadonlyFormMixin
+from tests.testapp.forms import ProductForm
+from tests.testapp.models import Product
+
+pytestmark = pytest.mark.django_db
+
+
+class ProductUpdateView(ReadonlyFormMixin, UpdateView):
+    model = Product
+    form_class = ProductForm
+    readonly_fields = ["sku"]
+    template_name = "crud/form_view.html"
+
+
+def get_request(user):
+    request = RequestFactory().get("/")
+    request.user = user
+    return request
+
+
+def rendered_fields(html):
+    return [name for name in ProductForm.base_fields if f'name="{name}"' in html]
+
+
+def test_create_view_renders_form_sections(user_client):
+    response = user_client.get("/products/create/")
+    assert response.status_code == 200
+    assert [entry["section"]["title"] for entry in response.context["form_layout"]] == ["Main"]
+    assert rendered_fields(response.content.decode()) == ["name", "price", "category"]
+
+
+def test_template_builds_layout_from_form_sections(user):
+    context = {"form": ProductForm(), "form_sections": [{"title": "Basics", "fields": ["name", "sku", "missing"]}]}
+    html = render(get_request(user), "crud/form_view.html", context).content.decode()
+    assert "Basics" in html
+    assert rendered_fields(html) == ["name", "sku"]
+
+
+def test_class_based_view_without_form_sections_renders_all_fields(user, products):
+    response = ProductUpdateView.as_view()(get_request(user), pk=products[0].pk)
+    html = response.rendered_content
+    assert rendered_fields(html) == list(ProductForm.base_fields)
+    assert response.context_data["form"].fields["sku"].widget.attrs["readonly"]
+    assert response.context_data["readonly_fields"] == ["sku"]
+
+
+def registered_form(form_sections):
+    return [{"view_name": "shop:product_create", "kind": "create", "form_class": ProductForm, "form_sections": form_sections}]
+
+
+def test_w001_reports_unknown_section_fields(monkeypatch):
+    monkeypatch.setattr(checks, "discover_views", lambda: registered_form([
+        {"title": "Main", "fields": ["name", "nmae", "inline_config"]},
+    ]))
+    errors = checks.check_form_sections()
+    assert [(error.id, error.obj) for error in errors] == [("djcrudx.W001", "shop:product_create")]
+    assert isinstance(errors[0], Warning)
+    assert "'nmae'" in errors[0].msg
+
+
+def test_w001_silent_for_valid_sections(monkeypatch):
+    monkeypatch.setattr(checks, "discover_views", lambda: registered_form([{"title": "Main", "fields": ["name", "price"]}]))
+    assert checks.check_form_sections() == []
+
+
+def test_test_urlconf_passes_the_checks():
+    assert checks.check_form_sections() == []
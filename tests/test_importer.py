@@ -0,0 +1,117 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from djcrudx import importer
+from djcrudx.importer import import_file
+from tests.testapp.forms import ProductForm
+from tests.testapp.models import Category, Product, Tag
+
+pytestmark = pytest.mark.django_db
+
+
+def csv_file(lines, name="products.csv"):
+    return SimpleUploadedFile(name, "\n".join(lines).encode("utf-8"), content_type="text/csv")
+
+
+@pytest.fixture
+def relations():
+    categories = [Category.objects.create(name=f"c{i}") for i in range(3)]
+    tags = [Tag.objects.create(name=f"t{i}") for i in range(3)]
+    return categories, tags
+
+
+def product_rows(relations, count, start=0):
+    categories, tags = relations
+    return [
+        f'n{i};s{i};{i}.50;{categories[i % 3].pk};"{tags[0].pk},{tags[i % 3].pk}";tak'
+        for i in range(start, start + count)
+    ]
+
+
+HEADER = "name;sku;price;category;tags;is_active"
+
+
+def import_rows(lines, **kwargs):
+    return import_file(csv_file([HEADER, *lines]), ProductForm, **kwargs)
+
+
+def test_import_creates_rows_with_relations(relations):
+    report = import_rows(product_rows(relations, 4))
+    assert (report.rows, report.created, report.errors) == (4, 4, [])
+    product = Product.objects.get(sku="s2")
+    assert product.category.name == "c2" and str(product.price) == "2.50"
+    assert sorted(product.tags.values_list("name", flat=True)) == ["t0", "t2"]
+
+
+def test_queries_do_not_grow_with_rows(relations):
+    def queries(count, start):
+        with CaptureQueriesContext(connection) as context:
+            report = import_rows(product_rows(relations, count, start))
+        assert report.created == count
+        return len(context.captured_queries)
+
+    assert queries(5, 0) == queries(40, 100)
+
+
+def test_relations_are_fetched_once_across_batches(relations):
+    with CaptureQueriesContext(connection) as context:
+        report = import_rows(product_rows(relations, 9), batch_size=3)
+    assert report.created == 9
+    category_queries = [q for q in context.captured_queries if 'FROM "testapp_category"' in q["sql"]]
+    assert len(category_queries) == 1
+
+
+def test_unique_conflicts_are_reported_per_row(relations):
+    Product.objects.create(name="existing", sku="s1")
+    lines = product_rows(relations, 3) + product_rows(relations, 1, start=2)  # s1 exists, s2 twice
+    report = import_rows(lines)
+    assert report.created == 2
+    assert [row for row, _messages in report.errors] == [3, 5]
+    assert all("already exists" in messages[0] for _row, messages in report.errors)
+    assert Product.objects.filter(sku="s2").count() == 1
+
+
+def test_invalid_rows_are_reported(relations):
+    lines = ["bad;x1;abc;999;;", "ok;x2;1;;;"]
+    report = import_rows(lines)
+    assert report.created == 1
+    ((row, messages),) = report.errors
+    assert row == 2 and len(messages) == 2  # price and category
+
+
+def test_unique_constraints_are_checked_per_batch(relations):
+    categories, _tags = relations
+    Product.objects.create(name="n0", category=categories[0])
+    lines = product_rows(relations, 3) + [f"n1;x1;1;{categories[1].pk};;tak", "n1;x2;1;;;tak"]
+    with CaptureQueriesContext(connection) as context:
+        report = import_rows(lines)
+    assert report.created == 3
+    assert [row for row, _messages in report.errors] == [2, 5]  # n0/c0 exists, n1/c1 twice in the file
+    assert all("already exists" in messages[0] for _row, messages in report.errors)
+    constraint_queries = [q for q in context.captured_queries if '"testapp_product"."name"' in q["sql"] and "SELECT" in q["sql"]]
+    assert len(constraint_queries) == 1
+
+
+def test_integrity_error_reports_only_failing_rows(relations, monkeypatch):
+    Product.objects.create(name="existing", sku="s1")
+    monkeypatch.setattr(importer, "check_unique", lambda valid, report: valid)
+    with CaptureQueriesContext(connection) as context:
+        report = import_rows(product_rows(relations, 3))
+    assert report.created == 2
+    assert [row for row, _messages in report.errors] == [3]
+    assert "UNIQUE" in report.errors[0][1][0].upper()
+    # The batch, then its halves [n0] and [n1, n2], then [n1] and [n2]
+    product_inserts = [q for q in context.captured_queries if q["sql"].startswith('INSERT INTO "testapp_product"')]
+    assert len(product_inserts) == 5
+    assert Product.objects.count() == 3
+    assert sorted(Product.objects.get(sku="s2").tags.values_list("name", flat=True)) == ["t0", "t2"]
+
+
+def test_import_view(user_client, relations):
+    upload = csv_file([HEADER, *product_rows(relations, 2)])
+    response = user_client.post("/products/import/", {"file": upload})
+    assert response.status_code == 200
+    assert response.context["report"].created == 2
+    assert Product.objects.count() == 2
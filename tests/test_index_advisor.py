@@ -0,0 +1,102 @@
+from io import StringIO
+
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import override_settings
+
+from djcrudx.index_advisor import analyze, is_project_app, resolve_path
+from tests.testapp.forms import ProductFilter
+from tests.testapp.models import Category, Product
+from tests.urls import TABLE_CONFIG
+
+pytestmark = pytest.mark.django_db
+
+USER_TABLE = [
+    {"field": "last_name", "label": "Last name"},
+]
+
+
+def run(*args):
+    out = StringIO()
+    call_command("djcrudx_index_advisor", *args, stdout=out, no_color=True)
+    return out.getvalue()
+
+
+def statuses(result):
+    return {(check["kind"], check["name"]): check["status"] for check in result["checks"]}
+
+
+def test_resolve_path_follows_relations():
+    target, field, relations, lookup = resolve_path(Product, "category__name__iexact")
+    assert target is Category
+    assert field.name == "name"
+    assert [relation.name for relation in relations] == ["category"]
+    assert lookup == "iexact"
+    assert resolve_path(Product, "missing") is None
+
+
+def test_analyze_reports_missing_and_composite_indexes():
+    result = analyze(Product, TABLE_CONFIG, ProductFilter)
+    found = statuses(result)
+
+    assert found[("sort", "price")] == "missing"
+    assert found[("sort", "category__name")] == "missing"
+    # FK columns are indexed by Django, icontains cannot use a B-tree index
+    assert found[("filter", "category")] == "ok"
+    assert found[("filter", "name")] == "skip"
+    assert found[("composite", "category + price")] == "candidate"
+
+    assert (Product, "price") in result["missing"]
+    assert (Category, "name") in result["missing"]
+    assert (Product, ("category", "price")) in result["composite"]
+
+
+def test_project_apps():
+    assert is_project_app(apps.get_app_config("testapp"))
+    assert not is_project_app(apps.get_app_config("auth"))
+    assert not is_project_app(apps.get_app_config("testapp"), exclude=["testapp"])
+    with override_settings(DJCRUDX_INDEX_ADVISOR_EXCLUDE_APPS=["testapp"]):
+        assert not is_project_app(apps.get_app_config("testapp"))
+
+
+def test_command_prints_meta_indexes_snippet():
+    output = run("--view", "testapp:product_list")
+
+    assert "Suggested Meta.indexes for testapp.Product:" in output
+    assert "    class Meta:" in output
+    assert "models.Index(fields=['price'], name=" in output
+    assert "models.Index(fields=['category', 'price'], name=" in output
+    assert "Suggested Meta.indexes for testapp.Category:" in output
+
+
+def test_command_no_composite():
+    output = run("--view", "testapp:product_list", "--no-composite")
+    assert "models.Index(fields=['category', 'price']" not in output
+    assert "models.Index(fields=['price']" in output
+
+
+def test_command_only_reports_non_project_apps():
+    output = run("--config", "tests.test_index_advisor.USER_TABLE", "--model", "auth.User")
+
+    assert "auth.User" in output
+    assert "Suggested Meta.indexes for auth.User" not in output
+    assert "Not a project app" in output
+    assert "auth.User: (last_name)" in output
+
+
+def test_command_exclude_app():
+    output = run("--view", "testapp:product_list", "--exclude-app", "testapp")
+    assert "Suggested Meta.indexes" not in output
+    assert "testapp.Product: (" in output
+
+
+def test_write_option_is_gone():
+    with pytest.raises(CommandError):
+        run("--write")
+
+
+def test_config_requires_model():
+    with pytest.raises(CommandError):
+        run("--config", "tests.test_index_advisor.USER_TABLE")
@@ -0,0 +1,103 @@
+import pytest
+
+from django.db import connection
+from django.db.models import Value
+
+from djcrudx.keyset import RowValueCompare, apply_cursor, decode_cursor, encode_cursor, get_sort_key, is_nullable, order_queryset
+from tests.testapp.models import Product
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def tied_products(products):
+    """Prices with ties (i // 3) and NULLs (every fifth product)"""
+    for i, product in enumerate(products):
+        product.price = None if i % 5 == 0 else i // 3
+        product.save(update_fields=["price"])
+    return products
+
+
+def walk(field, descending, chunk_size):
+    queryset = order_queryset(Product.objects.all(), field, descending)
+    names, cursor = [], None
+    while True:
+        chunk = list((queryset if cursor is None else apply_cursor(queryset, field, descending, cursor))[:chunk_size + 1])
+        names += [obj.name for obj in chunk[:chunk_size]]
+        if len(chunk) <= chunk_size:
+            return names
+        cursor = decode_cursor(encode_cursor(chunk[chunk_size - 1], field))
+
+
+def test_get_sort_key():
+    queryset = Product.objects.all()
+    assert get_sort_key(queryset) == ("pk", False)  # Meta.ordering = ["id"]
+    assert get_sort_key(queryset, "-price") == ("price", True)
+    assert get_sort_key(queryset, "-id") == ("pk", True)
+
+
+def test_decode_cursor():
+    assert decode_cursor("") is None
+    assert decode_cursor(None) is None
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.parametrize("field, descending", [
+    ("pk", False), ("pk", True), ("price", False), ("price", True),
+    ("name", False), ("name", True), ("category__name", False), ("category__name", True),
+])
+def test_walk_returns_every_row_once_in_order(tied_products, field, descending):
+    expected = [obj.name for obj in order_queryset(Product.objects.all(), field, descending)]
+    assert walk(field, descending, chunk_size=4) == expected
+    assert len(set(expected)) == 30
+    # NULLs come last in both directions
+    if field == "price":
+        assert set(expected[-6:]) == {f"p{i:02d}" for i in range(0, 30, 5)}
+
+
+def test_is_nullable():
+    assert not is_nullable(Product, "pk")
+    assert not is_nullable(Product, "name")
+    assert is_nullable(Product, "price")
+    assert is_nullable(Product, "category__name")  # nullable foreign key
+    assert is_nullable(Product, "tag_count")  # annotation
+
+
+def cursor_sql(field, value, descending=False):
+    queryset = order_queryset(Product.objects.all(), field, descending)
+    return str(apply_cursor(queryset, field, descending, (value, 5)).query)
+
+
+def test_cursor_is_a_row_value_range():
+    name = connection.ops.quote_name("name")
+    sql = cursor_sql("name", "p10")
+    assert f"{name}, " in sql and ") > (" in sql
+    assert "IS NULL" not in sql
+    assert ") < (" in cursor_sql("name", "p10", descending=True)
+    # Nullable fields add the trailing NULL block
+    assert "IS NULL" in cursor_sql("price", "10.00")
+
+
+def test_row_value_compare_expands_without_row_values():
+    compiler = Product.objects.all().query.get_compiler("default")
+    expression = RowValueCompare([Value(1), Value(2)], ">", [Value(3), Value(4)])
+    assert expression.as_sql(compiler, connection) == ("(%s, %s) > (%s, %s)", [1, 2, 3, 4])
+    assert expression.as_oracle(compiler, connection) == ("((%s > %s) OR (%s = %s AND %s > %s))", [1, 3, 1, 3, 2, 4])
+
+
+def test_rows_endpoint_follows_cursors(user_client, tied_products):
+    names, params = [], {"format": "rows", "per_page": "7", "ordering": "-price"}
+    while True:
+        data = user_client.get("/products/", params).json()
+        names += [row[0] for row in data["rows"]]
+        if not data["next"]:
+            break
+        params["cursor"] = data["next"]
+    expected = [obj.name for obj in order_queryset(Product.objects.all(), "price", True)]
+    assert names == expected
+
+
+def test_rows_endpoint_rejects_malformed_cursor(user_client, products):
+    response = user_client.get("/products/", {"format": "rows", "cursor": "%%%"})
+    assert response.status_code == 400
@@ -0,0 +1,70 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = [
+    "openpyxl",
+    "django_filters",
+    "django.shortcuts",
+    "djcrudx.crud",
+    "djcrudx.filters",
+    "djcrudx.mixins",
+    "djcrudx.widgets",
+]
+
+# Cumulative `-X importtime` cost of `import djcrudx`; the lazy package takes well under 1 ms,
+# the generous budget only catches an eager import of Django views/forms sneaking back in
+IMPORT_BUDGET_US = 50_000
+
+
+def subprocess_env():
+    return dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+
+
+def loaded_modules(code):
+    env = subprocess_env()
+    script = f"import json, sys\n{code}\nprint(json.dumps(sorted(sys.modules)))"
+    output = subprocess.run([sys.executable, "-c", script], env=env, check=True, capture_output=True, text=True).stdout
+    return set(json.loads(output))
+
+
+def test_import_does_not_load_heavy_modules():
+    modules = loaded_modules("import djcrudx")
+    assert "djcrudx" in modules
+    assert not modules.intersection(HEAVY_MODULES)
+
+
+def import_times(code):
+    """{module: cumulative µs} parsed from ``python -X importtime`` output"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], env=subprocess_env(), check=True, capture_output=True, text=True
+    ).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_cumulative_cost():
+    times = import_times("import djcrudx")
+    assert times["djcrudx"] < IMPORT_BUDGET_US
+    assert not set(times).intersection(HEAVY_MODULES)
+
+
+@pytest.mark.parametrize("name, module", [("MultiSelectFilter", "djcrudx.filters"), ("TextInputWidget", "djcrudx.widgets")])
+def test_public_names_load_their_module(name, module):
+    modules = loaded_modules(
+        "import os\n"
+        "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tests.settings')\n"
+        "import django\n"
+        "django.setup()\n"
+        f"import djcrudx\ndjcrudx.{name}"
+    )
+    assert module in modules
@@ -0,0 +1,166 @@
+import json
+from decimal import Decimal
+
+import pytest
+from django.template.loader import render_to_string
+from django.http import QueryDict
+from django.test import RequestFactory, override_settings
+from django.utils.html import escape
+
+from djcrudx.mixins import CrudListMixin, PaginationMixin
+from tests.testapp.models import Category, Product
+from tests.urls import CATEGORY_TABLE_CONFIG, TABLE_CONFIG
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def categories(db):
+    """Categories with 0, 1, 3 and 2 products"""
+    for name, count in [("none", 0), ("one", 1), ("three", 3), ("two", 2)]:
+        category = Category.objects.create(name=name)
+        for i in range(count):
+            Product.objects.create(name=f"{name}{i}", price=1, category=category)
+
+
+def datatable_context(queryset, table_config, query=None):
+    request = RequestFactory().get("/", query or {})
+    return CrudListMixin().get_datatable_context(queryset, None, table_config, request)
+
+
+def footer_values(context):
+    return [cell["value"] if cell else None for cell in context["footer"]]
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(None, 25), ("10", 10), ("abc", 25), ("0", 25), ("-5", 25), ("500", 500), ("100000", 500)],
+)
+def test_get_per_page(value, expected):
+    request = RequestFactory().get("/", {} if value is None else {"per_page": value})
+    assert PaginationMixin().get_per_page(request) == expected
+
+
+@override_settings(DJCRUDX_MAX_PER_PAGE=None)
+def test_get_per_page_without_limit():
+    request = RequestFactory().get("/", {"per_page": "100000"})
+    assert PaginationMixin().get_per_page(request) == 100000
+
+
+@override_settings(DJCRUDX_MAX_PER_PAGE=10)
+def test_list_clamps_per_page(user_client, products):
+    response = user_client.get("/products/", {"per_page": "100000"})
+    assert response.status_code == 200
+    assert response.context["current_per_page"] == 10
+    assert len(response.context["rows"]) == 10
+    assert response.context["per_page_options"] == [10]
+
+
+@override_settings(DJCRUDX_MAX_PER_PAGE=10)
+def test_rows_endpoint_clamps_per_page(user_client, products):
+    response = user_client.get("/products/", {"format": "rows", "per_page": "100000"})
+    assert response.status_code == 200
+    assert len(response.json()["rows"]) == 10
+
+
+def test_footer_aggregates_the_filtered_queryset_not_the_page(products):
+    queryset = Product.objects.filter(category__name="c0")
+    context = datatable_context(queryset, TABLE_CONFIG, {"per_page": "5"})
+    assert len(context["rows"]) == 5
+    assert context["total_count"] == 10
+    assert footer_values(context) == [None, Decimal(sum(range(0, 30, 3))), None]
+
+
+def test_list_footer_aggregates_the_filtered_queryset(user_client, products):
+    category = Category.objects.get(name="c1")
+    response = user_client.get("/products/", {"category": category.pk, "per_page": "5"})
+    assert len(response.context["rows"]) == 5
+    assert footer_values(response.context) == [None, Decimal(sum(range(1, 30, 3))), None]
+
+
+@pytest.mark.parametrize("ordering, expected", [
+    ("product_count", ["none", "one", "two", "three"]),
+    ("-product_count", ["three", "two", "one", "none"]),
+])
+def test_annotated_column_sorting(categories, ordering, expected):
+    context = datatable_context(Category.objects.all(), CATEGORY_TABLE_CONFIG, {"ordering": ordering})
+    assert [obj.name for obj in context["page_obj"].object_list] == expected
+
+
+def test_aggregate_of_annotated_column(categories):
+    context = datatable_context(Category.objects.order_by("name"), CATEGORY_TABLE_CONFIG)
+    assert footer_values(context) == [None, 6]
+
+    context = datatable_context(Category.objects.filter(name__contains="t").order_by("name"), CATEGORY_TABLE_CONFIG, {"ordering": "-product_count"})
+    assert context["total_count"] == 2
+    assert footer_values(context) == [None, 5]
+
+
+def test_aggregate_annotations_are_only_the_referenced_ones():
+    mixin = CrudListMixin()
+    assert list(mixin.get_aggregate_annotations(CATEGORY_TABLE_CONFIG)) == ["product_count"]
+    assert mixin.get_aggregate_annotations(CATEGORY_TABLE_CONFIG[:1]) == {}
+    assert mixin.get_aggregate_annotations(TABLE_CONFIG) == {}
+
+
+FORMATTED_TABLE_CONFIG = [
+    {"label": "Name", "field": "name", "value": lambda obj: obj.name.upper()},
+    {"label": "Price", "field": "price", "value": lambda obj: f"{obj.price:.2f} zł"},
+    {"label": "Category", "field": "category__name", "value": lambda obj: f"<b>{obj.category.name}</b>"},
+    {"label": "Tags", "field": "tags__name", "value": lambda obj: ", ".join(tag.name for tag in obj.tags.all())},
+]
+
+
+def test_rows_carry_raw_sort_keys(products):
+    queryset = Product.objects.filter(name__in=["p03", "p10"]).order_by("name")
+    context = datatable_context(queryset, FORMATTED_TABLE_CONFIG)
+    assert context["client_side"]
+
+    # Raw values, not the formatted cells; to-many columns keep the server-side sort
+    assert [json.loads(row.sort_keys) for row in context["rows"]] == [
+        {"0": "p03", "1": 3.0, "2": "c0"},
+        {"0": "p10", "1": 10.0, "2": "c1"},
+    ]
+    assert [header.get("client_sort", False) for header in context["headers"]] == [True, True, True, False]
+
+    html = render_to_string("crud/_partials/datatable_row.html", {"row": context["rows"][0]})
+    assert f'data-sort="{escape(context["rows"][0].sort_keys)}"' in html
+    assert "3.00 zł" in html
+
+
+def test_list_renders_sort_keys_of_annotated_columns(user_client, categories):
+    response = user_client.get("/categories/", {"ordering": "-product_count"})
+    assert response.context["client_side"]
+    content = response.content.decode()
+    assert f'data-sort="{escape(json.dumps({"0": "three", "1": 3}))}"' in content
+
+
+@override_settings(DJCRUDX_CLIENT_SIDE_MAX_ROWS=1)
+def test_no_sort_keys_above_the_client_side_limit(categories):
+    context = datatable_context(Category.objects.order_by("name"), CATEGORY_TABLE_CONFIG)
+    assert not context["client_side"]
+    assert not any(getattr(row, "sort_keys", None) for row in context["rows"])
+
+
+def test_sort_urls_keep_multi_valued_params():
+    headers = [{"field": "name"}, {"field": "price"}, {"field": None}]
+    request = RequestFactory().get("/?tags=1&tags=2&name=p&page=3&ordering=name")
+    CrudListMixin().prepare_sort_urls(headers, request)
+
+    name, price, plain = headers
+    assert name["sort_state"] == "asc" and price["sort_state"] is None
+    assert "sort_url" not in plain
+    for url, ordering in [(name["sort_url"], "-name"), (price["sort_url"], "price"), (price["sort_url_desc"], "-price")]:
+        params = QueryDict(url.lstrip("?"))
+        assert params.getlist("tags") == ["1", "2"]
+        assert params.getlist("ordering") == [ordering]
+        assert params["name"] == "p"
+        assert "page" not in params
+
+
+def test_list_sort_links_keep_multi_valued_filters(user_client, products):
+    response = user_client.get("/products/", {"tags": ["1", "2"], "ordering": "-price"})
+    price = next(header for header in response.context["headers"] if header["field"] == "price")
+    assert price["sort_state"] == "desc"
+    assert QueryDict(price["sort_url"].lstrip("?")).getlist("tags") == ["1", "2"]
+    assert escape(price["sort_url"]) in response.content.decode()
@@ -0,0 +1,41 @@
+import pytest
+from django.core.management import call_command
+
+from djcrudx.profiling import collapse_pstats, profile_request
+from tests.testapp.models import Product
+
+pytestmark = pytest.mark.django_db
+
+
+def create(staff_user, **kwargs):
+    return profile_request(
+        "/products/create/", staff_user, method="POST", data={"name": "profiled", "is_active": "on"}, **kwargs
+    )
+
+
+def test_replayed_writes_are_rolled_back(staff_user):
+    result = create(staff_user, repeat=3)
+    assert [status for status, _seconds in result["responses"]] == [302, 302, 302]
+    assert any(q["sql"].startswith("INSERT") for q in result["queries"][0])
+    assert not Product.objects.exists()
+
+
+def test_replayed_writes_kept_without_rollback(staff_user):
+    create(staff_user, repeat=2, rollback=False)
+    assert Product.objects.filter(name="profiled").count() == 2
+
+
+def test_collapsed_stacks(staff_user, products):
+    stacks = collapse_pstats(profile_request("/products/", staff_user)["stats"])
+    assert stacks and all(value > 0 for value in stacks.values())
+
+
+def test_command_rolls_back_by_default(staff_user, tmp_path, capsys):
+    output = tmp_path / "profile.folded"
+    args = ["/products/create/", "--user", staff_user.username, "--method", "POST", "--data", "name=cmd"]
+    call_command("djcrudx_profile", *args, "--repeat", "2", "--output", str(output))
+    assert output.exists()
+    assert not Product.objects.exists()
+
+    call_command("djcrudx_profile", *args, "--allow-writes", "--output", str(output))
+    assert Product.objects.filter(name="cmd").count() == 1
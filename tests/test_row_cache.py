@@ -0,0 +1,54 @@
+import pytest
+from django.core.cache import cache
+
+from djcrudx.mixins import CrudListMixin
+from djcrudx.row_cache import _code_fingerprint, config_fingerprint, local_rows
+from tests.testapp.models import Product
+
+TAGS_SOURCE = 'lambda obj: ", ".join(tag.name for tag in obj.tags.all())'
+
+TABLE_CONFIG = [
+    {"label": "Name", "field": "name", "value": lambda obj: obj.name},
+    {"label": "Tags", "key": "tags", "value": eval(compile(TAGS_SOURCE, "columns.py", "eval")), "prefetch_related": ["tags"]},
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    cache.clear()
+    local_rows.clear()
+    yield
+    cache.clear()
+    local_rows.clear()
+
+
+def column(source):
+    return {"label": "Column", "value": eval(compile(source, "columns.py", "eval"))}
+
+
+def test_fingerprint_ignores_nested_code_addresses():
+    # Two compilations give nested generator code objects at different addresses, as in two workers
+    first, second = column(TAGS_SOURCE), column(TAGS_SOURCE)
+    assert repr(first["value"].__code__.co_consts) != repr(second["value"].__code__.co_consts)
+    fingerprint = config_fingerprint([first])
+    _code_fingerprint.cache_clear()  # equal code objects would hit the cached hash
+    assert config_fingerprint([second]) == fingerprint
+
+
+def test_fingerprint_follows_attribute_names():
+    assert config_fingerprint([column("lambda obj: obj.name")]) != config_fingerprint([column("lambda obj: obj.sku")])
+
+
+@pytest.mark.django_db
+def test_streamed_rows_use_the_cache_and_prefetch(products, django_assert_num_queries):
+    mixin = CrudListMixin()
+    queryset = mixin.optimize_queryset(Product.objects.order_by("pk"), TABLE_CONFIG, "updated_at")
+
+    # one SELECT for the rows, one tags prefetch per chunk of 10
+    with django_assert_num_queries(4):
+        rows = list(mixin.iter_rows(TABLE_CONFIG, queryset, chunk_size=10, row_cache_field="updated_at"))
+    assert len(rows) == 30
+    assert rows[3] == ["p03", "t0, t1, t2"]
+
+    with django_assert_num_queries(1):
+        assert list(mixin.iter_rows(TABLE_CONFIG, queryset, chunk_size=10, row_cache_field="updated_at")) == rows
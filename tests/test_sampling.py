@@ -0,0 +1,145 @@
+import sys
+import threading
+import time
+
+import pytest
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, override_settings
+
+from djcrudx.sampling import SampleStore, TRUNCATED_STACK, collapse_frame, sample_profile, sample_store, sampler
+
+pytestmark = pytest.mark.django_db
+
+SAMPLING = {"DJCRUDX_SAMPLING_EVERY_N": 1, "DJCRUDX_SAMPLING_INTERVAL_MS": 1}
+
+
+@pytest.fixture(autouse=True)
+def clear_store():
+    sample_store.reset()
+    yield
+    sample_store.reset()
+
+
+def busy(ms):
+    deadline = time.perf_counter() + ms / 1000
+    while time.perf_counter() < deadline:
+        pass
+
+
+def slow_chunks():
+    for chunk in (b"a", b"b", b"c"):
+        busy(20)
+        yield chunk
+
+
+@sample_profile("tests:plain")
+def plain_view(request, ms=30):
+    busy(ms)
+    return HttpResponse("ok")
+
+
+@sample_profile("tests:stream")
+def stream_view(request):
+    return StreamingHttpResponse(slow_chunks())
+
+
+def get(view, **kwargs):
+    return view(RequestFactory().get("/"), **kwargs)
+
+
+def test_collapse_frame_is_root_first():
+    def inner():
+        return collapse_frame(sys._getframe())
+
+    stack = inner()
+    assert stack.split(";")[-1].startswith("inner (test_sampling.py:")
+    assert "test_collapse_frame_is_root_first" in stack
+
+
+def test_store_is_bounded():
+    store = SampleStore()
+    with override_settings(DJCRUDX_SAMPLING_MAX_VIEWS=2, DJCRUDX_SAMPLING_MAX_STACKS=1):
+        store.add("a", {"x": 1, "y": 2}, 10)
+        store.add("b", {"x": 1}, 20)
+        store.add("c", {"x": 1}, 30)
+
+    assert set(store.views()) == {"b", "c"}
+    store.add("b", {"x": 3}, 50)
+    assert store.views()["b"] == {"requests": 2, "samples": 4, "max_ms": 50}
+    assert store.collapsed("b") == "x 4\n"
+    assert "c;x 1\n" in store.collapsed()
+
+    with override_settings(DJCRUDX_SAMPLING_MAX_STACKS=1):
+        store.add("d", {"x": 1, "y": 2}, 10)
+    assert f"{TRUNCATED_STACK} 2" in store.collapsed("d")
+
+
+def test_disabled_by_default():
+    assert get(plain_view).status_code == 200
+    assert sample_store.views() == {}
+
+
+@override_settings(**SAMPLING)
+def test_every_n_records_view_stacks():
+    get(plain_view)
+    views = sample_store.views()
+    assert views["tests:plain"]["requests"] == 1
+    assert views["tests:plain"]["samples"] > 0
+    assert "plain_view (test_sampling.py:" in sample_store.collapsed("tests:plain")
+
+
+@override_settings(DJCRUDX_SAMPLING_THRESHOLD_MS=25, DJCRUDX_SAMPLING_INTERVAL_MS=1)
+def test_threshold_discards_fast_requests():
+    get(plain_view, ms=0)
+    assert sample_store.views() == {}
+    get(plain_view, ms=40)
+    assert sample_store.views()["tests:plain"]["max_ms"] >= 25
+
+
+@override_settings(**SAMPLING)
+def test_streamed_response_is_sampled_until_closed():
+    response = get(stream_view)
+    assert sample_store.views() == {}
+
+    assert b"".join(response.streaming_content) == b"abc"
+    response.close()
+
+    assert "slow_chunks (test_sampling.py:" in sample_store.collapsed("tests:stream")
+    assert sample_store.views()["tests:stream"]["max_ms"] >= 60
+    assert not sampler._active
+
+
+@override_settings(**SAMPLING)
+def test_streamed_response_follows_the_iterating_thread():
+    response = get(stream_view)
+    body = []
+    worker = threading.Thread(target=lambda: body.append(b"".join(response.streaming_content)))
+    worker.start()
+    worker.join()
+    response.close()
+
+    assert body == [b"abc"]
+    assert "slow_chunks (test_sampling.py:" in sample_store.collapsed("tests:stream")
+    assert not sampler._active
+
+
+@override_settings(**SAMPLING)
+def test_unread_streamed_response_stops_on_close():
+    response = get(stream_view)
+    response.close()
+    assert not sampler._active
+
+
+@override_settings(
+    MIDDLEWARE=[*settings.MIDDLEWARE, "djcrudx.sampling.SamplingProfilerMiddleware"],
+    DJCRUDX_STREAM_ROWS_THRESHOLD=1,
+    **SAMPLING,
+)
+def test_middleware_samples_streamed_list_page(user_client, products):
+    response = user_client.get("/products/")
+    assert response.streaming
+    assert b"p00" in b"".join(response.streaming_content)
+    response.close()
+
+    assert sample_store.views()["testapp:product_list"]["requests"] == 1
@@ -0,0 +1,59 @@
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+
+from djcrudx import slow_queries
+from djcrudx.slow_queries import capture_slow_queries, normalize_sql, slow_query_log
+from djcrudx.timeouts import StatementTimeout, statement_timeout
+
+from tests.testapp.models import Product
+
+# Runs for seconds on SQLite unless interrupted
+SLOW_WHERE = "(WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 50000000) SELECT count(*) FROM c) > 0"
+
+
+@pytest.fixture(autouse=True)
+def clean_log():
+    slow_query_log.clear()
+    yield
+    slow_query_log.clear()
+
+
+def test_normalize_sql_replaces_literals():
+    assert normalize_sql("SELECT * FROM t WHERE a = 'x' AND b IN (%s, %s, %s) AND c > 10") == (
+        "SELECT * FROM t WHERE a = ? AND b IN (...) AND c > ?"
+    )
+
+
+@pytest.mark.django_db
+@override_settings(DJCRUDX_SLOW_QUERY_MS=0, DJCRUDX_SLOW_QUERY_EXPLAIN_ANALYZE=True)
+def test_slow_query_is_logged_with_plan():
+    with capture_slow_queries("shop:list", "count", timeout=1000):
+        Product.objects.count()
+    (entry,) = slow_query_log.entries()
+    assert entry["view"] == "shop:list" and entry["phase"] == "count"
+    assert entry["plan"] and not entry["plan"].startswith("EXPLAIN failed")
+
+
+@pytest.mark.django_db
+@override_settings(DJCRUDX_SLOW_QUERY_MS=0, DJCRUDX_SLOW_QUERY_EXPLAIN_ANALYZE=True)
+def test_cancelled_query_is_explained_without_analyze_under_the_timeout():
+    Product.objects.create(name="p")  # the WHERE clause is evaluated per row
+    with mock.patch.object(slow_queries, "explain", return_value="plan") as explain:
+        with capture_slow_queries("shop:list", "count", timeout=50):
+            with pytest.raises(StatementTimeout):
+                with statement_timeout(50):
+                    Product.objects.extra(where=[SLOW_WHERE]).count()
+            Product.objects.count()
+    cancelled, completed = explain.call_args_list
+    assert cancelled.kwargs == {"analyze": False, "timeout": 50}
+    assert completed.kwargs == {"analyze": True, "timeout": 50}
+
+
+@pytest.mark.django_db
+def test_explain_runs_under_the_statement_timeout():
+    with mock.patch.object(slow_queries, "statement_timeout", wraps=statement_timeout) as timeout:
+        slow_queries.explain(connection, 'SELECT 1', [], timeout=25)
+    timeout.assert_called_once_with(25, using=connection.alias)
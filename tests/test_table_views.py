@@ -0,0 +1,144 @@
+import json
+
+import pytest
+from django.urls import reverse
+
+from djcrudx.mixins import CrudListMixin
+from djcrudx.models import TableView
+from tests.urls import TABLE_CONFIG
+
+pytestmark = pytest.mark.django_db
+
+VIEW_NAME = "testapp:product_list"
+
+
+@pytest.fixture
+def other_user(django_user_model):
+    return django_user_model.objects.create_user("other", password="x")
+
+
+@pytest.fixture
+def other_view(other_user):
+    return TableView.objects.create(
+        user=other_user, view_name=VIEW_NAME, name="Mine", is_default=True,
+        column_config=[{"key": "name", "visible": True, "order": 0}, {"key": "price", "visible": False, "order": 1}],
+    )
+
+
+def save(client, data, view_name=VIEW_NAME):
+    url = reverse("djcrudx:save_table_view", kwargs={"view_name": view_name})
+    return client.post(url, json.dumps(data), content_type="application/json")
+
+
+def labels(columns):
+    return [col["label"] for col in columns]
+
+
+def user_view(column_config):
+    return TableView(view_name=VIEW_NAME, name="v", column_config=column_config)
+
+
+def test_save_and_list(user_client, user):
+    response = save(user_client, {"name": "Short", "is_default": True, "column_config": [{"key": "name"}, {"key": "price", "visible": False}]})
+    assert response.status_code == 200
+    view = TableView.objects.get(user=user)
+    assert view.column_config == [{"key": "name", "visible": True, "order": 0}, {"key": "price", "visible": False, "order": 1}]
+
+    listed = user_client.get(reverse("djcrudx:table_views", kwargs={"view_name": VIEW_NAME})).json()
+    assert [item["id"] for item in listed["views"]] == [view.pk]
+
+
+def test_save_validates_the_body(user_client):
+    url = reverse("djcrudx:save_table_view", kwargs={"view_name": VIEW_NAME})
+    assert user_client.post(url, "{", content_type="application/json").status_code == 400
+    assert save(user_client, {"name": "", "column_config": []}).status_code == 400
+    assert save(user_client, {"name": "x", "column_config": [{"key": "name", "order": "first"}]}).status_code == 400
+
+
+def test_anonymous_users_are_redirected(client, other_view):
+    assert client.get(reverse("djcrudx:table_views", kwargs={"view_name": VIEW_NAME})).status_code == 302
+    assert client.post(reverse("djcrudx:delete_table_view", kwargs={"pk": other_view.pk})).status_code == 302
+    assert TableView.objects.filter(pk=other_view.pk).exists()
+
+
+def test_views_of_other_users_are_not_listed_or_loaded(user_client, other_view):
+    listed = user_client.get(reverse("djcrudx:table_views", kwargs={"view_name": VIEW_NAME})).json()
+    assert listed["views"] == []
+    assert user_client.get(reverse("djcrudx:load_table_view", kwargs={"pk": other_view.pk})).status_code == 404
+
+
+def test_views_of_other_users_cannot_be_deleted(user_client, other_view):
+    assert user_client.post(reverse("djcrudx:delete_table_view", kwargs={"pk": other_view.pk})).status_code == 404
+    assert TableView.objects.filter(pk=other_view.pk).exists()
+
+
+def test_saving_under_the_same_name_does_not_overwrite_other_users(user_client, user, other_view):
+    response = save(user_client, {"name": "Mine", "is_default": True, "column_config": [{"key": "category"}]})
+    assert response.status_code == 200
+    assert response.json()["view"]["id"] != other_view.pk
+
+    other_view.refresh_from_db()
+    assert other_view.is_default
+    assert [item["key"] for item in other_view.column_config] == ["name", "price"]
+    assert TableView.objects.filter(user=user, name="Mine").count() == 1
+
+
+def test_default_is_unique_per_user(user_client, user, other_view):
+    save(user_client, {"name": "A", "is_default": True, "column_config": [{"key": "name"}]})
+    save(user_client, {"name": "B", "is_default": True, "column_config": [{"key": "name"}]})
+    assert list(TableView.objects.filter(user=user, is_default=True).values_list("name", flat=True)) == ["B"]
+    assert TableView.objects.get(pk=other_view.pk).is_default
+
+
+def test_list_view_ignores_views_of_other_users(user_client, products, other_view):
+    response = user_client.get(reverse("testapp:product_list"), {"view": other_view.pk})
+    assert response.status_code == 200
+    assert response.context["current_table_view"] is None
+    assert labels(response.context["headers"]) == ["Name", "Price", "Category"]
+
+
+def test_apply_user_view_order_and_hidden_columns():
+    view = user_view([
+        {"key": "category", "visible": True, "order": 0},
+        {"key": "name", "visible": True, "order": 1},
+        {"key": "price", "visible": False, "order": 2},
+    ])
+    assert labels(CrudListMixin().apply_user_view(TABLE_CONFIG, view)) == ["Category", "Name"]
+
+
+def test_apply_user_view_with_stale_columns():
+    # "stock" no longer exists, "category" was added after the view was saved
+    view = user_view([
+        {"key": "stock", "visible": True, "order": 0},
+        {"key": "price", "visible": True, "order": 1},
+        {"key": "name", "visible": True, "order": 2},
+    ])
+    assert labels(CrudListMixin().apply_user_view(TABLE_CONFIG, view)) == ["Price", "Name", "Category"]
+
+
+def test_apply_user_view_with_malformed_config():
+    view = user_view([
+        "name",
+        {"visible": False},
+        {"key": "price", "order": "first"},
+        {"key": "category", "order": None},
+        {"key": "name", "order": 0},
+    ])
+    assert labels(CrudListMixin().apply_user_view(TABLE_CONFIG, view)) == ["Name", "Price", "Category"]
+
+
+def test_apply_user_view_hiding_every_column_shows_all():
+    view = user_view([{"key": col["key"], "visible": False} for col in TABLE_CONFIG])
+    assert labels(CrudListMixin().apply_user_view(TABLE_CONFIG, view)) == ["Name", "Price", "Category"]
+
+
+def test_list_view_with_stale_default_view(user_client, user, products):
+    TableView.objects.create(
+        user=user, view_name=VIEW_NAME, name="Old", is_default=True,
+        column_config=[{"key": "stock", "order": 0}, {"key": "price", "order": "x"}, {"key": "name", "visible": False}],
+    )
+    response = user_client.get(reverse("testapp:product_list"), {"ordering": "-name", "name": "p1"})  # sorted and filtered by the hidden column
+    assert response.status_code == 200
+    assert labels(response.context["headers"]) == ["Price", "Category"]
+    assert response.context["total_count"] == 10  # p10 .. p19
+    assert response.context["page_obj"].object_list[0].name == "p19"
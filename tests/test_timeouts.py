@@ -0,0 +1,75 @@
+from contextlib import contextmanager
+
+import pytest
+from django.db import connection
+
+from djcrudx import mixins
+from djcrudx.timeouts import StatementTimeout, statement_timeout
+
+pytestmark = pytest.mark.django_db
+
+TIMEOUT_NOTICE = "Zapytanie trwało zbyt długo"
+SLOW_SQL = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 100000000) SELECT count(*) FROM n"
+
+
+def time_out(calls):
+    """statement_timeout replacement timing out the queries of the given calls (1-based, None = all)"""
+    counter = {"calls": 0}
+
+    @contextmanager
+    def fake(ms=None, using="default"):
+        counter["calls"] += 1
+        if calls is None or counter["calls"] in calls:
+            raise StatementTimeout(f"timed out after {ms} ms")
+        yield
+
+    return fake
+
+
+def test_sqlite_statement_is_interrupted():
+    with pytest.raises(StatementTimeout):
+        with statement_timeout(10):
+            with connection.cursor() as cursor:
+                cursor.execute(SLOW_SQL)
+    # The connection stays usable
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        assert cursor.fetchone() == (1,)
+
+
+def test_no_timeout_without_limit():
+    with statement_timeout(None):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+
+
+def test_list_degrades_when_every_query_times_out(user_client, products, monkeypatch):
+    monkeypatch.setattr(mixins, "statement_timeout", time_out(None))
+
+    response = user_client.get("/products/")
+    assert response.status_code == 200
+    assert response.context["query_timeout"]
+    assert TIMEOUT_NOTICE in response.content.decode()
+    assert response.context["rows"] == []
+    assert response.context["footer"] is None
+    assert "ETag" not in response.headers  # the validator query timed out as well
+
+
+def test_list_shows_the_page_when_only_the_count_times_out(user_client, products, monkeypatch):
+    # 1: conditional GET validator, 2: count
+    monkeypatch.setattr(mixins, "statement_timeout", time_out({1, 2}))
+
+    response = user_client.get("/products/", {"per_page": "10"})
+    assert response.context["query_timeout"]
+    assert TIMEOUT_NOTICE in response.content.decode()
+    assert len(response.context["rows"]) == 10
+    assert response.context["footer"] is None
+    assert response.context["page_obj"].has_next()
+    assert response.context["total_count"] == 11  # rows known so far
+
+
+def test_rows_endpoint_reports_timeout(user_client, products, monkeypatch):
+    monkeypatch.setattr(mixins, "statement_timeout", time_out(None))
+    response = user_client.get("/products/", {"format": "rows"})
+    assert response.status_code == 503
+    assert "error" in response.json()
@@ -0,0 +1,48 @@
+import pytest
+from django.core.cache import cache
+
+from djcrudx.row_cache import get_cached_rows, local_rows
+from djcrudx.tracing import InMemorySpanExporter, add_exporter, remove_exporter, span
+
+from tests.testapp.models import Product
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    add_exporter(exporter)
+    cache.clear()
+    local_rows.clear()
+    yield exporter
+    remove_exporter(exporter)
+
+
+def spans_named(exporter, name):
+    return [record for record in exporter.get_finished_spans() if record.name == name]
+
+
+def test_nested_spans_record_parent_and_attributes(exporter):
+    with span("outer", {"djcrudx.view": "v"}):
+        with span("inner") as current:
+            current.set_attribute("djcrudx.row_count", 3)
+    inner, outer = exporter.get_finished_spans()
+    assert inner.parent == "outer" and inner.attributes == {"djcrudx.row_count": 3}
+    assert outer.attributes == {"djcrudx.view": "v"}
+
+
+def test_facet_cache_hit_attributes(exporter, user_client, products):
+    user_client.get("/products/?view=none")
+    user_client.get("/products/?view=none")
+    first, second = spans_named(exporter, "djcrudx.facet_cache")
+    assert first.attributes["djcrudx.cache_hit"] is False and first.attributes["djcrudx.cache_misses"] == 1
+    assert second.attributes["djcrudx.cache_hit"] is True and second.attributes["djcrudx.cache_hits"] == 1
+
+
+def test_row_cache_hit_attributes(exporter, products):
+    objects = list(Product.objects.all()[:5])
+    table_config = [{"label": "Name", "field": "name", "value": lambda obj: obj.name}]
+    get_cached_rows(objects, table_config, "updated_at", lambda obj: [obj.name])
+    get_cached_rows(objects, table_config, "updated_at", lambda obj: [obj.name])
+    first, second = spans_named(exporter, "djcrudx.row_cache")
+    assert first.attributes["djcrudx.cache_hit"] is False and first.attributes["djcrudx.cache_misses"] == 5
+    assert second.attributes["djcrudx.cache_hit"] is True and second.attributes["djcrudx.cache_local_hits"] == 5
@@ -0,0 +1,62 @@
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import override_settings
+
+from djcrudx.warmup import PROCESS_STEPS, SHARED_STEPS, warm_choices, warmup
+from djcrudx.widgets import load_choices
+from tests.testapp.forms import ProductFilter
+from tests.testapp.models import Category, Product
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def category_widget():
+    return ProductFilter(queryset=Product.objects.none()).form.fields["category"].widget
+
+
+def test_warm_choices_skipped_without_cache():
+    assert warm_choices().startswith("skipped")
+
+
+@override_settings(DJCRUDX_CHOICES_CACHE_TIMEOUT=300)
+def test_warm_choices_fills_choices_cache(django_assert_num_queries):
+    Category.objects.create(name="c0")
+    Category.objects.create(name="c1")
+    assert warm_choices().endswith("choices cached")
+
+    with django_assert_num_queries(0):
+        choices = load_choices(category_widget(), "category")
+    assert [label for _value, label in choices] == ["c0", "c1"]
+
+
+@override_settings(DJCRUDX_CHOICES_CACHE_TIMEOUT=300)
+def test_choices_cache_key_follows_queryset():
+    Category.objects.create(name="c0")
+    load_choices(category_widget(), "category")
+    widget = category_widget()
+    widget.choices.queryset = Category.objects.filter(name="none")
+    assert load_choices(widget, "category") == []
+
+
+def test_warmup_runs_given_steps():
+    names = [name for name, _seconds, _detail, _error in warmup(steps=PROCESS_STEPS)]
+    assert names == [name for name, _step in PROCESS_STEPS]
+
+
+def test_command_runs_shared_steps_only(capsys):
+    call_command("djcrudx_warmup")
+    out = capsys.readouterr().out
+    for name, _step in SHARED_STEPS:
+        assert name in out
+    assert "templates" not in out
+    with pytest.raises(CommandError):
+        call_command("djcrudx_warmup", "--skip", "templates")
@@ -0,0 +1,38 @@
+import django_filters
+from django import forms
+
+from djcrudx.filters import DateRangeFilter, MultiSelectFilter
+
+from .models import Category, Product, Tag
+
+
+class ProductForm(forms.ModelForm):
+    class Meta:
+        model = Product
+        fields = ["name", "sku", "price", "category", "tags", "is_active"]
+
+
+class CategoryForm(forms.ModelForm):
+    class Meta:
+        model = Category
+        fields = ["name"]
+
+
+class CategoryFilter(django_filters.FilterSet):
+    name = django_filters.CharFilter(lookup_expr="icontains")
+
+    class Meta:
+        model = Category
+        fields = ["name"]
+
+
+class ProductFilter(django_filters.FilterSet):
+    name = django_filters.CharFilter(lookup_expr="icontains")
+    category = MultiSelectFilter(queryset=Category.objects.all())
+    tags = MultiSelectFilter(queryset=Tag.objects.all())
+    tags_all = MultiSelectFilter(field_name="tags", queryset=Tag.objects.all(), match="all")
+    created_at = DateRangeFilter()
+
+    class Meta:
+        model = Product
+        fields = ["name", "category", "tags", "created_at"]
@@ -0,0 +1,48 @@
+from django.db.models import Count
+from django.urls import include, path
+
+from djcrudx import create_crud
+
+from .testapp.forms import CategoryFilter, CategoryForm, ProductFilter, ProductForm
+from .testapp.models import Category, Product
+
+TABLE_CONFIG = [
+    {"label": "Name", "field": "name", "key": "name", "value": lambda obj: obj.name},
+    {"label": "Price", "field": "price", "key": "price", "value": lambda obj: obj.price, "aggregate": "sum"},
+    {"label": "Category", "field": "category__name", "key": "category", "value": lambda obj: obj.category and obj.category.name,
+     "select_related": ["category"], "filter_field": "category", "facet": True},
+]
+
+# Annotated column with a footer aggregate (sum of an aggregate annotation)
+CATEGORY_TABLE_CONFIG = [
+    {"label": "Name", "field": "name", "key": "name", "value": lambda obj: obj.name},
+    {"label": "Products", "field": "product_count", "key": "products", "annotate": Count("product"),
+     "value": lambda obj: obj.product_count, "aggregate": "sum"},
+]
+
+crud = create_crud(Product, ProductForm, ProductFilter, version_field="updated_at")
+category_crud = create_crud(Category, CategoryForm, CategoryFilter, version_field="id")
+
+app_name = "testapp"
+product_patterns = [
+    path("", crud["list"](TABLE_CONFIG, infinite_scroll=True), name="product_list"),
+    path("create/", crud["create"]([{"title": "Main", "fields": ["name", "price", "category"]}]), name="product_create"),
+    path("import/", crud["import"](), name="product_import"),
+    path("<int:pk>/", crud["detail"]([{"field": "name", "label": "Name"}]), name="product_detail"),
+    path("<int:pk>/edit/", crud["update"]([{"title": "Main", "fields": ["name", "price", "category"]}]), name="product_update"),
+    path("<int:pk>/delete/", crud["delete"](), name="product_delete"),
+]
+
+category_patterns = [
+    path("", category_crud["list"](CATEGORY_TABLE_CONFIG), name="category_list"),
+]
+
+testapp_patterns = [
+    path("products/", include(product_patterns)),
+    path("categories/", include(category_patterns)),
+]
+
+urlpatterns = [
+    path("", include((testapp_patterns, "testapp"))),
+    path("djcrudx/", include("djcrudx.urls")),
+]